@@ -57,6 +57,9 @@ class Settings(BaseSettings):
     backtest_commission: float = 0.001  # 0.1%
     backtest_slippage: float = 0.0001  # 0.01%
 
+    # 方案服务配置
+    plan_storage_max_size: int = 10000  # 内存中保留的最大方案数
+
     # 日志配置
     log_level: str = "INFO"
     log_file: str = "logs/quantitative_system.log"
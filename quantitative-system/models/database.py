@@ -5,7 +5,8 @@ from decimal import Decimal
 from typing import Any
 
 from sqlalchemy import Index, UniqueConstraint
-from sqlmodel import JSON, Column, Field, SQLModel, Text
+from sqlalchemy.orm import query_expression
+from sqlmodel import JSON, Column, Field, Relationship, SQLModel, Text
 
 from .enums import (
     BacktestStatus,
@@ -347,6 +348,15 @@ class StockDailyData(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.now, description="创建时间")
     updated_at: datetime = Field(default_factory=datetime.now, description="更新时间")
 
+    # 关联的股票基本信息，随日线数据一并以 selectin 方式加载，避免逐行懒加载
+    stock: StockBasicInfo | None = Relationship(
+        sa_relationship_kwargs={
+            "primaryjoin": "foreign(StockDailyData.ts_code) == StockBasicInfo.ts_code",
+            "lazy": "selectin",
+            "viewonly": True,
+        }
+    )
+
     __table_args__ = (
         Index("idx_stock_daily_ts_code", "ts_code"),
         Index("idx_stock_daily_trade_date", "trade_date"),
@@ -390,6 +400,15 @@ class NewsData(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.now, description="创建时间")
     updated_at: datetime = Field(default_factory=datetime.now, description="更新时间")
 
+    # 关联的情感分析结果，随新闻一并以 selectin 方式加载，避免逐行懒加载
+    sentiment_analysis: list["SentimentAnalysis"] = Relationship(
+        sa_relationship_kwargs={
+            "primaryjoin": "foreign(SentimentAnalysis.news_id) == NewsData.id",
+            "lazy": "selectin",
+            "viewonly": True,
+        }
+    )
+
     __table_args__ = (
         Index("idx_news_title", "title"),
         Index("idx_news_source", "source"),
@@ -400,6 +419,10 @@ class NewsData(SQLModel, table=True):
     )
 
 
+# 查询时按需填充的正文摘要，配合 defer(NewsData.content) 只取正文前若干字
+NewsData.content_preview = query_expression()
+
+
 class DataCollectionTask(SQLModel, table=True):
     """数据采集任务表"""
 
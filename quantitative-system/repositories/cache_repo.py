@@ -12,6 +12,9 @@ from config.settings import settings
 from models.enums import CacheType
 from utils.exceptions import CacheError
 
+# SCAN 每次遍历及 UNLINK 每批删除的键数量
+SCAN_BATCH_SIZE = 500
+
 
 class CacheRepo:
     """Redis缓存仓库
@@ -158,6 +161,68 @@ class CacheRepo:
             logger.error(f"获取缓存失败: {cache_key}, 错误: {e}")
             return None
 
+    def mget_bytes(self, cache_type: CacheType, keys: list[str]) -> list[bytes | None]:
+        """批量获取缓存的原始数据，一次 MGET 往返
+
+        Args:
+            cache_type: 缓存类型
+            keys: 缓存键列表
+
+        Returns:
+            与 keys 顺序一致的原始数据列表，不存在的键对应None
+        """
+        if not keys:
+            return []
+
+        try:
+            cache_keys = [self._build_key(cache_type, key) for key in keys]
+            payloads = self.redis_client.mget(cache_keys)
+
+            logger.debug(
+                f"批量获取缓存: {len(keys)} 个键, "
+                f"命中 {sum(p is not None for p in payloads)} 个"
+            )
+            return payloads
+
+        except Exception as e:
+            logger.error(f"批量获取缓存失败: {keys}, 错误: {e}")
+            return [None] * len(keys)
+
+    def mset_bytes(
+        self,
+        cache_type: CacheType,
+        mapping: dict[str, bytes],
+        ttl: int | None = None,
+    ) -> bool:
+        """批量设置已序列化的缓存数据，通过非事务 pipeline 一次提交
+
+        Args:
+            cache_type: 缓存类型
+            mapping: 缓存键到已序列化数据的映射
+            ttl: 过期时间(秒)，None使用默认值
+
+        Returns:
+            是否全部设置成功
+        """
+        if not mapping:
+            return True
+
+        try:
+            if ttl is None:
+                ttl = self._get_default_ttl(cache_type)
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, payload in mapping.items():
+                pipe.setex(self._build_key(cache_type, key), ttl, payload)
+            results = pipe.execute()
+
+            logger.debug(f"批量缓存设置成功: {len(mapping)} 个键, TTL: {ttl}s")
+            return all(results)
+
+        except Exception as e:
+            logger.error(f"批量设置缓存失败: {list(mapping)}, 错误: {e}")
+            return False
+
     def delete(self, cache_type: CacheType, key: str) -> bool:
         """删除缓存
 
@@ -241,6 +306,8 @@ class CacheRepo:
     def clear_by_pattern(self, cache_type: CacheType, pattern: str = "*") -> int:
         """按模式清理缓存
 
+        使用 SCAN 增量遍历匹配的键并分批 UNLINK，避免 KEYS 阻塞 Redis。
+
         Args:
             cache_type: 缓存类型
             pattern: 匹配模式
@@ -250,12 +317,20 @@ class CacheRepo:
         """
         try:
             cache_pattern = self._build_key(cache_type, pattern)
-            keys = self.redis_client.keys(cache_pattern)
+            deleted_count = 0
+            batch: list[bytes] = []
+
+            for key in self.redis_client.scan_iter(
+                match=cache_pattern, count=SCAN_BATCH_SIZE
+            ):
+                batch.append(key)
+                if len(batch) >= SCAN_BATCH_SIZE:
+                    deleted_count += self.redis_client.unlink(*batch)
+                    batch.clear()
 
-            if not keys:
-                return 0
+            if batch:
+                deleted_count += self.redis_client.unlink(*batch)
 
-            deleted_count = self.redis_client.delete(*keys)
             logger.info(f"批量删除缓存: 模式={cache_pattern}, 删除数量={deleted_count}")
             return deleted_count
 
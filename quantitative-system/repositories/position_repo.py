@@ -34,11 +34,14 @@ class PositionRepo:
             return self.session
         return next(get_session())
 
-    def create(self, position_data: PositionCreate) -> Position:
+    def create(
+        self, position_data: PositionCreate, initial_price: Decimal | None = None
+    ) -> Position:
         """创建新持仓
 
         Args:
             position_data: 持仓创建数据
+            initial_price: 初始当前价格，为None时使用成本价
 
         Returns:
             创建的持仓对象
@@ -47,6 +50,9 @@ class PositionRepo:
             DatabaseError: 数据库操作失败
         """
         try:
+            current_price = (
+                initial_price if initial_price is not None else position_data.avg_cost
+            )
             with self._get_session() as session:
                 # 创建持仓对象
                 position = Position(
@@ -55,9 +61,10 @@ class PositionRepo:
                     position_type=position_data.position_type,
                     quantity=position_data.quantity,
                     avg_price=position_data.avg_cost,
-                    current_price=position_data.avg_cost,  # 初始设为成本价
-                    market_value=position_data.quantity * position_data.avg_cost,
-                    unrealized_pnl=Decimal("0"),  # 初始无浮动盈亏
+                    current_price=current_price,
+                    market_value=position_data.quantity * current_price,
+                    unrealized_pnl=position_data.quantity
+                    * (current_price - position_data.avg_cost),
                     realized_pnl=Decimal("0"),
                     status=PositionStatus.ACTIVE,
                     open_date=position_data.open_date,
@@ -115,6 +122,33 @@ class PositionRepo:
             logger.error(f"获取持仓失败: symbol={symbol}, 错误: {e}")
             return []
 
+    def has_active_position(self, symbol: str) -> bool:
+        """检查指定股票是否存在活跃持仓
+
+        Args:
+            symbol: 股票代码
+
+        Returns:
+            是否存在活跃持仓
+        """
+        try:
+            with self._get_session() as session:
+                statement = (
+                    select(Position.id)
+                    .where(
+                        and_(
+                            Position.symbol == symbol,
+                            Position.status == PositionStatus.ACTIVE,
+                        )
+                    )
+                    .limit(1)
+                )
+                return session.exec(statement).first() is not None
+
+        except Exception as e:
+            logger.error(f"检查活跃持仓失败: symbol={symbol}, 错误: {e}")
+            return False
+
     def get_active_positions(self) -> list[Position]:
         """获取所有活跃持仓
 
@@ -316,15 +350,7 @@ class PositionRepo:
 
                 result = session.exec(active_statement).first()
                 if not result:
-                    return {
-                        "total_positions": 0,
-                        "total_market_value": 0.0,
-                        "total_unrealized_pnl": 0.0,
-                        "total_realized_pnl": 0.0,
-                        "total_pnl": 0.0,
-                        "long_positions": {"count": 0, "market_value": 0.0},
-                        "short_positions": {"count": 0, "market_value": 0.0},
-                    }
+                    return self._empty_portfolio_summary()
 
                 # 获取多头和空头统计
                 long_statement = select(
@@ -349,40 +375,46 @@ class PositionRepo:
                 )
                 short_result = session.exec(short_statement).first()
 
-                # 计算总盈亏
-                total_pnl = (result[2] or Decimal("0")) + (result[3] or Decimal("0"))
+                # 计算总盈亏(金额字段保持Numeric列返回的Decimal类型)
+                total_unrealized_pnl = result[2] or Decimal("0")
+                total_realized_pnl = result[3] or Decimal("0")
 
                 return {
                     "total_positions": result[0] or 0,
-                    "total_market_value": float(result[1] or Decimal("0")),
-                    "total_unrealized_pnl": float(result[2] or Decimal("0")),
-                    "total_realized_pnl": float(result[3] or Decimal("0")),
-                    "total_pnl": float(total_pnl),
+                    "total_market_value": result[1] or Decimal("0"),
+                    "total_unrealized_pnl": total_unrealized_pnl,
+                    "total_realized_pnl": total_realized_pnl,
+                    "total_pnl": total_unrealized_pnl + total_realized_pnl,
                     "long_positions": {
                         "count": long_result[0] if long_result else 0,
-                        "market_value": float(long_result[1] or Decimal("0"))
+                        "market_value": (long_result[1] or Decimal("0"))
                         if long_result
-                        else 0.0,
+                        else Decimal("0"),
                     },
                     "short_positions": {
                         "count": short_result[0] if short_result else 0,
-                        "market_value": float(short_result[1] or Decimal("0"))
+                        "market_value": (short_result[1] or Decimal("0"))
                         if short_result
-                        else 0.0,
+                        else Decimal("0"),
                     },
                 }
 
         except Exception as e:
             logger.error(f"获取投资组合汇总失败: {e}")
-            return {
-                "total_positions": 0,
-                "total_market_value": 0.0,
-                "total_unrealized_pnl": 0.0,
-                "total_realized_pnl": 0.0,
-                "total_pnl": 0.0,
-                "long_positions": {"count": 0, "market_value": 0.0},
-                "short_positions": {"count": 0, "market_value": 0.0},
-            }
+            return self._empty_portfolio_summary()
+
+    @staticmethod
+    def _empty_portfolio_summary() -> dict[str, Any]:
+        """构建空投资组合汇总数据"""
+        return {
+            "total_positions": 0,
+            "total_market_value": Decimal("0"),
+            "total_unrealized_pnl": Decimal("0"),
+            "total_realized_pnl": Decimal("0"),
+            "total_pnl": Decimal("0"),
+            "long_positions": {"count": 0, "market_value": Decimal("0")},
+            "short_positions": {"count": 0, "market_value": Decimal("0")},
+        }
 
     def get_positions_by_symbols(self, symbols: list[str]) -> list[Position]:
         """根据股票代码列表获取持仓
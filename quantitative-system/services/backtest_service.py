@@ -3,6 +3,7 @@
 提供策略回测、性能分析、风险评估等功能。
 """
 
+import asyncio
 from datetime import datetime
 from typing import Any
 
@@ -806,8 +807,9 @@ class BacktestService:
             initial_value = cerebro.broker.getvalue()
             logger.info(f"开始回测, 初始资金: {initial_value:,.2f}")
 
-            # 运行回测
-            results = cerebro.run()
+            # 在工作线程中运行回测，逐K线循环不阻塞事件循环，
+            # 多个回测可同时进行，预计算指标的 NumPy 运算期间释放GIL
+            results = await asyncio.to_thread(cerebro.run)
 
             # 记录最终资金
             final_value = cerebro.broker.getvalue()
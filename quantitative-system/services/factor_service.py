@@ -15,6 +15,8 @@ from models.enums import CacheType
 from repositories.cache_repo import CacheRepo
 from services.data_service import DataService
 from utils.exceptions import DataProcessingError, ValidationError
+from utils.helpers import clamp_unit
+from utils.numeric import ewma, mean_std
 
 
 class FactorService:
@@ -332,7 +334,7 @@ class FactorService:
             )
             score += technical_indicator_score * 0.35
 
-            return min(max(score, 0), 1)
+            return clamp_unit(score)
 
         except Exception as e:
             logger.error(f"计算技术面因子失败: {e}")
@@ -350,7 +352,7 @@ class FactorService:
                 short_momentum = (closes[-1] - closes[-5]) / closes[-5]  # 5日动量
                 long_momentum = (closes[-1] - closes[-10]) / closes[-10]  # 10日动量
                 price_momentum = (short_momentum + long_momentum) / 2
-                price_score = min(max(price_momentum * 5 + 0.5, 0), 1)
+                price_score = clamp_unit(price_momentum * 5 + 0.5)
                 score += price_score * 0.6
 
             # 成交量动量 (40%)
@@ -395,19 +397,28 @@ class FactorService:
         """计算波动率因子"""
         try:
             score = 0.0
+            price_ready = len(closes) >= 10
+            volume_ready = len(volumes) >= 10
+
+            if price_ready and volume_ready and len(closes) == len(volumes):
+                # 等长时合并为二维数组，一次算出价格和成交量变化率的标准差
+                series = np.vstack((closes, volumes))
+                changes = np.diff(series, axis=1) / series[:, :-1]
+                volatility, volume_vol = changes.std(axis=1)
+            else:
+                if price_ready:
+                    volatility = np.std(np.diff(closes) / closes[:-1])
+                if volume_ready:
+                    volume_vol = np.std(np.diff(volumes) / volumes[:-1])
 
             # 价格波动率 (70%)
-            if len(closes) >= 10:
-                returns = np.diff(closes) / closes[:-1]
-                volatility = np.std(returns)
+            if price_ready:
                 # 低波动率得分高
                 vol_score = max(1 - volatility * 20, 0)
                 score += vol_score * 0.7
 
             # 成交量波动率 (30%)
-            if len(volumes) >= 10:
-                volume_changes = np.diff(volumes) / volumes[:-1]
-                volume_vol = np.std(volume_changes)
+            if volume_ready:
                 # 适中的成交量波动率得分高
                 vol_vol_score = max(1 - abs(volume_vol - 0.3) * 2, 0)
                 score += vol_vol_score * 0.3
@@ -424,12 +435,25 @@ class FactorService:
         lows: np.ndarray,
         volumes: np.ndarray,
     ) -> float:
-        """计算技术指标因子"""
+        """计算技术指标因子
+
+        MA与布林带共用20日窗口，窗口均值和标准差只计算一次后分别评分。
+        """
         try:
+            current_price = closes[-1]
+            if len(closes) >= 20:
+                window20 = closes[-20:]
+                ma20, std20 = mean_std(window20)
+                ma_score = self._calculate_ma_score(
+                    current_price, np.mean(closes[-5:]), np.mean(closes[-10:]), ma20
+                )
+                bb_score = self._calculate_bollinger_score(current_price, ma20, std20)
+            else:
+                ma_score = bb_score = 0.5
+
             score = 0.0
 
             # MA指标 (25%)
-            ma_score = self._calculate_ma_score(closes)
             score += ma_score * 0.25
 
             # MACD指标 (25%)
@@ -441,7 +465,6 @@ class FactorService:
             score += rsi_score * 0.25
 
             # 布林带指标 (25%)
-            bb_score = self._calculate_bollinger_score(closes)
             score += bb_score * 0.25
 
             return score
@@ -449,31 +472,18 @@ class FactorService:
         except Exception:
             return 0.5
 
-    def _calculate_ma_score(self, closes: np.ndarray) -> float:
+    def _calculate_ma_score(
+        self, current_price: float, ma5: float, ma10: float, ma20: float
+    ) -> float:
         """计算移动平均线评分"""
-        try:
-            if len(closes) < 20:
-                return 0.5
-
-            ma5 = np.mean(closes[-5:])
-            ma10 = np.mean(closes[-10:])
-            ma20 = np.mean(closes[-20:])
-            current_price = closes[-1]
-
-            # 多头排列得分高
-            if current_price > ma5 > ma10 > ma20:
-                return 0.9
-            elif current_price > ma5 > ma10:
-                return 0.7
-            elif current_price > ma5:
-                return 0.6
-            elif current_price < ma5 < ma10 < ma20:
-                return 0.1
-            else:
-                return 0.4
-
-        except Exception:
-            return 0.5
+        # 多头排列得分高，按排列深度逐级判断，每个比较只做一次
+        if current_price > ma5:
+            if ma5 > ma10:
+                return 0.9 if ma10 > ma20 else 0.7
+            return 0.6
+        if current_price < ma5 < ma10 < ma20:
+            return 0.1
+        return 0.4
 
     def _calculate_macd_score(self, closes: np.ndarray) -> float:
         """计算MACD评分"""
@@ -482,10 +492,10 @@ class FactorService:
                 return 0.5
 
             # 计算MACD
-            ema12 = self._calculate_ema(closes, 12)
-            ema26 = self._calculate_ema(closes, 26)
+            ema12 = ewma(closes, 12)
+            ema26 = ewma(closes, 26)
             macd_line = ema12 - ema26
-            signal_line = self._calculate_ema(macd_line, 9)
+            signal_line = ewma(macd_line, 9)
             histogram = macd_line - signal_line
 
             # MACD金叉和柱状图分析
@@ -508,13 +518,10 @@ class FactorService:
             if len(closes) < 15:
                 return 0.5
 
-            # 计算RSI
-            deltas = np.diff(closes)
-            gains = np.where(deltas > 0, deltas, 0)
-            losses = np.where(deltas < 0, -deltas, 0)
-
-            avg_gain = np.mean(gains[-14:])
-            avg_loss = np.mean(losses[-14:])
+            # 计算RSI，只需最近14个价格变动
+            deltas = np.diff(closes[-15:])
+            avg_gain = np.mean(np.maximum(deltas, 0))
+            avg_loss = np.mean(np.maximum(-deltas, 0))
 
             if avg_loss == 0:
                 rsi = 100
@@ -537,18 +544,13 @@ class FactorService:
         except Exception:
             return 0.5
 
-    def _calculate_bollinger_score(self, closes: np.ndarray) -> float:
+    def _calculate_bollinger_score(
+        self, current_price: float, ma20: float, std20: float
+    ) -> float:
         """计算布林带评分"""
         try:
-            if len(closes) < 20:
-                return 0.5
-
-            # 计算布林带
-            ma20 = np.mean(closes[-20:])
-            std20 = np.std(closes[-20:])
             upper_band = ma20 + 2 * std20
             lower_band = ma20 - 2 * std20
-            current_price = closes[-1]
 
             # 布林带位置评分
             if current_price <= lower_band:
@@ -563,17 +565,6 @@ class FactorService:
         except Exception:
             return 0.5
 
-    def _calculate_ema(self, data: np.ndarray, period: int) -> np.ndarray:
-        """计算指数移动平均线"""
-        alpha = 2 / (period + 1)
-        ema = np.zeros_like(data)
-        ema[0] = data[0]
-
-        for i in range(1, len(data)):
-            ema[i] = alpha * data[i] + (1 - alpha) * ema[i - 1]
-
-        return ema
-
     async def _calculate_fundamental_factors(
         self, stock_data: pd.DataFrame, symbol: str
     ) -> float:
@@ -603,15 +594,17 @@ class FactorService:
             score = 0.0
 
             # 1. 价格稳定性代理盈利能力 (30%)
-            price_stability = 1 - (np.std(closes) / np.mean(closes))
+            mean_close, std_close = mean_std(closes)
+            price_stability = 1 - (std_close / mean_close)
             stability_score = max(price_stability, 0)
             score += stability_score * 0.3
 
             # 2. 价格相对位置代理估值水平 (25%)
             current_price = closes[-1]
-            price_range = np.max(closes) - np.min(closes)
+            lowest = closes.min()
+            price_range = closes.max() - lowest
             if price_range > 0:
-                price_position = (current_price - np.min(closes)) / price_range
+                price_position = (current_price - lowest) / price_range
                 # 中等价位得分较高
                 valuation_score = 1 - abs(price_position - 0.6) * 2
                 score += max(valuation_score, 0) * 0.25
@@ -625,10 +618,10 @@ class FactorService:
             # 4. 长期趋势代理成长性 (20%)
             if len(closes) >= 10:
                 long_term_return = (closes[-1] - closes[-10]) / closes[-10]
-                growth_score = min(max(long_term_return * 2 + 0.5, 0), 1)
+                growth_score = clamp_unit(long_term_return * 2 + 0.5)
                 score += growth_score * 0.2
 
-            return min(max(score, 0), 1)
+            return clamp_unit(score)
 
         except Exception as e:
             logger.error(f"计算基本面因子失败: {e}")
@@ -667,7 +660,7 @@ class FactorService:
                         + attention_score * 0.15
                     )
 
-                    return min(max(composite_score, 0), 1)
+                    return clamp_unit(composite_score)
             except Exception as e:
                 logger.debug(f"无法获取股票 {symbol} 的新闻数据: {e}")
 
@@ -711,7 +704,7 @@ class FactorService:
             # 假设市场平均收益为0（实际应该获取大盘数据）
             market_return = 0.0
             relative_performance = stock_return - market_return
-            performance_score = min(max(relative_performance * 3 + 0.5, 0), 1)
+            performance_score = clamp_unit(relative_performance * 3 + 0.5)
             score += performance_score * 0.35
 
             # 2. 资金流向 (25%)
@@ -728,17 +721,17 @@ class FactorService:
             # 使用价格动量作为市场情绪代理
             if len(closes) >= 5:
                 short_momentum = (closes[-1] - closes[-5]) / closes[-5]
-                sentiment_score = min(max(short_momentum * 5 + 0.5, 0), 1)
+                sentiment_score = clamp_unit(short_momentum * 5 + 0.5)
                 score += sentiment_score * 0.25
 
             # 4. 行业轮动 (15%)
             # 简化处理，使用相对强度
             if len(closes) >= 10:
                 medium_return = (closes[-1] - closes[-10]) / closes[-10]
-                sector_score = min(max(medium_return * 2 + 0.5, 0), 1)
+                sector_score = clamp_unit(medium_return * 2 + 0.5)
                 score += sector_score * 0.15
 
-            return min(max(score, 0), 1)
+            return clamp_unit(score)
 
         except Exception as e:
             logger.error(f"计算市场面因子失败: {e}")
@@ -3,16 +3,58 @@
 提供投资方案的生成、格式化、保存和查询功能。
 """
 
+import secrets
+import time
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
+import numpy as np
 from pydantic import BaseModel, Field
 
+from config.settings import settings
 from utils.exceptions import PlanServiceError
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 各Markdown片段在无数据时的占位文本
+_EMPTY_STRATEGY = "暂无策略分析数据"
+_EMPTY_STRATEGY_DETAIL = "暂无详细分析"
+_EMPTY_RISK = "暂无风险评估数据"
+_EMPTY_RISK_DETAIL = "暂无风险评估"
+_EMPTY_RISK_SUGGESTIONS = "暂无风险控制建议"
+_EMPTY_OPERATIONS = "暂无操作建议"
+_EMPTY_PRIORITIES = "暂无优先级信息"
+_EMPTY_PRIORITIES_DETAIL = "暂无优先级分类"
+_EMPTY_OUTLOOK = "暂无市场展望数据"
+_EMPTY_OUTLOOK_DETAIL = "暂无市场展望"
+_EMPTY_KEY_FACTORS = "暂无关键因子数据"
+_EMPTY_WARNINGS = "暂无特别风险警告"
+
+# 建议优先级到分组下标的映射,未知优先级归入中优先级
+_PRIORITY_INDEX = {"high": 0, "low": 2}
+_PRIORITY_LABELS = ("**高优先级**", "**中优先级**", "**低优先级**")
+
+# 缺省的空容器,仅供只读使用,避免每次 .get 时分配新的空字典/列表
+_EMPTY_DICT: dict[str, Any] = {}
+_EMPTY_LIST: list[Any] = []
+
+
+@lru_cache(maxsize=1)
+def _format_timestamp(epoch_second: int) -> tuple[str, str]:
+    """格式化秒级时间戳,同一秒内的重复调用直接命中缓存
+
+    Args:
+        epoch_second: Unix时间戳(秒)
+
+    Returns:
+        (方案ID用时间串, 展示用时间串)
+    """
+    dt = datetime.fromtimestamp(epoch_second)
+    return dt.strftime("%Y%m%d_%H%M%S"), dt.strftime("%Y-%m-%d %H:%M:%S")
+
 
 class PlanRequest(BaseModel):
     """方案生成请求模型"""
@@ -45,6 +87,109 @@ class PlanQueryRequest(BaseModel):
     offset: int = Field(0, description="查询偏移量")
 
 
+class _PlanColumnIndex:
+    """方案查询列式索引
+
+    策略名称按字典编码为整数,与创建时间分别存放在NumPy数组中,
+    查询时以向量化比较代替逐条遍历方案字典。
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """初始化索引
+
+        Args:
+            capacity: 初始数组容量,不足时按倍数扩容
+        """
+        self._strategy_codes: dict[str, int] = {}
+        self._codes = np.zeros(capacity, dtype=np.int32)
+        self._ctimes = np.zeros(capacity, dtype="datetime64[us]")
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+
+    def add(self, plan_id: str, strategy_name: str, created_at: datetime) -> None:
+        """添加方案索引行"""
+        if plan_id in self._rows:
+            self.remove(plan_id)
+
+        row = len(self._ids)
+        if row == len(self._codes):
+            self._grow()
+
+        code = self._strategy_codes.setdefault(strategy_name, len(self._strategy_codes))
+        self._codes[row] = code
+        self._ctimes[row] = np.datetime64(created_at, "us")
+        self._alive[row] = True
+        self._ids.append(plan_id)
+        self._rows[plan_id] = row
+
+    def remove(self, plan_id: str) -> None:
+        """移除方案索引行,失效行过半时压缩数组"""
+        row = self._rows.pop(plan_id, None)
+        if row is None:
+            return
+
+        self._alive[row] = False
+        if len(self._rows) * 2 < len(self._ids):
+            self._compact()
+
+    def query(self, request: PlanQueryRequest) -> list[str]:
+        """按查询条件筛选方案ID
+
+        Args:
+            request: 查询请求
+
+        Returns:
+            按创建时间倒序、已分页的方案ID列表
+        """
+        size = len(self._ids)
+        mask = self._alive[:size].copy()
+
+        if request.plan_id:
+            row = self._rows.get(request.plan_id)
+            mask[:] = False
+            if row is not None:
+                mask[row] = True
+
+        if request.strategy_name:
+            code = self._strategy_codes.get(request.strategy_name, -1)
+            mask &= self._codes[:size] == code
+
+        ctimes = self._ctimes[:size]
+        if request.start_date:
+            mask &= ctimes >= np.datetime64(request.start_date, "us")
+        if request.end_date:
+            mask &= ctimes <= np.datetime64(request.end_date, "us")
+
+        rows = np.flatnonzero(mask)
+        # 按创建时间倒序(稳定排序,时间相同时保持写入顺序)
+        order = np.argsort(-ctimes[rows].astype(np.int64), kind="stable")
+        page = rows[order][request.offset : request.offset + request.limit]
+        return [self._ids[row] for row in page]
+
+    def _grow(self) -> None:
+        """数组容量翻倍"""
+        capacity = len(self._codes) * 2
+        for name in ("_codes", "_ctimes", "_alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+    def _compact(self) -> None:
+        """移除失效行"""
+        size = len(self._ids)
+        keep = np.flatnonzero(self._alive[:size])
+        count = len(keep)
+
+        self._codes[:count] = self._codes[keep]
+        self._ctimes[:count] = self._ctimes[keep]
+        self._alive[:count] = True
+        self._alive[count:size] = False
+        self._ids = [self._ids[row] for row in keep]
+        self._rows = {plan_id: row for row, plan_id in enumerate(self._ids)}
+
+
 class PlanService:
     """方案生成服务
 
@@ -52,11 +197,16 @@ class PlanService:
     并提供方案的保存、查询和管理功能。
     """
 
-    def __init__(self):
-        """初始化方案服务"""
-        self.plans_storage: dict[
-            str, dict[str, Any]
-        ] = {}  # 简单内存存储,实际应使用数据库
+    def __init__(self, max_plans: int | None = None):
+        """初始化方案服务
+
+        Args:
+            max_plans: 内存中保留的最大方案数,超出时淘汰最久未使用的方案
+        """
+        # 简单内存存储(按LRU顺序),实际应使用数据库
+        self.plans_storage: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.max_plans = max_plans or settings.plan_storage_max_size
+        self._plan_index = _PlanColumnIndex()
         logger.info("PlanService initialized")
 
     async def generate_plan(self, request: PlanRequest) -> PlanResponse:
@@ -117,13 +267,8 @@ class PlanService:
         try:
             logger.info(f"Querying plans with filters: {request.model_dump()}")
 
-            # 过滤方案
-            filtered_plans = self._filter_plans(request)
-
-            # 分页
-            start_idx = request.offset
-            end_idx = start_idx + request.limit
-            paginated_plans = filtered_plans[start_idx:end_idx]
+            # 过滤并分页
+            paginated_plans = self._filter_plans(request)
 
             logger.info(f"Found {len(paginated_plans)} plans")
             return paginated_plans
@@ -151,8 +296,9 @@ class PlanService:
                 logger.warning(f"Plan not found: {plan_id}")
                 return None
 
+            self.plans_storage.move_to_end(plan_id)
             plan_data = self.plans_storage[plan_id]
-            return PlanResponse(**plan_data["response"])
+            return plan_data["response"]
 
         except Exception as e:
             logger.error(f"Failed to get plan: {e!s}")
@@ -167,8 +313,9 @@ class PlanService:
         Returns:
             生成的方案ID
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return f"plan_{strategy_name}_{timestamp}"
+        timestamp, _ = _format_timestamp(int(time.time()))
+        # 追加随机后缀,避免同一秒内同策略生成的方案ID冲突
+        return f"plan_{strategy_name}_{timestamp}_{secrets.token_hex(3)}"
 
     def _format_to_markdown(self, request: PlanRequest) -> str:
         """将分析结果格式化为Markdown
@@ -181,6 +328,10 @@ class PlanService:
         """
         analysis = request.analysis_result
         backtest = request.backtest_result
+        _, generated_at = _format_timestamp(int(time.time()))
+        risk_assessment = analysis.get("risk_assessment") or _EMPTY_DICT
+        operation_suggestions = analysis.get("operation_suggestions") or _EMPTY_LIST
+        market_outlook = analysis.get("market_outlook") or _EMPTY_DICT
 
         markdown_content = f"""# 投资方案报告
 
@@ -189,14 +340,14 @@ class PlanService:
 | 项目 | 内容 |
 |------|------|
 | 策略名称 | {request.strategy_name} |
-| 生成时间 | {datetime.now().strftime("%Y-%m-%d %H:%M:%S")} |
+| 生成时间 | {generated_at} |
 | 分析类型 | {analysis.get("analysis_type", "综合分析")} |
 
 ## 策略分析
 
 ### 策略表现评估
 
-{self._format_strategy_analysis(analysis.get("strategy_analysis", {}))}
+{self._format_strategy_analysis(analysis.get("strategy_analysis") or _EMPTY_DICT)}
 
 ### 回测结果概览
 
@@ -212,35 +363,35 @@ class PlanService:
 
 ### 风险等级
 
-{self._format_risk_assessment(analysis.get("risk_assessment", {}))}
+{self._format_risk_assessment(risk_assessment)}
 
 ### 风险控制建议
 
-{self._format_risk_suggestions(analysis.get("risk_assessment", {}))}
+{self._format_risk_suggestions(risk_assessment)}
 
 ## 操作建议
 
 ### 具体建议
 
-{self._format_operation_suggestions(analysis.get("operation_suggestions", []))}
+{self._format_operation_suggestions(operation_suggestions)}
 
 ### 建议优先级
 
-{self._format_suggestion_priorities(analysis.get("operation_suggestions", []))}
+{self._format_suggestion_priorities(operation_suggestions)}
 
 ## 市场展望
 
 ### 短期预期
 
-{self._format_market_outlook(analysis.get("market_outlook", {}))}
+{self._format_market_outlook(market_outlook)}
 
 ### 关键因子
 
-{self._format_key_factors(analysis.get("key_factors", []))}
+{self._format_key_factors(analysis.get("key_factors") or _EMPTY_LIST)}
 
 ## 风险警告
 
-{self._format_warnings(analysis.get("warnings", []))}
+{self._format_warnings(analysis.get("warnings") or _EMPTY_LIST)}
 
 ## 置信度评分
 
@@ -256,7 +407,7 @@ class PlanService:
     def _format_strategy_analysis(self, strategy_analysis: dict[str, Any]) -> str:
         """格式化策略分析"""
         if not strategy_analysis:
-            return "暂无策略分析数据"
+            return _EMPTY_STRATEGY
 
         content = []
         if "performance" in strategy_analysis:
@@ -268,12 +419,12 @@ class PlanService:
         if "improvements" in strategy_analysis:
             content.append(f"**改进建议**: {strategy_analysis['improvements']}")
 
-        return "\n\n".join(content) if content else "暂无详细分析"
+        return "\n\n".join(content) if content else _EMPTY_STRATEGY_DETAIL
 
     def _format_risk_assessment(self, risk_assessment: dict[str, Any]) -> str:
         """格式化风险评估"""
         if not risk_assessment:
-            return "暂无风险评估数据"
+            return _EMPTY_RISK
 
         content = []
         if "level" in risk_assessment:
@@ -284,12 +435,12 @@ class PlanService:
                 risk_list = "\n".join([f"- {risk}" for risk in risks])
                 content.append(f"**主要风险**:\n{risk_list}")
 
-        return "\n\n".join(content) if content else "暂无风险评估"
+        return "\n\n".join(content) if content else _EMPTY_RISK_DETAIL
 
     def _format_risk_suggestions(self, risk_assessment: dict[str, Any]) -> str:
         """格式化风险控制建议"""
         if not risk_assessment or "control_suggestions" not in risk_assessment:
-            return "暂无风险控制建议"
+            return _EMPTY_RISK_SUGGESTIONS
 
         suggestions = risk_assessment["control_suggestions"]
         if isinstance(suggestions, list):
@@ -299,7 +450,7 @@ class PlanService:
     def _format_operation_suggestions(self, suggestions: list[dict[str, Any]]) -> str:
         """格式化操作建议"""
         if not suggestions:
-            return "暂无操作建议"
+            return _EMPTY_OPERATIONS
 
         content = []
         for i, suggestion in enumerate(suggestions, 1):
@@ -315,38 +466,27 @@ class PlanService:
     def _format_suggestion_priorities(self, suggestions: list[dict[str, Any]]) -> str:
         """格式化建议优先级"""
         if not suggestions:
-            return "暂无优先级信息"
+            return _EMPTY_PRIORITIES
 
-        high_priority = []
-        medium_priority = []
-        low_priority = []
+        buckets: tuple[list[str], list[str], list[str]] = ([], [], [])
 
         for suggestion in suggestions:
             if isinstance(suggestion, dict):
-                priority = suggestion.get("priority", "medium")
-                action = suggestion.get("action", "未知操作")
-
-                if priority == "high":
-                    high_priority.append(action)
-                elif priority == "low":
-                    low_priority.append(action)
-                else:
-                    medium_priority.append(action)
+                index = _PRIORITY_INDEX.get(suggestion.get("priority", "medium"), 1)
+                buckets[index].append(suggestion.get("action", "未知操作"))
 
-        content = []
-        if high_priority:
-            content.append(f"**高优先级**: {', '.join(high_priority)}")
-        if medium_priority:
-            content.append(f"**中优先级**: {', '.join(medium_priority)}")
-        if low_priority:
-            content.append(f"**低优先级**: {', '.join(low_priority)}")
+        content = [
+            f"{label}: {', '.join(actions)}"
+            for label, actions in zip(_PRIORITY_LABELS, buckets, strict=True)
+            if actions
+        ]
 
-        return "\n".join(content) if content else "暂无优先级分类"
+        return "\n".join(content) if content else _EMPTY_PRIORITIES_DETAIL
 
     def _format_market_outlook(self, market_outlook: dict[str, Any]) -> str:
         """格式化市场展望"""
         if not market_outlook:
-            return "暂无市场展望数据"
+            return _EMPTY_OUTLOOK
 
         content = []
         if "short_term" in market_outlook:
@@ -357,19 +497,19 @@ class PlanService:
                 factor_list = "\n".join([f"- {factor}" for factor in factors])
                 content.append(f"**影响因素**:\n{factor_list}")
 
-        return "\n\n".join(content) if content else "暂无市场展望"
+        return "\n\n".join(content) if content else _EMPTY_OUTLOOK_DETAIL
 
     def _format_key_factors(self, key_factors: list[str]) -> str:
         """格式化关键因子"""
         if not key_factors:
-            return "暂无关键因子数据"
+            return _EMPTY_KEY_FACTORS
 
         return "\n".join([f"- {factor}" for factor in key_factors])
 
     def _format_warnings(self, warnings: list[str]) -> str:
         """格式化风险警告"""
         if not warnings:
-            return "暂无特别风险警告"
+            return _EMPTY_WARNINGS
 
         return "\n".join([f"⚠️ {warning}" for warning in warnings])
 
@@ -407,13 +547,24 @@ class PlanService:
             response: 方案响应
             request: 原始请求
         """
+        # 响应对象直接保存供查询复用,请求由pydantic序列化为JSON字符串归档,
+        # 嵌套字典的非字符串键按JSON规则转为字符串
         plan_data = {
-            "response": response.model_dump(),
-            "request": request.model_dump(),
+            "response": response,
+            "request": request.model_dump_json(),
             "created_at": response.created_at,
         }
 
         self.plans_storage[response.plan_id] = plan_data
+        self.plans_storage.move_to_end(response.plan_id)
+        self._plan_index.add(
+            response.plan_id, response.strategy_name, response.created_at
+        )
+        while len(self.plans_storage) > self.max_plans:
+            evicted_id, _ = self.plans_storage.popitem(last=False)
+            self._plan_index.remove(evicted_id)
+            logger.debug(f"Plan evicted from storage: {evicted_id}")
+
         logger.info(f"Plan saved: {response.plan_id}")
 
     def _filter_plans(self, request: PlanQueryRequest) -> list[PlanResponse]:
@@ -423,34 +574,7 @@ class PlanService:
             request: 查询请求
 
         Returns:
-            过滤后的方案列表
+            按创建时间倒序、已分页的方案列表
         """
-        filtered_plans = []
-
-        for plan_id, plan_data in self.plans_storage.items():
-            response_data = plan_data["response"]
-            created_at = plan_data["created_at"]
-
-            # 按ID过滤
-            if request.plan_id and plan_id != request.plan_id:
-                continue
-
-            # 按策略名称过滤
-            if (
-                request.strategy_name
-                and response_data["strategy_name"] != request.strategy_name
-            ):
-                continue
-
-            # 按日期范围过滤
-            if request.start_date and created_at < request.start_date:
-                continue
-            if request.end_date and created_at > request.end_date:
-                continue
-
-            filtered_plans.append(PlanResponse(**response_data))
-
-        # 按创建时间倒序排序
-        filtered_plans.sort(key=lambda x: x.created_at, reverse=True)
-
-        return filtered_plans
+        plan_ids = self._plan_index.query(request)
+        return [self.plans_storage[plan_id]["response"] for plan_id in plan_ids]
@@ -1,5 +1,7 @@
 """持仓管理服务"""
 
+import asyncio
+import time
 from datetime import date
 from decimal import Decimal
 from typing import Any
@@ -7,6 +9,7 @@ from typing import Any
 from loguru import logger
 
 from clients.data_collection_client import DataCollectionClient
+from models.database import Position
 from models.enums import PositionStatus, PositionType
 from models.schemas import (
     PositionCreate,
@@ -22,6 +25,35 @@ from utils.exceptions import (
     ValidationError,
 )
 
+# 最新价格缓存有效期(秒),用于合并短时间内对同一股票的重复行情请求
+PRICE_CACHE_TTL = 5.0
+
+
+# PositionResponse字段列表,用于批量构建响应时直接从ORM对象取值
+_POSITION_FIELDS = tuple(PositionResponse.model_fields)
+
+
+def _to_position_responses(positions: list[Position]) -> list[PositionResponse]:
+    """批量将ORM持仓转换为响应模型
+
+    数据库行的字段类型已由表结构保证,使用 model_construct 跳过逐字段校验。
+    """
+    return [
+        PositionResponse.model_construct(
+            **{field: getattr(pos, field) for field in _POSITION_FIELDS}
+        )
+        for pos in positions
+    ]
+
+
+def _to_decimal(value: Any) -> Decimal:
+    """转换为Decimal,已是Decimal或整数时跳过字符串解析"""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    return Decimal(str(value))
+
 
 class PositionService:
     """持仓管理服务
@@ -46,8 +78,10 @@ class PositionService:
         """
         self.position_repo = position_repo or PositionRepo()
         self.data_client = data_client or DataCollectionClient()
+        # 最新价格缓存: {symbol: (获取时间, 价格)}
+        self._price_cache: dict[str, tuple[float, Decimal]] = {}
 
-    def create_position(self, position_data: PositionCreate) -> PositionResponse:
+    async def create_position(self, position_data: PositionCreate) -> PositionResponse:
         """创建新持仓
 
         Args:
@@ -61,20 +95,27 @@ class PositionService:
             BusinessError: 业务规则验证失败
         """
         # 业务校验
-        self._validate_position_create(position_data)
+        await asyncio.to_thread(self._validate_position_create, position_data)
 
         try:
-            # 创建持仓
-            position = self.position_repo.create(position_data)
+            # 已有新鲜价格缓存时直接以该价格创建,省去创建后的更新和回查
+            cached_price = self._get_cached_price(position_data.symbol)
+            position = await asyncio.to_thread(
+                self.position_repo.create, position_data, initial_price=cached_price
+            )
+            if cached_price is not None:
+                return PositionResponse.model_validate(position)
 
             # 尝试更新当前价格
             try:
-                self._update_position_price(position.symbol)
+                await self._update_position_price(position.symbol)
             except ExternalServiceError:
                 logger.warning(f"创建持仓后更新价格失败: {position.symbol}")
 
             # 重新获取更新后的持仓
-            updated_position = self.position_repo.get_by_id(position.id)
+            updated_position = await asyncio.to_thread(
+                self.position_repo.get_by_id, position.id
+            )
             if not updated_position:
                 raise BusinessError("创建持仓后获取失败")
 
@@ -102,7 +143,7 @@ class PositionService:
 
         return PositionResponse.model_validate(position)
 
-    def update_position(
+    async def update_position(
         self, position_id: int, update_data: PositionUpdate
     ) -> PositionResponse:
         """更新持仓
@@ -124,7 +165,9 @@ class PositionService:
 
         try:
             # 更新持仓
-            position = self.position_repo.update(position_id, update_data)
+            position = await asyncio.to_thread(
+                self.position_repo.update, position_id, update_data
+            )
             if not position:
                 raise NotFoundError(f"持仓不存在: ID={position_id}")
 
@@ -171,7 +214,7 @@ class PositionService:
             活跃持仓列表
         """
         positions = self.position_repo.get_active_positions()
-        return [PositionResponse.model_validate(pos) for pos in positions]
+        return _to_position_responses(positions)
 
     def get_positions_by_type(
         self, position_type: PositionType
@@ -185,7 +228,7 @@ class PositionService:
             持仓列表
         """
         positions = self.position_repo.get_positions_by_type(position_type)
-        return [PositionResponse.model_validate(pos) for pos in positions]
+        return _to_position_responses(positions)
 
     def get_portfolio_summary(self) -> PositionSummary:
         """获取投资组合汇总信息
@@ -204,9 +247,9 @@ class PositionService:
             # 计算总收益率
             total_return_rate = Decimal("0")
             if total_cost > 0:
-                total_pnl = Decimal(
-                    str(summary_data["total_unrealized_pnl"])
-                ) + Decimal(str(summary_data["total_realized_pnl"]))
+                total_pnl = _to_decimal(
+                    summary_data["total_unrealized_pnl"]
+                ) + _to_decimal(summary_data["total_realized_pnl"])
                 total_return_rate = (total_pnl / total_cost) * 100
 
             # 统计已平仓持仓数
@@ -223,10 +266,10 @@ class PositionService:
 
             return PositionSummary(
                 total_positions=summary_data["total_positions"],
-                total_market_value=Decimal(str(summary_data["total_market_value"])),
+                total_market_value=_to_decimal(summary_data["total_market_value"]),
                 total_cost=total_cost,
-                total_unrealized_pnl=Decimal(str(summary_data["total_unrealized_pnl"])),
-                total_realized_pnl=Decimal(str(summary_data["total_realized_pnl"])),
+                total_unrealized_pnl=_to_decimal(summary_data["total_unrealized_pnl"]),
+                total_realized_pnl=_to_decimal(summary_data["total_realized_pnl"]),
                 total_return_rate=total_return_rate,
                 active_positions=summary_data["total_positions"],
                 closed_positions=closed_positions,
@@ -246,7 +289,7 @@ class PositionService:
                 closed_positions=0,
             )
 
-    def update_all_prices(self) -> dict[str, Any]:
+    async def update_all_prices(self) -> dict[str, Any]:
         """更新所有活跃持仓的当前价格
 
         Returns:
@@ -254,7 +297,9 @@ class PositionService:
         """
         try:
             # 获取所有活跃持仓的股票代码
-            active_positions = self.position_repo.get_active_positions()
+            active_positions = await asyncio.to_thread(
+                self.position_repo.get_active_positions
+            )
             symbols = list({pos.symbol for pos in active_positions})
 
             if not symbols:
@@ -265,24 +310,28 @@ class PositionService:
                     "updated_positions": 0,
                 }
 
-            # 批量获取最新价格
+            # 并发获取最新价格
             price_updates = {}
             failed_symbols = []
 
-            for symbol in symbols:
-                try:
-                    price = self._get_latest_price(symbol)
-                    if price:
-                        price_updates[symbol] = price
-                except ExternalServiceError:
+            prices = await asyncio.gather(
+                *(self._get_latest_price(symbol) for symbol in symbols),
+                return_exceptions=True,
+            )
+            for symbol, price in zip(symbols, prices, strict=True):
+                if isinstance(price, ExternalServiceError):
                     failed_symbols.append(symbol)
                     logger.warning(f"获取股票价格失败: {symbol}")
+                elif isinstance(price, BaseException):
+                    raise price
+                elif price:
+                    price_updates[symbol] = price
 
             # 批量更新价格
             updated_positions = 0
             if price_updates:
-                updated_positions = self.position_repo.update_current_prices(
-                    price_updates
+                updated_positions = await asyncio.to_thread(
+                    self.position_repo.update_current_prices, price_updates
                 )
 
             result = {
@@ -299,7 +348,7 @@ class PositionService:
             logger.error(f"批量更新价格失败: {e}")
             raise BusinessError(f"批量更新价格失败: {e}") from e
 
-    def update_position_price(self, symbol: str) -> bool:
+    async def update_position_price(self, symbol: str) -> bool:
         """更新指定股票的持仓价格
 
         Args:
@@ -309,12 +358,12 @@ class PositionService:
             是否更新成功
         """
         try:
-            return self._update_position_price(symbol)
+            return await self._update_position_price(symbol)
         except Exception as e:
             logger.error(f"更新持仓价格失败: symbol={symbol}, 错误: {e}")
             return False
 
-    def close_position(
+    async def close_position(
         self, position_id: int, close_price: Decimal, close_date: date | None = None
     ) -> PositionResponse:
         """平仓操作
@@ -332,7 +381,7 @@ class PositionService:
             BusinessError: 业务规则验证失败
         """
         # 获取持仓
-        position = self.position_repo.get_by_id(position_id)
+        position = await asyncio.to_thread(self.position_repo.get_by_id, position_id)
         if not position:
             raise NotFoundError(f"持仓不存在: ID={position_id}")
 
@@ -354,7 +403,9 @@ class PositionService:
                 close_date=close_date or date.today(),
             )
 
-            updated_position = self.position_repo.update(position_id, update_data)
+            updated_position = await asyncio.to_thread(
+                self.position_repo.update, position_id, update_data
+            )
             if not updated_position:
                 raise BusinessError("平仓更新失败")
 
@@ -362,6 +413,8 @@ class PositionService:
             updated_position.realized_pnl = realized_pnl
             updated_position.unrealized_pnl = Decimal("0")  # 平仓后无浮动盈亏
 
+            self.invalidate_price(position.symbol)
+
             logger.info(f"平仓成功: {position.symbol}, 已实现盈亏: {realized_pnl}")
             return PositionResponse.model_validate(updated_position)
 
@@ -369,6 +422,14 @@ class PositionService:
             logger.error(f"平仓失败: ID={position_id}, 错误: {e}")
             raise BusinessError(f"平仓失败: {e}") from e
 
+    def invalidate_price(self, symbol: str) -> None:
+        """清除指定股票的最新价格缓存
+
+        Args:
+            symbol: 股票代码
+        """
+        self._price_cache.pop(symbol, None)
+
     def _validate_position_create(self, position_data: PositionCreate) -> None:
         """验证创建持仓数据
 
@@ -397,12 +458,7 @@ class PositionService:
             raise ValidationError("开仓日期不能是未来日期")
 
         # 检查是否已存在相同股票的活跃持仓
-        existing_positions = self.position_repo.get_by_symbol(position_data.symbol)
-        active_positions = [
-            pos for pos in existing_positions if pos.status == PositionStatus.ACTIVE
-        ]
-
-        if active_positions:
+        if self.position_repo.has_active_position(position_data.symbol):
             logger.warning(f"股票 {position_data.symbol} 已存在活跃持仓")
             # 这里可以选择合并持仓或者抛出异常，根据业务需求决定
             # raise BusinessError(f"股票 {position_data.symbol} 已存在活跃持仓")
@@ -428,7 +484,7 @@ class PositionService:
         if update_data.close_date is not None and update_data.close_date > date.today():
             raise ValidationError("平仓日期不能是未来日期")
 
-    def _update_position_price(self, symbol: str) -> bool:
+    async def _update_position_price(self, symbol: str) -> bool:
         """更新指定股票的持仓价格
 
         Args:
@@ -442,13 +498,13 @@ class PositionService:
         """
         try:
             # 获取最新价格
-            latest_price = self._get_latest_price(symbol)
+            latest_price = await self._get_latest_price(symbol)
             if not latest_price:
                 return False
 
             # 更新价格
-            updated_count = self.position_repo.update_current_prices(
-                {symbol: latest_price}
+            updated_count = await asyncio.to_thread(
+                self.position_repo.update_current_prices, {symbol: latest_price}
             )
             return updated_count > 0
 
@@ -458,9 +514,25 @@ class PositionService:
             logger.error(f"更新持仓价格失败: symbol={symbol}, 错误: {e}")
             return False
 
-    def _get_latest_price(self, symbol: str) -> Decimal | None:
+    def _get_cached_price(self, symbol: str) -> Decimal | None:
+        """获取未过期的缓存价格
+
+        Args:
+            symbol: 股票代码
+
+        Returns:
+            缓存价格，不存在或已过期返回None
+        """
+        cached = self._price_cache.get(symbol)
+        if cached and time.monotonic() - cached[0] < PRICE_CACHE_TTL:
+            return cached[1]
+        return None
+
+    async def _get_latest_price(self, symbol: str) -> Decimal | None:
         """获取股票最新价格
 
+        结果在 PRICE_CACHE_TTL 秒内缓存,合并创建持仓与批量更新价格时的重复请求。
+
         Args:
             symbol: 股票代码
 
@@ -470,16 +542,24 @@ class PositionService:
         Raises:
             ExternalServiceError: 外部服务调用失败
         """
+        cached_price = self._get_cached_price(symbol)
+        if cached_price is not None:
+            return cached_price
+
         try:
             # 调用数据采集系统获取最新行情
-            response = self.data_client.get_latest_market_data(symbol)
+            response = await asyncio.to_thread(
+                self.data_client.get_latest_market_data, symbol
+            )
 
             # 解析响应数据
             if response.get("code") == 200 and response.get("data"):
                 market_data = response["data"]
                 close_price = market_data.get("close")
                 if close_price is not None:
-                    return Decimal(str(close_price))
+                    price = Decimal(str(close_price))
+                    self._price_cache[symbol] = (time.monotonic(), price)
+                    return price
 
             logger.warning(f"获取股票价格失败: {symbol}, 响应: {response}")
             return None
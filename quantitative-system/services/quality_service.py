@@ -4,14 +4,234 @@
 确保数据的完整性、准确性和一致性。
 """
 
+import re
+from collections.abc import Callable
 from datetime import date, datetime
+from functools import lru_cache, partial
+from itertools import chain
+from math import isinf
+from operator import attrgetter
 from typing import Any
 
+import numpy as np
+import pandas as pd
 from loguru import logger
 
 from models.database import FinancialData, StockBasicInfo, StockDailyData
 from utils.exceptions import ValidationError
 
+# 股票代码格式：6位数字.交易所代码
+_TS_CODE_RE = re.compile(r"\A\d{6}\.(?:SH|SZ|BJ)\Z")
+
+# 各类数据的必填字段
+_BASIC_REQUIRED = ("ts_code", "symbol", "name", "area", "industry", "market")
+_DAILY_REQUIRED = ("ts_code", "trade_date", "open", "high", "low", "close", "vol")
+_FIN_REQUIRED = ("ts_code", "ann_date", "end_date")
+_BASIC_GETTER = attrgetter(*_BASIC_REQUIRED)
+_DAILY_GETTER = attrgetter(*_DAILY_REQUIRED)
+_FIN_GETTER = attrgetter(*_FIN_REQUIRED)
+
+# 取值范围
+_LIST_STATUS = frozenset({"L", "D", "P"})
+_MARKETS = frozenset({"主板", "创业板", "科创板", "北交所", "新三板"})
+_SENTIMENT_LABELS = frozenset({"positive", "negative", "neutral"})
+_NEWS_FIELDS = (
+    "title",
+    "content",
+    "source",
+    "publish_time",
+    "url",
+    "category",
+    "sentiment_score",
+    "sentiment_label",
+    "related_stocks",
+)
+
+# 需要检查日期不晚于今天的数据类型
+_DATE_CHECKED_TYPES = frozenset({"daily_data", "financial_data"})
+
+# 数据质量报告中保留的错误详情条数
+_REPORT_MAX_ERRORS = 10
+
+# 各类数据需要标准化的日期字段
+_STANDARDIZE_DATE_FIELDS = {
+    "stock_basic": ("list_date", "delist_date"),
+    "daily_data": ("trade_date",),
+    "financial_data": ("ann_date", "end_date"),
+}
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_string(value: str, formats: tuple[str, ...] = ("%Y%m%d",)) -> date:
+    """按给定格式顺序解析日期字符串
+
+    8位纯数字的 YYYYMMDD 直接切片构造日期,其余格式回退到 strptime。
+    同一交易日会在成千上万只股票间重复出现,解析结果按参数缓存。
+
+    Args:
+        value: 日期字符串
+        formats: 依次尝试的日期格式
+
+    Returns:
+        解析后的日期对象
+
+    Raises:
+        ValueError: 所有格式均无法解析时
+    """
+    if "%Y%m%d" in formats and len(value) == 8 and value.isascii() and value.isdigit():
+        try:
+            return date(int(value[:4]), int(value[4:6]), int(value[6:]))
+        except ValueError:
+            pass
+
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"无法解析日期: {value}")
+
+
+def _check_financial_metrics(
+    ts_code: str,
+    end_date: Any,
+    revenue: Any,
+    n_income: Any,
+    total_assets: Any,
+    total_liab: Any,
+) -> None:
+    """检查财务指标的合理性
+
+    只依赖传入的取值,不需要访问服务实例。
+
+    Args:
+        ts_code: 股票代码
+        end_date: 报告期结束日期
+        revenue: 营业收入
+        n_income: 净利润
+        total_assets: 总资产
+        total_liab: 总负债
+
+    Raises:
+        ValidationError: 验证失败时
+    """
+    # 检查营业收入
+    if revenue is not None:
+        revenue = float(revenue)
+        if revenue < 0:
+            logger.warning(f"营业收入为负数: {ts_code} {end_date}, 收入: {revenue}")
+
+    # 检查净利润
+    if n_income is not None:
+        net_income = float(n_income)
+        # 净利润可以为负，但给出警告
+        if net_income < 0:
+            logger.debug(
+                "净利润为负数: {} {}, 净利润: {}", ts_code, end_date, net_income
+            )
+
+    # 检查总资产
+    if total_assets is not None:
+        total_assets = float(total_assets)
+        if total_assets <= 0:
+            raise ValidationError(
+                f"总资产必须大于零: {ts_code} {end_date}, 总资产: {total_assets}"
+            )
+
+    # 检查总负债
+    if total_liab is not None:
+        total_liab = float(total_liab)
+        if total_liab < 0:
+            logger.warning(f"总负债为负数: {ts_code} {end_date}, 总负债: {total_liab}")
+
+    # 检查资产负债率
+    if total_assets is not None and total_liab is not None and total_assets > 0:
+        debt_ratio = total_liab / total_assets
+        if debt_ratio > 1.0:
+            logger.warning(
+                f"资产负债率超过100%: {ts_code} {end_date}, 比率: {debt_ratio:.2%}"
+            )
+        elif debt_ratio < 0:
+            logger.warning(
+                f"资产负债率为负数: {ts_code} {end_date}, 比率: {debt_ratio:.2%}"
+            )
+
+
+def _standardize_date_string(date_value: str) -> date | None:
+    """按YYYYMMDD、YYYY-MM-DD格式解析日期字符串,无法解析时返回None"""
+    try:
+        return _parse_date_string(date_value, ("%Y%m%d", "%Y-%m-%d"))
+    except ValueError:
+        logger.warning(f"无法解析日期格式: {date_value}")
+        return None
+
+
+# 按值的精确类型选择日期标准化方式
+_DATE_CONVERTERS: dict[type, Callable[[Any], date | None]] = {
+    str: _standardize_date_string,
+    date: lambda value: value,
+    datetime: datetime.date,
+}
+
+
+def _required_values(
+    obj: Any, fields: tuple[str, ...], getter: attrgetter
+) -> tuple[Any, ...]:
+    """一次性读取必填字段的值,缺少属性时按None处理"""
+    try:
+        return getter(obj)
+    except AttributeError:
+        return tuple(getattr(obj, field, None) for field in fields)
+
+
+def _clean_value(value: Any) -> Any:
+    """清洗单个字段值: 空值归一为None、字符串去空白、无穷大置空"""
+    # 处理空值
+    if value is None or value == "" or value == "None":
+        return None
+    # 处理字符串
+    if isinstance(value, str):
+        return value.strip()
+    # 处理异常值（整数不可能为无穷大,只需检查浮点数）
+    if isinstance(value, float) and isinf(value):
+        return None
+    return value
+
+
+@lru_cache(maxsize=65536)
+def _check_daily_prices(
+    open_value: Any, high_value: Any, low_value: Any, close_value: Any
+) -> tuple[str | None, float]:
+    """检查日线价格的合理性
+
+    只依赖四个价格,结果按取值缓存:停牌股票和重复写入的记录价格完全相同,
+    重复校验时直接命中缓存。
+
+    Args:
+        open_value: 开盘价
+        high_value: 最高价
+        low_value: 最低价
+        close_value: 收盘价
+
+    Returns:
+        (问题描述, 涨跌幅绝对值),价格合理时问题描述为None
+    """
+    open_price = float(open_value or 0)
+    high_price = float(high_value or 0)
+    low_price = float(low_value or 0)
+    close_price = float(close_value or 0)
+
+    if open_price <= 0 or high_price <= 0 or low_price <= 0 or close_price <= 0:
+        return "价格数据不能为负数或零", 0.0
+
+    if high_price < open_price or high_price < close_price or high_price < low_price:
+        return "最高价不能小于开盘价、收盘价或最低价", 0.0
+
+    if low_price > open_price or low_price > close_price or low_price > high_price:
+        return "最低价不能大于开盘价、收盘价或最高价", 0.0
+
+    return None, abs(close_price - open_price) / open_price
+
 
 class QualityService:
     """数据质量服务
@@ -24,11 +244,14 @@ class QualityService:
         """初始化数据质量服务"""
         logger.info("数据质量服务初始化完成")
 
-    def validate_stock_basic_info(self, stock_data: StockBasicInfo) -> bool:
+    def validate_stock_basic_info(
+        self, stock_data: StockBasicInfo, *, check_ts_code: bool = True
+    ) -> bool:
         """验证股票基础信息
 
         Args:
             stock_data: 股票基础信息
+            check_ts_code: 是否检查股票代码格式,批量预检已校验时可关闭
 
         Returns:
             验证是否通过
@@ -38,42 +261,27 @@ class QualityService:
         """
         try:
             # 必填字段检查
-            required_fields = [
-                "ts_code",
-                "symbol",
-                "name",
-                "area",
-                "industry",
-                "market",
-            ]
-            for field in required_fields:
-                value = getattr(stock_data, field, None)
+            values = _required_values(stock_data, _BASIC_REQUIRED, _BASIC_GETTER)
+            for field, value in zip(_BASIC_REQUIRED, values, strict=True):
                 if not value or (isinstance(value, str) and not value.strip()):
                     raise ValidationError(f"股票基础信息缺少必填字段: {field}")
 
             # 股票代码格式检查
             ts_code = stock_data.ts_code
-            if not self._is_valid_ts_code(ts_code):
+            if check_ts_code and not self._is_valid_ts_code(ts_code):
                 raise ValidationError(f"股票代码格式无效: {ts_code}")
 
             # 上市状态检查
-            if (
-                hasattr(stock_data, "list_status")
-                and stock_data.list_status
-                and stock_data.list_status not in ["L", "D", "P"]
-            ):
-                raise ValidationError(f"上市状态无效: {stock_data.list_status}")
+            list_status = getattr(stock_data, "list_status", None)
+            if list_status and list_status not in _LIST_STATUS:
+                raise ValidationError(f"上市状态无效: {list_status}")
 
             # 市场检查
-            if (
-                hasattr(stock_data, "market")
-                and stock_data.market
-                and stock_data.market
-                not in ["主板", "创业板", "科创板", "北交所", "新三板"]
-            ):
-                logger.warning(f"未知市场类型: {stock_data.market}")
-
-            logger.debug(f"股票基础信息验证通过: {ts_code}")
+            market = getattr(stock_data, "market", None)
+            if market and market not in _MARKETS:
+                logger.warning(f"未知市场类型: {market}")
+
+            logger.debug("股票基础信息验证通过: {}", ts_code)
             return True
 
         except ValidationError:
@@ -83,11 +291,19 @@ class QualityService:
             logger.error(error_msg)
             raise ValidationError(error_msg) from e
 
-    def validate_daily_data(self, daily_data: StockDailyData) -> bool:
+    def validate_daily_data(
+        self,
+        daily_data: StockDailyData,
+        *,
+        check_ts_code: bool = True,
+        today: date | None = None,
+    ) -> bool:
         """验证股票日线数据
 
         Args:
             daily_data: 股票日线数据
+            check_ts_code: 是否检查股票代码格式,批量预检已校验时可关闭
+            today: 当前日期,批量验证时由调用方统一传入,默认取今天
 
         Returns:
             验证是否通过
@@ -97,73 +313,50 @@ class QualityService:
         """
         try:
             # 必填字段检查
-            required_fields = [
-                "ts_code",
-                "trade_date",
-                "open",
-                "high",
-                "low",
-                "close",
-                "vol",
-            ]
-            for field in required_fields:
-                value = getattr(daily_data, field, None)
+            values = _required_values(daily_data, _DAILY_REQUIRED, _DAILY_GETTER)
+            for field, value in zip(_DAILY_REQUIRED, values, strict=True):
                 if value is None:
                     raise ValidationError(f"日线数据缺少必填字段: {field}")
 
             # 股票代码格式检查
             ts_code = daily_data.ts_code
-            if not self._is_valid_ts_code(ts_code):
+            if check_ts_code and not self._is_valid_ts_code(ts_code):
                 raise ValidationError(f"股票代码格式无效: {ts_code}")
 
+            # 价格数据合理性检查（廉价的算术检查先于日期解析）
+            price_problem, change_pct = _check_daily_prices(
+                daily_data.open, daily_data.high, daily_data.low, daily_data.close
+            )
+            if price_problem is not None:
+                raise ValidationError(
+                    f"{price_problem}: {ts_code} {daily_data.trade_date}"
+                )
+
             # 交易日期检查
             trade_date = daily_data.trade_date
             if isinstance(trade_date, str):
                 try:
-                    trade_date = datetime.strptime(trade_date, "%Y%m%d").date()
+                    trade_date = _parse_date_string(trade_date)
                 except ValueError as e:
                     raise ValidationError(
                         f"交易日期格式无效: {daily_data.trade_date}"
                     ) from e
 
-            if trade_date > date.today():
+            if trade_date > (today or date.today()):
                 raise ValidationError(f"交易日期不能大于今天: {trade_date}")
 
-            # 价格数据合理性检查
-            open_price = float(daily_data.open or 0)
-            high_price = float(daily_data.high or 0)
-            low_price = float(daily_data.low or 0)
-            close_price = float(daily_data.close or 0)
-
-            if any(
-                price <= 0 for price in [open_price, high_price, low_price, close_price]
-            ):
-                raise ValidationError(f"价格数据不能为负数或零: {ts_code} {trade_date}")
-
-            if high_price < max(open_price, close_price, low_price):
-                raise ValidationError(
-                    f"最高价不能小于开盘价、收盘价或最低价: {ts_code} {trade_date}"
-                )
-
-            if low_price > min(open_price, close_price, high_price):
-                raise ValidationError(
-                    f"最低价不能大于开盘价、收盘价或最高价: {ts_code} {trade_date}"
-                )
-
             # 成交量检查
             volume = float(daily_data.vol or 0)
             if volume < 0:
                 raise ValidationError(f"成交量不能为负数: {ts_code} {trade_date}")
 
             # 异常波动检查（涨跌幅超过20%给出警告）
-            if open_price > 0:
-                change_pct = abs(close_price - open_price) / open_price
-                if change_pct > 0.2:
-                    logger.warning(
-                        f"价格异常波动: {ts_code} {trade_date}, 涨跌幅: {change_pct:.2%}"
-                    )
-
-            logger.debug(f"日线数据验证通过: {ts_code} {trade_date}")
+            if change_pct > 0.2:
+                logger.warning(
+                    f"价格异常波动: {ts_code} {trade_date}, 涨跌幅: {change_pct:.2%}"
+                )
+
+            logger.debug("日线数据验证通过: {} {}", ts_code, trade_date)
             return True
 
         except ValidationError:
@@ -173,11 +366,19 @@ class QualityService:
             logger.error(error_msg)
             raise ValidationError(error_msg) from e
 
-    def validate_financial_data(self, financial_data: FinancialData) -> bool:
+    def validate_financial_data(
+        self,
+        financial_data: FinancialData,
+        *,
+        check_ts_code: bool = True,
+        today: date | None = None,
+    ) -> bool:
         """验证财务数据
 
         Args:
             financial_data: 财务数据
+            check_ts_code: 是否检查股票代码格式,批量预检已校验时可关闭
+            today: 当前日期,批量验证时由调用方统一传入,默认取今天
 
         Returns:
             验证是否通过
@@ -187,15 +388,14 @@ class QualityService:
         """
         try:
             # 必填字段检查
-            required_fields = ["ts_code", "ann_date", "end_date"]
-            for field in required_fields:
-                value = getattr(financial_data, field, None)
+            values = _required_values(financial_data, _FIN_REQUIRED, _FIN_GETTER)
+            for field, value in zip(_FIN_REQUIRED, values, strict=True):
                 if not value:
                     raise ValidationError(f"财务数据缺少必填字段: {field}")
 
             # 股票代码格式检查
             ts_code = financial_data.ts_code
-            if not self._is_valid_ts_code(ts_code):
+            if check_ts_code and not self._is_valid_ts_code(ts_code):
                 raise ValidationError(f"股票代码格式无效: {ts_code}")
 
             # 日期格式检查
@@ -204,7 +404,7 @@ class QualityService:
 
             if isinstance(ann_date, str):
                 try:
-                    ann_date = datetime.strptime(ann_date, "%Y%m%d").date()
+                    ann_date = _parse_date_string(ann_date)
                 except ValueError as e:
                     raise ValidationError(
                         f"公告日期格式无效: {financial_data.ann_date}"
@@ -212,7 +412,7 @@ class QualityService:
 
             if isinstance(end_date, str):
                 try:
-                    end_date = datetime.strptime(end_date, "%Y%m%d").date()
+                    end_date = _parse_date_string(end_date)
                 except ValueError as e:
                     raise ValidationError(
                         f"报告期结束日期格式无效: {financial_data.end_date}"
@@ -224,13 +424,13 @@ class QualityService:
                     f"公告日期早于报告期结束日期: {ts_code} {ann_date} < {end_date}"
                 )
 
-            if end_date > date.today():
+            if end_date > (today or date.today()):
                 raise ValidationError(f"报告期结束日期不能大于今天: {end_date}")
 
             # 财务指标合理性检查
             self._validate_financial_metrics(financial_data)
 
-            logger.debug(f"财务数据验证通过: {ts_code} {end_date}")
+            logger.debug("财务数据验证通过: {} {}", ts_code, end_date)
             return True
 
         except ValidationError:
@@ -249,19 +449,7 @@ class QualityService:
         Returns:
             是否有效
         """
-        if not ts_code or not isinstance(ts_code, str):
-            return False
-
-        # 格式：6位数字.交易所代码
-        parts = ts_code.split(".")
-        if len(parts) != 2:
-            return False
-
-        code, exchange = parts
-        if not code.isdigit() or len(code) != 6:
-            return False
-
-        return exchange in ["SH", "SZ", "BJ"]
+        return isinstance(ts_code, str) and _TS_CODE_RE.match(ts_code) is not None
 
     def _validate_financial_metrics(self, financial_data: FinancialData) -> None:
         """验证财务指标的合理性
@@ -272,65 +460,14 @@ class QualityService:
         Raises:
             ValidationError: 验证失败时
         """
-        ts_code = financial_data.ts_code
-        end_date = financial_data.end_date
-
-        # 检查营业收入
-        if hasattr(financial_data, "revenue") and financial_data.revenue is not None:
-            revenue = float(financial_data.revenue)
-            if revenue < 0:
-                logger.warning(f"营业收入为负数: {ts_code} {end_date}, 收入: {revenue}")
-
-        # 检查净利润
-        if hasattr(financial_data, "n_income") and financial_data.n_income is not None:
-            net_income = float(financial_data.n_income)
-            # 净利润可以为负，但给出警告
-            if net_income < 0:
-                logger.debug(
-                    f"净利润为负数: {ts_code} {end_date}, 净利润: {net_income}"
-                )
-
-        # 检查总资产
-        if (
-            hasattr(financial_data, "total_assets")
-            and financial_data.total_assets is not None
-        ):
-            total_assets = float(financial_data.total_assets)
-            if total_assets <= 0:
-                raise ValidationError(
-                    f"总资产必须大于零: {ts_code} {end_date}, 总资产: {total_assets}"
-                )
-
-        # 检查总负债
-        if (
-            hasattr(financial_data, "total_liab")
-            and financial_data.total_liab is not None
-        ):
-            total_liab = float(financial_data.total_liab)
-            if total_liab < 0:
-                logger.warning(
-                    f"总负债为负数: {ts_code} {end_date}, 总负债: {total_liab}"
-                )
-
-        # 检查资产负债率
-        if (
-            hasattr(financial_data, "total_assets")
-            and financial_data.total_assets is not None
-            and hasattr(financial_data, "total_liab")
-            and financial_data.total_liab is not None
-        ):
-            total_assets = float(financial_data.total_assets)
-            total_liab = float(financial_data.total_liab)
-            if total_assets > 0:
-                debt_ratio = total_liab / total_assets
-                if debt_ratio > 1.0:
-                    logger.warning(
-                        f"资产负债率超过100%: {ts_code} {end_date}, 比率: {debt_ratio:.2%}"
-                    )
-                elif debt_ratio < 0:
-                    logger.warning(
-                        f"资产负债率为负数: {ts_code} {end_date}, 比率: {debt_ratio:.2%}"
-                    )
+        _check_financial_metrics(
+            financial_data.ts_code,
+            financial_data.end_date,
+            getattr(financial_data, "revenue", None),
+            getattr(financial_data, "n_income", None),
+            getattr(financial_data, "total_assets", None),
+            getattr(financial_data, "total_liab", None),
+        )
 
     def clean_data(self, data: dict[str, Any]) -> dict[str, Any]:
         """清洗数据
@@ -341,25 +478,7 @@ class QualityService:
         Returns:
             清洗后的数据
         """
-        cleaned_data = {}
-        for key, value in data.items():
-            # 处理空值
-            if value is None or value == "" or value == "None":
-                cleaned_data[key] = None
-            # 处理字符串
-            elif isinstance(value, str):
-                cleaned_data[key] = value.strip()
-            # 处理数值
-            elif isinstance(value, int | float):
-                # 处理异常值
-                if value == float("inf") or value == float("-inf"):
-                    cleaned_data[key] = None
-                else:
-                    cleaned_data[key] = value
-            else:
-                cleaned_data[key] = value
-
-        return cleaned_data
+        return {key: _clean_value(value) for key, value in data.items()}
 
     def standardize_data(self, data: dict[str, Any], data_type: str) -> dict[str, Any]:
         """标准化数据格式
@@ -373,33 +492,10 @@ class QualityService:
         """
         standardized_data = self.clean_data(data)
 
-        if data_type == "stock_basic":
-            # 标准化股票基础信息
-            if standardized_data.get("list_date"):
-                standardized_data["list_date"] = self._standardize_date(
-                    standardized_data["list_date"]
-                )
-            if standardized_data.get("delist_date"):
-                standardized_data["delist_date"] = self._standardize_date(
-                    standardized_data["delist_date"]
-                )
-
-        elif data_type == "daily_data":
-            # 标准化日线数据
-            if standardized_data.get("trade_date"):
-                standardized_data["trade_date"] = self._standardize_date(
-                    standardized_data["trade_date"]
-                )
-
-        elif data_type == "financial_data":
-            # 标准化财务数据
-            if standardized_data.get("ann_date"):
-                standardized_data["ann_date"] = self._standardize_date(
-                    standardized_data["ann_date"]
-                )
-            if standardized_data.get("end_date"):
-                standardized_data["end_date"] = self._standardize_date(
-                    standardized_data["end_date"]
+        for field in _STANDARDIZE_DATE_FIELDS.get(data_type, ()):
+            if standardized_data.get(field):
+                standardized_data[field] = self._standardize_date(
+                    standardized_data[field]
                 )
 
         return standardized_data
@@ -416,23 +512,19 @@ class QualityService:
         if not date_value:
             return None
 
-        if isinstance(date_value, date):
-            return date_value
+        # 常见的精确类型直接查表,子类再按 isinstance 兜底
+        convert = _DATE_CONVERTERS.get(type(date_value))
+        if convert is not None:
+            return convert(date_value)
 
         if isinstance(date_value, datetime):
             return date_value.date()
 
+        if isinstance(date_value, date):
+            return date_value
+
         if isinstance(date_value, str):
-            try:
-                # 尝试解析YYYYMMDD格式
-                return datetime.strptime(date_value, "%Y%m%d").date()
-            except ValueError:
-                try:
-                    # 尝试解析YYYY-MM-DD格式
-                    return datetime.strptime(date_value, "%Y-%m-%d").date()
-                except ValueError:
-                    logger.warning(f"无法解析日期格式: {date_value}")
-                    return None
+            return _standardize_date_string(date_value)
 
         return None
 
@@ -456,119 +548,44 @@ class QualityService:
             }
 
         total_count = len(data)
-        valid_count = 0
-        errors = []
-        warnings = []
-
-        for i, item in enumerate(data):
-            item_errors = []
-            item_warnings = []
-
-            # 检查必需字段
-            required_fields = ["title", "content"]
-            for field in required_fields:
-                if not item.get(field):
-                    item_errors.append(f"第{i + 1}条新闻缺少必需字段: {field}")
-
-            # 检查标题长度
-            title = item.get("title", "")
-            if title and len(title) > 500:
-                item_errors.append(
-                    f"第{i + 1}条新闻标题过长: {len(title)}字符 > 500字符"
-                )
-            elif title and len(title) < 5:
-                item_warnings.append(
-                    f"第{i + 1}条新闻标题过短: {len(title)}字符 < 5字符"
-                )
-
-            # 检查内容长度
-            content = item.get("content", "")
-            if content and len(content) < 10:
-                item_warnings.append(
-                    f"第{i + 1}条新闻内容过短: {len(content)}字符 < 10字符"
-                )
-
-            # 检查来源长度
-            source = item.get("source")
-            if source and len(source) > 100:
-                item_errors.append(
-                    f"第{i + 1}条新闻来源过长: {len(source)}字符 > 100字符"
-                )
-
-            # 检查发布时间格式
-            publish_time = item.get("publish_time")
-            if publish_time:
-                parsed_time = self._parse_date(str(publish_time))
-                if not parsed_time:
-                    item_errors.append(
-                        f"第{i + 1}条新闻发布时间格式无效: {publish_time}"
-                    )
-                elif parsed_time > datetime.now():
-                    item_warnings.append(
-                        f"第{i + 1}条新闻发布时间为未来时间: {publish_time}"
-                    )
-
-            # 检查URL格式
-            url = item.get("url")
-            if url:
-                if len(url) > 1000:
-                    item_errors.append(
-                        f"第{i + 1}条新闻URL过长: {len(url)}字符 > 1000字符"
-                    )
-                elif not url.startswith(("http://", "https://")):
-                    item_warnings.append(f"第{i + 1}条新闻URL格式可能无效: {url}")
-
-            # 检查分类长度
-            category = item.get("category")
-            if category and len(category) > 50:
-                item_errors.append(
-                    f"第{i + 1}条新闻分类过长: {len(category)}字符 > 50字符"
-                )
-
-            # 检查情感分数范围
-            sentiment_score = item.get("sentiment_score")
-            if sentiment_score is not None:
-                try:
-                    score = float(sentiment_score)
-                    if not -1 <= score <= 1:
-                        item_errors.append(
-                            f"第{i + 1}条新闻情感分数超出范围: {score} (应在-1到1之间)"
-                        )
-                except (ValueError, TypeError):
-                    item_errors.append(
-                        f"第{i + 1}条新闻情感分数格式无效: {sentiment_score}"
-                    )
-
-            # 检查情感标签
-            sentiment_label = item.get("sentiment_label")
-            if sentiment_label:
-                valid_labels = ["positive", "negative", "neutral"]
-                if sentiment_label not in valid_labels:
-                    item_warnings.append(
-                        f"第{i + 1}条新闻情感标签可能无效: {sentiment_label}"
-                    )
-                if len(sentiment_label) > 20:
-                    item_errors.append(
-                        f"第{i + 1}条新闻情感标签过长: {len(sentiment_label)}字符 > 20字符"
-                    )
-
-            # 检查相关股票代码格式
-            related_stocks = item.get("related_stocks")
-            if related_stocks and isinstance(related_stocks, list):
-                for stock_code in related_stocks:
-                    if not self._is_valid_ts_code(stock_code):
-                        item_warnings.append(
-                            f"第{i + 1}条新闻相关股票代码格式可能无效: {stock_code}"
-                        )
-
-            # 统计错误和警告
-            if item_errors:
-                errors.extend(item_errors)
-            else:
-                valid_count += 1
+        # 按 item.get 逐列取值并保留为 object 列: 缺失字段为 None,
+        # 与显式传入的 NaN 可区分,整数列也不会因缺失值被提升为浮点
+        df = pd.DataFrame(
+            {field: [item.get(field) for item in data] for field in _NEWS_FIELDS},
+            dtype=object,
+        )
+        checks = self._check_news_frame(df)
+
+        # 将各项检查的命中掩码合成一张 (记录 x 检查) 矩阵,
+        # 只为存在问题的记录按行拼装提示信息,保持逐条记录、逐项检查的输出顺序
+        hits = np.vstack([mask for _, mask, _ in checks]).T
+        is_error = np.array([check[0] for check in checks], dtype=bool)
+        error_rows = hits[:, is_error].any(axis=1)
+        issue_index = np.flatnonzero(hits.any(axis=1))
+        hit_rows, hit_checks = np.nonzero(hits[issue_index])
+
+        errors: list[str] = []
+        warnings: list[str] = []
+        # 预先绑定每项检查的消息构造函数和目标列表的 extend 方法
+        builders = [build_message for _, _, build_message in checks]
+        extenders = [
+            errors.extend if check_is_error else warnings.extend
+            for check_is_error, _, _ in checks
+        ]
+        # 消息构造函数只返回正文,"第N条新闻"前缀按问题记录各格式化一次
+        last_row = -1
+        prefix = ""
+        for row, check_index in zip(
+            issue_index[hit_rows].tolist(), hit_checks.tolist(), strict=True
+        ):
+            if row != last_row:
+                last_row = row
+                prefix = f"第{row + 1}条新闻"
+            extenders[check_index](
+                [prefix + body for body in builders[check_index](row)]
+            )
 
-            if item_warnings:
-                warnings.extend(item_warnings)
+        valid_count = total_count - int(error_rows.sum())
 
         return {
             "is_valid": len(errors) == 0,
@@ -580,21 +597,261 @@ class QualityService:
             "quality_score": valid_count / total_count if total_count > 0 else 0,
         }
 
-    def _parse_date(self, date_str: str) -> datetime | None:
-        """解析日期字符串"""
-        if not date_str:
-            return None
+    def _check_news_frame(
+        self, df: pd.DataFrame
+    ) -> list[tuple[bool, np.ndarray, Callable[[int], list[str]]]]:
+        """对新闻数据逐列执行向量化检查
 
-        try:
-            # 尝试多种日期格式
-            for fmt in ["%Y%m%d", "%Y-%m-%d", "%Y/%m/%d"]:
-                try:
-                    return datetime.strptime(date_str, fmt)
-                except ValueError:
-                    continue
-            return None
-        except Exception:
-            return None
+        Args:
+            df: 新闻数据DataFrame
+
+        Returns:
+            按原检查顺序排列的 (是否为错误, 命中掩码, 消息正文构造函数) 列表
+        """
+        n = len(df)
+
+        def text(series: pd.Series) -> pd.Series:
+            # 仅保留字符串值,其余置空,保证 .str 访问器可用
+            return series.where(series.map(lambda v: isinstance(v, str))).astype(object)
+
+        def present(series: pd.Series) -> np.ndarray:
+            return (series.notna() & series.astype(bool)).to_numpy()
+
+        def text_len(series: pd.Series) -> np.ndarray:
+            return text(series).str.len().fillna(0).to_numpy()
+
+        title = df["title"]
+        content = df["content"]
+        source = df["source"]
+        publish_time = df["publish_time"]
+        url = df["url"]
+        category = df["category"]
+        sentiment_score = df["sentiment_score"]
+        sentiment_label = df["sentiment_label"]
+        related_stocks = df["related_stocks"]
+
+        title_len = text_len(title)
+        content_len = text_len(content)
+        source_len = text_len(source)
+        url_len = text_len(url)
+        category_len = text_len(category)
+        label_len = text_len(sentiment_label)
+
+        # 发布时间: 与原逐条校验一致,按原始值真值判断是否存在 (NaN 视为存在),
+        # 再依次按 YYYYMMDD、YYYY-MM-DD、YYYY/MM/DD 三种格式解析字符串形式
+        time_present = publish_time.map(bool).to_numpy(dtype=bool)
+        time_str = publish_time.astype(str)
+        parsed_time = pd.to_datetime(time_str, format="%Y%m%d", errors="coerce")
+        for fmt in ("%Y-%m-%d", "%Y/%m/%d"):
+            parsed_time = parsed_time.fillna(
+                pd.to_datetime(time_str, format=fmt, errors="coerce")
+            )
+        time_invalid = time_present & parsed_time.isna().to_numpy()
+        time_future = time_present & (parsed_time > pd.Timestamp.now()).to_numpy()
+
+        url_present = present(url)
+        url_http = (
+            text(url)
+            .str.startswith(("http://", "https://"))
+            .fillna(False)
+            .to_numpy(dtype=bool)
+        )
+
+        # 情感分数: 原始值不为 None 即视为存在,按 float() 解析;
+        # 无法解析的记为格式无效,解析结果 (含 NaN) 不在 [-1, 1] 内的记为超出范围
+        score_raw = sentiment_score.to_numpy(dtype=object)
+        score_present = np.fromiter(
+            (v is not None for v in score_raw), dtype=bool, count=n
+        )
+        score_value = np.full(n, np.nan)
+        score_invalid = np.zeros(n, dtype=bool)
+        for i in np.flatnonzero(score_present).tolist():
+            try:
+                score_value[i] = float(score_raw[i])
+            except (ValueError, TypeError):
+                score_invalid[i] = True
+        with np.errstate(invalid="ignore"):
+            score_in_range = (score_value >= -1) & (score_value <= 1)
+        score_out_of_range = score_present & ~score_invalid & ~score_in_range
+
+        label_present = present(sentiment_label)
+        label_unknown = (
+            label_present & ~sentiment_label.isin(_SENTIMENT_LABELS).to_numpy()
+        )
+
+        # 相关股票代码: 展开为一列后统一用正则匹配
+        stock_lists = related_stocks.where(
+            related_stocks.map(lambda v: isinstance(v, list))
+        )
+        stock_counts = stock_lists.str.len().fillna(0).to_numpy(dtype=np.int64)
+        has_stocks = stock_counts > 0
+        stocks = pd.Series(
+            list(chain.from_iterable(stock_lists[has_stocks])),
+            index=np.repeat(df.index[has_stocks], stock_counts[has_stocks]),
+            dtype=object,
+        )
+        code_valid = text(stocks).str.match(_TS_CODE_RE).fillna(False).astype(bool)
+        bad_stocks = stocks[~code_valid]
+        bad_codes: dict[Any, list[Any]] = {}
+        for label, stock_code in zip(
+            bad_stocks.index, bad_stocks.to_numpy(), strict=True
+        ):
+            bad_codes.setdefault(label, []).append(stock_code)
+        bad_stock_rows = np.zeros(n, dtype=bool)
+        bad_stock_rows[df.index.get_indexer(list(bad_codes))] = True
+
+        def one(message: str) -> list[str]:
+            return [message]
+
+        return [
+            (
+                True,
+                ~present(title),
+                lambda i: one("缺少必需字段: title"),
+            ),
+            (
+                True,
+                ~present(content),
+                lambda i: one("缺少必需字段: content"),
+            ),
+            (
+                True,
+                title_len > 500,
+                lambda i: one(f"标题过长: {int(title_len[i])}字符 > 500字符"),
+            ),
+            (
+                False,
+                (title_len > 0) & (title_len < 5),
+                lambda i: one(f"标题过短: {int(title_len[i])}字符 < 5字符"),
+            ),
+            (
+                False,
+                (content_len > 0) & (content_len < 10),
+                lambda i: one(f"内容过短: {int(content_len[i])}字符 < 10字符"),
+            ),
+            (
+                True,
+                source_len > 100,
+                lambda i: one(f"来源过长: {int(source_len[i])}字符 > 100字符"),
+            ),
+            (
+                True,
+                time_invalid,
+                lambda i: one(f"发布时间格式无效: {publish_time.iat[i]}"),
+            ),
+            (
+                False,
+                time_future,
+                lambda i: one(f"发布时间为未来时间: {publish_time.iat[i]}"),
+            ),
+            (
+                True,
+                url_len > 1000,
+                lambda i: one(f"URL过长: {int(url_len[i])}字符 > 1000字符"),
+            ),
+            (
+                False,
+                url_present & (url_len <= 1000) & ~url_http,
+                lambda i: one(f"URL格式可能无效: {url.iat[i]}"),
+            ),
+            (
+                True,
+                category_len > 50,
+                lambda i: one(f"分类过长: {int(category_len[i])}字符 > 50字符"),
+            ),
+            (
+                True,
+                score_out_of_range,
+                lambda i: one(
+                    f"情感分数超出范围: {float(score_value[i])} (应在-1到1之间)"
+                ),
+            ),
+            (
+                True,
+                score_invalid,
+                lambda i: one(f"情感分数格式无效: {sentiment_score.iat[i]}"),
+            ),
+            (
+                False,
+                label_unknown,
+                lambda i: one(f"情感标签可能无效: {sentiment_label.iat[i]}"),
+            ),
+            (
+                True,
+                label_len > 20,
+                lambda i: one(f"情感标签过长: {int(label_len[i])}字符 > 20字符"),
+            ),
+            (
+                False,
+                bad_stock_rows,
+                lambda i: [
+                    f"相关股票代码格式可能无效: {stock_code}"
+                    for stock_code in bad_codes[df.index[i]]
+                ],
+            ),
+        ]
+
+    def _batch_validators(self) -> dict[str, Callable[..., bool]]:
+        """支持批量验证的数据类型及对应的逐条验证函数"""
+        return {
+            "stock_basic": self.validate_stock_basic_info,
+            "daily_data": self.validate_daily_data,
+            "financial_data": self.validate_financial_data,
+        }
+
+    def validate_batch(
+        self, data_list: list[Any], data_type: str, max_errors: int | None = None
+    ) -> dict[str, Any]:
+        """批量验证股票基础信息、日线或财务数据
+
+        先对整批股票代码做一次正则预检,代码格式有效的记录在逐条验证时
+        跳过代码检查;其余记录仍走完整验证,以保持原有的错误信息。
+
+        Args:
+            data_list: 数据列表
+            data_type: 数据类型 (stock_basic, daily_data, financial_data)
+            max_errors: 最多收集的错误信息条数,None表示全部收集
+
+        Returns:
+            验证结果,包含总数、有效数、无效数和按顺序排列的错误信息
+
+        Raises:
+            ValidationError: 数据类型不支持时
+        """
+        validator = self._batch_validators().get(data_type)
+        if validator is None:
+            raise ValidationError(f"不支持的数据类型: {data_type}")
+        if data_type in _DATE_CHECKED_TYPES:
+            # 整批只读取一次当前日期
+            validator = partial(validator, today=date.today())
+
+        # 非字符串代码 (如整数、None) 视为格式未通过,交由逐条验证给出原有错误
+        match_code = _TS_CODE_RE.match
+        code_valid = [
+            isinstance(ts_code, str) and match_code(ts_code) is not None
+            for ts_code in (getattr(data, "ts_code", None) for data in data_list)
+        ]
+
+        valid_count = 0
+        invalid_count = 0
+        errors: list[str] = []
+        add_error = errors.append
+        for data, ts_code_ok in zip(data_list, code_valid, strict=True):
+            try:
+                validator(data, check_ts_code=not ts_code_ok)
+                valid_count += 1
+            except ValidationError as e:
+                invalid_count += 1
+                # 达到上限后只计数,不再保留错误信息
+                if max_errors is None or len(errors) < max_errors:
+                    add_error(str(e))
+
+        return {
+            "total_count": len(data_list),
+            "valid_count": valid_count,
+            "invalid_count": invalid_count,
+            "errors": errors,
+        }
 
     def get_data_quality_report(
         self, data_list: list[dict[str, Any]], data_type: str
@@ -629,22 +886,18 @@ class QualityService:
             }
 
         total_count = len(data_list)
-        valid_count = 0
-        invalid_count = 0
-        error_details = []
-
-        for data in data_list:
-            try:
-                if data_type == "stock_basic":
-                    self.validate_stock_basic_info(data)
-                elif data_type == "daily_data":
-                    self.validate_daily_data(data)
-                elif data_type == "financial_data":
-                    self.validate_financial_data(data)
-                valid_count += 1
-            except ValidationError as e:
-                invalid_count += 1
-                error_details.append(str(e))
+        if data_type in self._batch_validators():
+            batch_result = self.validate_batch(
+                data_list, data_type, max_errors=_REPORT_MAX_ERRORS
+            )
+            valid_count = batch_result["valid_count"]
+            invalid_count = batch_result["invalid_count"]
+            error_details = batch_result["errors"]
+        else:
+            # 未知类型不做逐条校验
+            valid_count = total_count
+            invalid_count = 0
+            error_details = []
 
         quality_rate = valid_count / total_count if total_count > 0 else 0.0
 
@@ -653,5 +906,5 @@ class QualityService:
             "valid_count": valid_count,
             "invalid_count": invalid_count,
             "quality_rate": quality_rate,
-            "error_details": error_details[:10],  # 只返回前10个错误详情
+            "error_details": error_details,  # 只返回前10个错误详情
         }
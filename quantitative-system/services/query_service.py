@@ -8,15 +8,20 @@
 - 查询优化
 """
 
+import base64
 import hashlib
-import json
+from dataclasses import dataclass
 from datetime import datetime
+from functools import cache, cached_property, lru_cache
+from operator import attrgetter
 from typing import Any
 
-from pydantic import BaseModel, Field, validator
-from sqlalchemy import and_, desc, func
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, validator
+from sqlalchemy import DateTime, and_, asc, case, desc, func, select, tuple_
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import defer, with_expression
 from sqlalchemy.sql import Select
 
 from models.database import NewsData, SentimentAnalysis, StockBasicInfo, StockDailyData
@@ -27,12 +32,265 @@ from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 总数达到该值才缓存计数结果，小结果集直接统计的代价很低
+COUNT_CACHE_MIN_TOTAL = 1000
+
+# 新闻列表返回的正文摘要长度
+NEWS_PREVIEW_LENGTH = 500
+
+# 缓存键摘要字节数，64 位摘要在查询缓存的键空间内碰撞概率可忽略
+CACHE_KEY_DIGEST_SIZE = 8
+
+
+def _hash_cache_key(query_type: str, params: dict[str, Any]) -> str:
+    """将查询参数序列化并哈希为缓存键"""
+    payload = orjson.dumps(params, default=str, option=orjson.OPT_SORT_KEYS)
+    params_hash = hashlib.blake2b(
+        payload, digest_size=CACHE_KEY_DIGEST_SIZE
+    ).hexdigest()
+    return f"query:{query_type}:{params_hash}"
+
+
+def _filters_payload(filters: "FilterParams | None") -> dict[str, Any]:
+    """过滤条件参与缓存键的部分，未设置任何条件时与不传等价"""
+    return filters.dict() if filters and not filters.is_empty else {}
+
+
+@lru_cache(maxsize=1024)
+def _query_cache_key(query_type: str, filters: "FilterParams | None") -> str:
+    """按过滤条件生成统计类查询的缓存键
+
+    参数模型均为不可变对象，可直接作为缓存的键，
+    相同参数的连续请求无需再次遍历模型和序列化。
+    """
+    return _hash_cache_key(query_type, {"filters": _filters_payload(filters)})
+
+
+@lru_cache(maxsize=1024)
+def _page_cache_keys(
+    query_type: str,
+    filters: "FilterParams | None",
+    pagination: "PaginationParams",
+    sort_params: "SortParams | None",
+) -> tuple[str, str]:
+    """生成分页结果缓存键和总数缓存键，过滤条件只遍历一次
+
+    总数缓存键只按过滤条件生成，不同页共用同一个总数。
+
+    Returns:
+        (分页结果缓存键, 总数缓存键)
+    """
+    filters_payload = _filters_payload(filters)
+    page_key = _hash_cache_key(
+        query_type,
+        {
+            "filters": filters_payload,
+            "pagination": pagination.dict(),
+            "sort": sort_params.dict() if sort_params else {},
+        },
+    )
+    count_key = _hash_cache_key(f"{query_type}_count", {"filters": filters_payload})
+    return page_key, count_key
+
+
+# 查询结果行转换：每行通过一次 attrgetter 调用取出全部字段
+_STOCK_FIELDS = attrgetter(
+    "code", "name", "industry", "market", "list_date", "created_at", "updated_at"
+)
+_DAILY_FIELDS = attrgetter(
+    "stock_code",
+    "stock",
+    "trade_date",
+    "open_price",
+    "high_price",
+    "low_price",
+    "close_price",
+    "volume",
+    "amount",
+    "turnover_rate",
+    "pe_ratio",
+    "pb_ratio",
+    "created_at",
+    "updated_at",
+)
+_NEWS_FIELDS = attrgetter(
+    "id",
+    "title",
+    "content_preview",
+    "source",
+    "url",
+    "publish_time",
+    "related_stocks",
+    "sentiment_analysis",
+    "created_at",
+    "updated_at",
+)
+
+
+def _stock_row(stock: StockBasicInfo) -> dict[str, Any]:
+    """将股票基础信息转换为字典"""
+    code, name, industry, market, list_date, created_at, updated_at = _STOCK_FIELDS(
+        stock
+    )
+    return {
+        "code": code,
+        "name": name,
+        "industry": industry,
+        "market": market,
+        "list_date": list_date.isoformat() if list_date else None,
+        "created_at": created_at.isoformat(),
+        "updated_at": updated_at.isoformat(),
+    }
+
+
+def _daily_row(daily: StockDailyData) -> dict[str, Any]:
+    """将股票日线数据转换为字典"""
+    (
+        stock_code,
+        stock,
+        trade_date,
+        open_price,
+        high_price,
+        low_price,
+        close_price,
+        volume,
+        amount,
+        turnover_rate,
+        pe_ratio,
+        pb_ratio,
+        created_at,
+        updated_at,
+    ) = _DAILY_FIELDS(daily)
+    return {
+        "stock_code": stock_code,
+        "stock_name": stock.name if stock else None,
+        "trade_date": trade_date.isoformat(),
+        "open_price": float(open_price),
+        "high_price": float(high_price),
+        "low_price": float(low_price),
+        "close_price": float(close_price),
+        "volume": volume,
+        "amount": float(amount),
+        "turnover_rate": float(turnover_rate) if turnover_rate else None,
+        "pe_ratio": float(pe_ratio) if pe_ratio else None,
+        "pb_ratio": float(pb_ratio) if pb_ratio else None,
+        "created_at": created_at.isoformat(),
+        "updated_at": updated_at.isoformat(),
+    }
+
+
+def _news_row(news: NewsData) -> dict[str, Any]:
+    """将新闻数据转换为字典，正文截断为500字
+
+    正文取自查询时加载的 content_preview，最多 NEWS_PREVIEW_LENGTH+1 字，
+    多出的一字用于判断是否需要追加省略号。
+    """
+    (
+        news_id,
+        title,
+        content,
+        source,
+        url,
+        publish_time,
+        related_stocks,
+        sentiment_analysis,
+        created_at,
+        updated_at,
+    ) = _NEWS_FIELDS(news)
+    sentiment = sentiment_analysis[0] if sentiment_analysis else None
+    return {
+        "id": news_id,
+        "title": title,
+        "content": (
+            content[:NEWS_PREVIEW_LENGTH] + "..."
+            if len(content) > NEWS_PREVIEW_LENGTH
+            else content
+        ),
+        "source": source,
+        "url": url,
+        "published_at": publish_time.isoformat() if publish_time else None,
+        "stock_codes": related_stocks,
+        "sentiment_score": float(sentiment.sentiment_score) if sentiment else None,
+        "sentiment_type": sentiment.sentiment_type.value if sentiment else None,
+        "created_at": created_at.isoformat(),
+        "updated_at": updated_at.isoformat(),
+    }
+
+
+@dataclass(frozen=True)
+class _PageCache:
+    """分页查询的缓存读取结果"""
+
+    page_key: str
+    count_key: str
+    page_payload: bytes | None
+    cached_total: int | None
+
+
+@dataclass(frozen=True)
+class _FilterColumns:
+    """模型上用于各类过滤条件的列，不存在时为None"""
+
+    code: Any
+    date: Any
+    sentiment_type: Any
+    keyword: Any
+
+
+def _first_column(model_class, names: tuple[str, ...]) -> Any:
+    """按顺序返回模型上第一个存在的列"""
+    for name in names:
+        if hasattr(model_class, name):
+            return getattr(model_class, name)
+    return None
+
+
+@cache
+def _filter_columns(model_class) -> _FilterColumns:
+    """解析模型的过滤列，每个模型只解析一次
+
+    语句编译已由 SQLAlchemy 按语句结构缓存，过滤值以绑定参数传入，
+    这里只省去每次请求重复的 hasattr 探测。
+    """
+    return _FilterColumns(
+        code=_first_column(model_class, ("stock_code", "code")),
+        date=_first_column(model_class, ("trade_date", "publish_time", "created_at")),
+        sentiment_type=_first_column(model_class, ("sentiment_type",)),
+        keyword=_first_column(model_class, ("title", "content", "name")),
+    )
+
+
+@dataclass(frozen=True)
+class _SortColumns:
+    """模型的排序列，default 为未指定排序时使用的列"""
+
+    default: Any
+    by_name: dict[str, Any]
+
+
+@cache
+def _sort_columns(model_class) -> _SortColumns:
+    """解析模型可排序的映射列，每个模型只解析一次"""
+    by_name = {
+        attr.key: getattr(model_class, attr.key)
+        for attr in sa_inspect(model_class).column_attrs
+    }
+    return _SortColumns(
+        default=_first_column(model_class, ("created_at", "trade_date")),
+        by_name=by_name,
+    )
+
 
 class PaginationParams(BaseModel):
     """分页参数模型"""
 
+    model_config = ConfigDict(frozen=True)
+
     page: int = Field(default=1, ge=1, description="页码，从1开始")
     page_size: int = Field(default=20, ge=1, le=100, description="每页数量，最大100")
+    cursor: str | None = Field(
+        default=None, description="键集分页游标，传入时从游标位置继续翻页"
+    )
 
     @property
     def offset(self) -> int:
@@ -45,44 +303,51 @@ class PaginationParams(BaseModel):
         return self.page_size
 
 
+# 允许排序的字段
+_ALLOWED_SORT_FIELDS: frozenset[str] = frozenset(
+    {
+        "created_at",
+        "updated_at",
+        "trade_date",
+        "close_price",
+        "volume",
+        "market_cap",
+        "sentiment_score",
+        "publish_time",
+        # 股票相关字段
+        "ts_code",
+        "symbol",
+        "name",
+        "industry",
+        "market",
+        "list_date",
+        "list_status",
+        # 股票价格相关字段
+        "open",
+        "high",
+        "low",
+        "close",
+        "pre_close",
+        "change",
+        "pct_chg",
+        "vol",
+        "amount",
+    }
+)
+
+
 class SortParams(BaseModel):
     """排序参数模型"""
 
+    model_config = ConfigDict(frozen=True)
+
     field: str = Field(description="排序字段")
     order: str = Field(default="desc", pattern="^(asc|desc)$", description="排序方向")
 
     @validator("field")
     def validate_field(cls, v):  # noqa: N805
         """验证排序字段"""
-        allowed_fields = {
-            "created_at",
-            "updated_at",
-            "trade_date",
-            "close_price",
-            "volume",
-            "market_cap",
-            "sentiment_score",
-            "published_at",
-            # 股票相关字段
-            "ts_code",
-            "symbol",
-            "name",
-            "industry",
-            "market",
-            "list_date",
-            "list_status",
-            # 股票价格相关字段
-            "open",
-            "high",
-            "low",
-            "close",
-            "pre_close",
-            "change",
-            "pct_chg",
-            "vol",
-            "amount",
-        }
-        if v not in allowed_fields:
+        if v not in _ALLOWED_SORT_FIELDS:
             raise ValueError(f"不支持的排序字段: {v}")
         return v
 
@@ -90,12 +355,27 @@ class SortParams(BaseModel):
 class FilterParams(BaseModel):
     """过滤参数模型"""
 
+    model_config = ConfigDict(frozen=True)
+
     stock_code: str | None = Field(None, description="股票代码")
     start_date: datetime | None = Field(None, description="开始日期")
     end_date: datetime | None = Field(None, description="结束日期")
     sentiment_type: SentimentType | None = Field(None, description="情感类型")
     keywords: str | None = Field(None, description="关键词搜索")
 
+    @cached_property
+    def is_empty(self) -> bool:
+        """是否未设置任何过滤条件"""
+        return not any(
+            (
+                self.stock_code,
+                self.start_date,
+                self.end_date,
+                self.sentiment_type,
+                self.keywords,
+            )
+        )
+
     @validator("end_date")
     def validate_date_range(cls, v, values):  # noqa: N805
         """验证日期范围"""
@@ -109,20 +389,26 @@ class FilterParams(BaseModel):
         return v
 
 
-class QueryResult(BaseModel):
-    """查询结果模型"""
+@dataclass(slots=True)
+class QueryResult:
+    """查询结果，只在接口边界由响应模型做一次校验"""
 
-    data: list[dict[str, Any]] = Field(description="查询数据")
-    total: int = Field(description="总记录数")
-    page: int = Field(description="当前页码")
-    page_size: int = Field(description="每页数量")
-    total_pages: int = Field(description="总页数")
-    has_next: bool = Field(description="是否有下一页")
-    has_prev: bool = Field(description="是否有上一页")
+    data: list[dict[str, Any]]  # 查询数据
+    total: int | None  # 总记录数，游标分页时为None
+    page: int  # 当前页码
+    page_size: int  # 每页数量
+    total_pages: int | None  # 总页数，游标分页时为None
+    has_next: bool  # 是否有下一页
+    has_prev: bool  # 是否有上一页
+    next_cursor: str | None = None  # 下一页游标
 
     @classmethod
     def create(
-        cls, data: list[dict[str, Any]], total: int, pagination: PaginationParams
+        cls,
+        data: list[dict[str, Any]],
+        total: int,
+        pagination: PaginationParams,
+        next_cursor: str | None = None,
     ) -> "QueryResult":
         """创建查询结果"""
         total_pages = (total + pagination.page_size - 1) // pagination.page_size
@@ -135,6 +421,26 @@ class QueryResult(BaseModel):
             total_pages=total_pages,
             has_next=pagination.page < total_pages,
             has_prev=pagination.page > 1,
+            next_cursor=next_cursor,
+        )
+
+    @classmethod
+    def create_keyset(
+        cls,
+        data: list[dict[str, Any]],
+        pagination: PaginationParams,
+        next_cursor: str | None,
+    ) -> "QueryResult":
+        """创建游标分页的查询结果，不统计总数"""
+        return cls(
+            data=data,
+            total=None,
+            page=pagination.page,
+            page_size=pagination.page_size,
+            total_pages=None,
+            has_next=next_cursor is not None,
+            has_prev=True,
+            next_cursor=next_cursor,
         )
 
 
@@ -153,21 +459,6 @@ class QueryService:
         self.cache_repo = cache_repo or CacheRepo()
         self.cache_ttl = 300  # 默认缓存5分钟
 
-    def _generate_cache_key(self, query_type: str, params: dict[str, Any]) -> str:
-        """生成缓存键
-
-        Args:
-            query_type: 查询类型
-            params: 查询参数
-
-        Returns:
-            缓存键
-        """
-        # 将参数序列化并生成哈希
-        params_str = json.dumps(params, sort_keys=True, default=str)
-        params_hash = hashlib.sha256(params_str.encode()).hexdigest()[:8]
-        return f"query:{query_type}:{params_hash}"
-
     def _apply_filters(
         self, query: Select, filters: FilterParams, model_class
     ) -> Select:
@@ -181,42 +472,27 @@ class QueryService:
         Returns:
             应用过滤条件后的查询对象
         """
+        columns = _filter_columns(model_class)
         conditions = []
 
         # 股票代码过滤
-        if filters.stock_code:
-            if hasattr(model_class, "stock_code"):
-                conditions.append(model_class.stock_code == filters.stock_code)
-            elif hasattr(model_class, "code"):
-                conditions.append(model_class.code == filters.stock_code)
+        if filters.stock_code and columns.code is not None:
+            conditions.append(columns.code == filters.stock_code)
 
         # 日期范围过滤
-        date_field = None
-        if hasattr(model_class, "trade_date"):
-            date_field = model_class.trade_date
-        elif hasattr(model_class, "published_at"):
-            date_field = model_class.published_at
-        elif hasattr(model_class, "created_at"):
-            date_field = model_class.created_at
-
-        if date_field is not None:
+        if columns.date is not None:
             if filters.start_date:
-                conditions.append(date_field >= filters.start_date)
+                conditions.append(columns.date >= filters.start_date)
             if filters.end_date:
-                conditions.append(date_field <= filters.end_date)
+                conditions.append(columns.date <= filters.end_date)
 
         # 情感类型过滤
-        if filters.sentiment_type and hasattr(model_class, "sentiment_type"):
-            conditions.append(model_class.sentiment_type == filters.sentiment_type)
+        if filters.sentiment_type and columns.sentiment_type is not None:
+            conditions.append(columns.sentiment_type == filters.sentiment_type)
 
         # 关键词搜索
-        if filters.keywords:
-            if hasattr(model_class, "title"):
-                conditions.append(model_class.title.contains(filters.keywords))
-            elif hasattr(model_class, "content"):
-                conditions.append(model_class.content.contains(filters.keywords))
-            elif hasattr(model_class, "name"):
-                conditions.append(model_class.name.contains(filters.keywords))
+        if filters.keywords and columns.keyword is not None:
+            conditions.append(columns.keyword.contains(filters.keywords))
 
         # 应用所有条件
         if conditions:
@@ -237,16 +513,15 @@ class QueryService:
         Returns:
             应用排序后的查询对象
         """
+        columns = _sort_columns(model_class)
         if not sort_params:
             # 默认排序
-            if hasattr(model_class, "created_at"):
-                return query.order_by(desc(model_class.created_at))
-            elif hasattr(model_class, "trade_date"):
-                return query.order_by(desc(model_class.trade_date))
+            if columns.default is not None:
+                return query.order_by(desc(columns.default))
             return query
 
         # 获取排序字段
-        sort_field = getattr(model_class, sort_params.field, None)
+        sort_field = columns.by_name.get(sort_params.field)
         if sort_field is None:
             logger.warning(
                 f"模型 {model_class.__name__} 不存在字段 {sort_params.field}"
@@ -259,6 +534,213 @@ class QueryService:
         else:
             return query.order_by(desc(sort_field))
 
+    def _encode_cursor(self, sort_value: Any, pk: int) -> str:
+        """将最后一条记录的排序值和主键编码为游标
+
+        Args:
+            sort_value: 排序字段值
+            pk: 主键
+
+        Returns:
+            URL安全的游标字符串
+        """
+        return base64.urlsafe_b64encode(orjson.dumps([sort_value, pk])).decode()
+
+    def _decode_cursor(self, cursor: str, sort_column) -> tuple[Any, int]:
+        """解析游标
+
+        Args:
+            cursor: 游标字符串
+            sort_column: 排序字段列
+
+        Returns:
+            (排序字段值, 主键)
+
+        Raises:
+            ValidationError: 游标格式无效时
+        """
+        try:
+            sort_value, pk = orjson.loads(base64.urlsafe_b64decode(cursor))
+            # 兼容 TypeDecorator 包装的日期时间类型
+            column_type = getattr(sort_column.type, "impl", sort_column.type)
+            if isinstance(column_type, DateTime) and sort_value is not None:
+                sort_value = datetime.fromisoformat(sort_value)
+        except (ValueError, TypeError) as e:
+            raise ValidationError(f"无效的分页游标: {cursor}") from e
+        return sort_value, pk
+
+    def _apply_keyset(
+        self, query: Select, sort_column, pk_column, order: str, cursor: str
+    ) -> Select:
+        """应用键集分页条件，从游标位置之后按 (排序字段, 主键) 继续取数
+
+        Args:
+            query: SQLAlchemy查询对象
+            sort_column: 排序字段列
+            pk_column: 主键列
+            order: 排序方向
+            cursor: 游标字符串
+
+        Returns:
+            应用游标条件和排序后的查询对象
+        """
+        sort_value, pk = self._decode_cursor(cursor, sort_column)
+        position = tuple_(sort_column, pk_column)
+        if order == "asc":
+            return query.where(position > tuple_(sort_value, pk)).order_by(
+                asc(sort_column), asc(pk_column)
+            )
+        return query.where(position < tuple_(sort_value, pk)).order_by(
+            desc(sort_column), desc(pk_column)
+        )
+
+    def _read_page_cache(
+        self,
+        query_type: str,
+        filters: FilterParams | None,
+        pagination: PaginationParams,
+        sort_params: SortParams | None,
+    ) -> _PageCache:
+        """一次 MGET 同时读取分页结果缓存和总数缓存
+
+        Args:
+            query_type: 查询类型
+            filters: 过滤参数
+            pagination: 分页参数
+            sort_params: 排序参数
+
+        Returns:
+            分页缓存读取结果
+        """
+        page_key, count_key = _page_cache_keys(
+            query_type, filters, pagination, sort_params
+        )
+        page_payload, count_payload = self.cache_repo.mget_bytes(
+            CacheType.QUERY_RESULT, [page_key, count_key]
+        )
+        cached_total = int(count_payload) if count_payload is not None else None
+        return _PageCache(page_key, count_key, page_payload, cached_total)
+
+    def _write_page_cache(
+        self, page_cache: _PageCache, query_result: QueryResult
+    ) -> None:
+        """一次 pipeline 写入分页结果缓存，较大且未缓存的总数一并写入
+
+        Args:
+            page_cache: 读取阶段得到的分页缓存
+            query_result: 查询结果
+        """
+        mapping = {page_cache.page_key: orjson.dumps(query_result)}
+        total = query_result.total
+        if (
+            page_cache.cached_total is None
+            and total is not None
+            and total >= COUNT_CACHE_MIN_TOTAL
+        ):
+            mapping[page_cache.count_key] = str(total).encode()
+
+        self.cache_repo.mset_bytes(CacheType.QUERY_RESULT, mapping, ttl=self.cache_ttl)
+        logger.debug(f"缓存查询结果: {page_cache.page_key}")
+
+    async def _count_total(
+        self, session: AsyncSession, query: Select, cached_total: int | None
+    ) -> int:
+        """统计过滤后的总记录数，已有缓存的总数时直接返回
+
+        Args:
+            session: 数据库会话
+            query: 已应用过滤条件的查询对象
+            cached_total: 缓存的总数，None表示未命中
+
+        Returns:
+            总记录数
+        """
+        if cached_total is not None:
+            logger.debug("从缓存获取查询总数")
+            return cached_total
+
+        # 基于过滤后的语句做子查询计数，不带排序和预加载选项
+        total_query = select(func.count()).select_from(query.subquery())
+        total_result = await session.execute(total_query)
+        return total_result.scalar()
+
+    async def _fetch_page(
+        self,
+        session: AsyncSession,
+        query: Select,
+        model_class,
+        pagination: PaginationParams,
+        sort_params: SortParams | None,
+        keyset_field: str,
+        cached_total: int | None = None,
+    ) -> tuple[list[Any], int | None, str | None]:
+        """执行分页查询
+
+        传入游标时按键集分页，取 page_size+1 条判断是否有下一页且不统计总数；
+        否则统计总数后按偏移量分页。按 keyset_field 排序时同时返回下一页游标。
+
+        Args:
+            session: 数据库会话
+            query: 已应用过滤条件的查询对象
+            model_class: 模型类
+            pagination: 分页参数
+            sort_params: 排序参数
+            keyset_field: 支持键集分页的排序字段
+            cached_total: 缓存的总数，None表示未命中
+
+        Returns:
+            (当前页记录, 总记录数, 下一页游标)，游标分页时总记录数为None
+
+        Raises:
+            ValidationError: 游标分页使用了不支持的排序字段时
+        """
+        pk_column = model_class.id
+        keyset_order = (
+            sort_params.order
+            if sort_params and sort_params.field == keyset_field
+            else None
+        )
+
+        if pagination.cursor:
+            if keyset_order is None:
+                raise ValidationError(f"游标分页仅支持按 {keyset_field} 排序")
+            query = self._apply_keyset(
+                query,
+                getattr(model_class, keyset_field),
+                pk_column,
+                keyset_order,
+                pagination.cursor,
+            )
+            query = query.limit(pagination.limit + 1)
+            result = await session.execute(query)
+            rows = result.scalars().all()
+            total = None
+            has_next = len(rows) > pagination.limit
+            rows = rows[: pagination.limit]
+        else:
+            # 获取总数
+            total = await self._count_total(session, query, cached_total)
+
+            # 应用排序，按游标字段排序时以主键兜底，保证游标位置唯一
+            query = self._apply_sorting(query, sort_params, model_class)
+            if keyset_order is not None:
+                query = query.order_by(
+                    asc(pk_column) if keyset_order == "asc" else desc(pk_column)
+                )
+
+            # 应用分页
+            query = query.offset(pagination.offset).limit(pagination.limit)
+            result = await session.execute(query)
+            rows = result.scalars().all()
+            has_next = pagination.offset + len(rows) < total
+
+        next_cursor = None
+        if keyset_order is not None and rows and has_next:
+            last = rows[-1]
+            next_cursor = self._encode_cursor(getattr(last, keyset_field), last.id)
+
+        return rows, total, next_cursor
+
     async def query_stocks(
         self,
         session: AsyncSession,
@@ -279,34 +761,28 @@ class QueryService:
         Returns:
             查询结果
         """
-        # 生成缓存键
-        cache_key = None
+        # 尝试从缓存获取，分页结果和总数一次读取
+        page_cache = None
         if use_cache:
-            params = {
-                "pagination": pagination.dict(),
-                "filters": filters.dict() if filters else {},
-                "sort": sort_params.dict() if sort_params else {},
-            }
-            cache_key = self._generate_cache_key("stocks", params)
-
-            # 尝试从缓存获取
-            cached_result = await self.cache_repo.get(CacheType.QUERY_RESULT, cache_key)
-            if cached_result:
-                logger.debug(f"从缓存获取股票查询结果: {cache_key}")
-                return QueryResult(**cached_result)
+            page_cache = self._read_page_cache(
+                "stocks", filters, pagination, sort_params
+            )
+            if page_cache.page_payload:
+                logger.debug(f"从缓存获取股票查询结果: {page_cache.page_key}")
+                return QueryResult(**orjson.loads(page_cache.page_payload))
 
         try:
             # 构建基础查询
-            query = session.query(StockBasicInfo)
+            query = select(StockBasicInfo)
 
             # 应用过滤条件
-            if filters:
+            if filters and not filters.is_empty:
                 query = self._apply_filters(query, filters, StockBasicInfo)
 
             # 获取总数
-            total_query = query.statement.with_only_columns(func.count())
-            total_result = await session.execute(total_query)
-            total = total_result.scalar()
+            total = await self._count_total(
+                session, query, page_cache.cached_total if page_cache else None
+            )
 
             # 应用排序
             query = self._apply_sorting(query, sort_params, StockBasicInfo)
@@ -319,33 +795,14 @@ class QueryService:
             stocks = result.scalars().all()
 
             # 转换为字典格式
-            data = [
-                {
-                    "code": stock.code,
-                    "name": stock.name,
-                    "industry": stock.industry,
-                    "market": stock.market,
-                    "list_date": stock.list_date.isoformat()
-                    if stock.list_date
-                    else None,
-                    "created_at": stock.created_at.isoformat(),
-                    "updated_at": stock.updated_at.isoformat(),
-                }
-                for stock in stocks
-            ]
+            data = [_stock_row(stock) for stock in stocks]
 
             # 创建查询结果
             query_result = QueryResult.create(data, total, pagination)
 
             # 缓存结果
-            if use_cache and cache_key:
-                await self.cache_repo.set(
-                    CacheType.QUERY_RESULT,
-                    cache_key,
-                    query_result.dict(),
-                    ttl=self.cache_ttl,
-                )
-                logger.debug(f"缓存股票查询结果: {cache_key}")
+            if page_cache:
+                self._write_page_cache(page_cache, query_result)
 
             return query_result
 
@@ -373,80 +830,47 @@ class QueryService:
         Returns:
             查询结果
         """
-        # 生成缓存键
-        cache_key = None
+        # 尝试从缓存获取，分页结果和总数一次读取
+        page_cache = None
         if use_cache:
-            params = {
-                "pagination": pagination.dict(),
-                "filters": filters.dict() if filters else {},
-                "sort": sort_params.dict() if sort_params else {},
-            }
-            cache_key = self._generate_cache_key("stock_daily", params)
-
-            # 尝试从缓存获取
-            cached_result = await self.cache_repo.get(CacheType.QUERY_RESULT, cache_key)
-            if cached_result:
-                logger.debug(f"从缓存获取股票日线查询结果: {cache_key}")
-                return QueryResult(**cached_result)
+            page_cache = self._read_page_cache(
+                "stock_daily", filters, pagination, sort_params
+            )
+            if page_cache.page_payload:
+                logger.debug(f"从缓存获取股票日线查询结果: {page_cache.page_key}")
+                return QueryResult(**orjson.loads(page_cache.page_payload))
 
         try:
             # 构建基础查询
-            query = session.query(StockDailyData).options(selectinload(StockDailyData.stock))
+            query = select(StockDailyData)
 
             # 应用过滤条件
-            if filters:
+            if filters and not filters.is_empty:
                 query = self._apply_filters(query, filters, StockDailyData)
 
-            # 获取总数
-            total_query = query.statement.with_only_columns(func.count())
-            total_result = await session.execute(total_query)
-            total = total_result.scalar()
-
-            # 应用排序
-            query = self._apply_sorting(query, sort_params, StockDailyData)
-
-            # 应用分页
-            query = query.offset(pagination.offset).limit(pagination.limit)
-
-            # 执行查询
-            result = await session.execute(query)
-            stock_dailies = result.scalars().all()
+            # 分页查询
+            stock_dailies, total, next_cursor = await self._fetch_page(
+                session,
+                query,
+                StockDailyData,
+                pagination,
+                sort_params,
+                "trade_date",
+                page_cache.cached_total if page_cache else None,
+            )
 
             # 转换为字典格式
-            data = [
-                {
-                    "stock_code": daily.stock_code,
-                    "stock_name": daily.stock.name if daily.stock else None,
-                    "trade_date": daily.trade_date.isoformat(),
-                    "open_price": float(daily.open_price),
-                    "high_price": float(daily.high_price),
-                    "low_price": float(daily.low_price),
-                    "close_price": float(daily.close_price),
-                    "volume": daily.volume,
-                    "amount": float(daily.amount),
-                    "turnover_rate": float(daily.turnover_rate)
-                    if daily.turnover_rate
-                    else None,
-                    "pe_ratio": float(daily.pe_ratio) if daily.pe_ratio else None,
-                    "pb_ratio": float(daily.pb_ratio) if daily.pb_ratio else None,
-                    "created_at": daily.created_at.isoformat(),
-                    "updated_at": daily.updated_at.isoformat(),
-                }
-                for daily in stock_dailies
-            ]
+            data = [_daily_row(daily) for daily in stock_dailies]
 
             # 创建查询结果
-            query_result = QueryResult.create(data, total, pagination)
+            if total is None:
+                query_result = QueryResult.create_keyset(data, pagination, next_cursor)
+            else:
+                query_result = QueryResult.create(data, total, pagination, next_cursor)
 
             # 缓存结果
-            if use_cache and cache_key:
-                await self.cache_repo.set(
-                    CacheType.QUERY_RESULT,
-                    cache_key,
-                    query_result.dict(),
-                    ttl=self.cache_ttl,
-                )
-                logger.debug(f"缓存股票日线查询结果: {cache_key}")
+            if page_cache:
+                self._write_page_cache(page_cache, query_result)
 
             return query_result
 
@@ -474,83 +898,51 @@ class QueryService:
         Returns:
             查询结果
         """
-        # 生成缓存键
-        cache_key = None
+        # 尝试从缓存获取，分页结果和总数一次读取
+        page_cache = None
         if use_cache:
-            params = {
-                "pagination": pagination.dict(),
-                "filters": filters.dict() if filters else {},
-                "sort": sort_params.dict() if sort_params else {},
-            }
-            cache_key = self._generate_cache_key("news", params)
-
-            # 尝试从缓存获取
-            cached_result = await self.cache_repo.get(CacheType.QUERY_RESULT, cache_key)
-            if cached_result:
-                logger.debug(f"从缓存获取新闻查询结果: {cache_key}")
-                return QueryResult(**cached_result)
+            page_cache = self._read_page_cache("news", filters, pagination, sort_params)
+            if page_cache.page_payload:
+                logger.debug(f"从缓存获取新闻查询结果: {page_cache.page_key}")
+                return QueryResult(**orjson.loads(page_cache.page_payload))
 
         try:
-            # 构建基础查询
-            query = session.query(NewsData).options(selectinload(NewsData.sentiment_analysis))
+            # 构建基础查询，正文只取摘要所需的前若干字
+            query = select(NewsData).options(
+                defer(NewsData.content),
+                with_expression(
+                    NewsData.content_preview,
+                    func.substr(NewsData.content, 1, NEWS_PREVIEW_LENGTH + 1),
+                ),
+            )
 
             # 应用过滤条件
-            if filters:
+            if filters and not filters.is_empty:
                 query = self._apply_filters(query, filters, NewsData)
 
-            # 获取总数
-            total_query = query.statement.with_only_columns(func.count())
-            total_result = await session.execute(total_query)
-            total = total_result.scalar()
-
-            # 应用排序
-            query = self._apply_sorting(query, sort_params, NewsData)
-
-            # 应用分页
-            query = query.offset(pagination.offset).limit(pagination.limit)
-
-            # 执行查询
-            result = await session.execute(query)
-            news_list = result.scalars().all()
+            # 分页查询
+            news_list, total, next_cursor = await self._fetch_page(
+                session,
+                query,
+                NewsData,
+                pagination,
+                sort_params,
+                "publish_time",
+                page_cache.cached_total if page_cache else None,
+            )
 
             # 转换为字典格式
-            data = [
-                {
-                    "id": news.id,
-                    "title": news.title,
-                    "content": news.content[:500] + "..."
-                    if len(news.content) > 500
-                    else news.content,
-                    "source": news.source,
-                    "url": news.url,
-                    "published_at": news.published_at.isoformat()
-                    if news.published_at
-                    else None,
-                    "stock_codes": news.stock_codes,
-                    "sentiment_score": float(news.sentiment_analysis[0].sentiment_score)
-                    if news.sentiment_analysis
-                    else None,
-                    "sentiment_type": news.sentiment_analysis[0].sentiment_type.value
-                    if news.sentiment_analysis
-                    else None,
-                    "created_at": news.created_at.isoformat(),
-                    "updated_at": news.updated_at.isoformat(),
-                }
-                for news in news_list
-            ]
+            data = [_news_row(news) for news in news_list]
 
             # 创建查询结果
-            query_result = QueryResult.create(data, total, pagination)
+            if total is None:
+                query_result = QueryResult.create_keyset(data, pagination, next_cursor)
+            else:
+                query_result = QueryResult.create(data, total, pagination, next_cursor)
 
             # 缓存结果
-            if use_cache and cache_key:
-                await self.cache_repo.set(
-                    CacheType.QUERY_RESULT,
-                    cache_key,
-                    query_result.dict(),
-                    ttl=self.cache_ttl,
-                )
-                logger.debug(f"缓存新闻查询结果: {cache_key}")
+            if page_cache:
+                self._write_page_cache(page_cache, query_result)
 
             return query_result
 
@@ -577,57 +969,58 @@ class QueryService:
         # 生成缓存键
         cache_key = None
         if use_cache:
-            params = {"filters": filters.dict() if filters else {}}
-            cache_key = self._generate_cache_key("sentiment_stats", params)
+            cache_key = _query_cache_key("sentiment_stats", filters)
 
             # 尝试从缓存获取
-            cached_result = await self.cache_repo.get(CacheType.QUERY_RESULT, cache_key)
+            cached_result = self.cache_repo.get(CacheType.QUERY_RESULT, cache_key)
             if cached_result:
                 logger.debug(f"从缓存获取情感统计结果: {cache_key}")
                 return cached_result
 
         try:
-            # 构建基础查询
-            query = session.query(SentimentAnalysis)
+            # 一条语句同时统计总数、平均分和各情感类型数量
+            # （用 COUNT(CASE ...) 做条件计数，MySQL 不支持 FILTER 子句）
+            stmt = select(
+                func.count(SentimentAnalysis.id),
+                func.avg(SentimentAnalysis.sentiment_score),
+                *(
+                    func.count(
+                        case(
+                            (
+                                SentimentAnalysis.sentiment_type == sentiment_type,
+                                SentimentAnalysis.id,
+                            )
+                        )
+                    )
+                    for sentiment_type in SentimentType
+                ),
+            ).select_from(SentimentAnalysis)
 
             # 应用过滤条件
-            if filters:
+            if filters and not filters.is_empty:
                 # 通过关联的新闻表进行过滤
-                query = query.join(NewsData)
+                stmt = stmt.join(NewsData, NewsData.id == SentimentAnalysis.news_id)
                 if filters.stock_code:
-                    query = query.filter(NewsData.stock_codes.contains(filters.stock_code))
+                    stmt = stmt.where(
+                        NewsData.related_stocks.contains(filters.stock_code)
+                    )
                 if filters.start_date:
-                    query = query.filter(NewsData.published_at >= filters.start_date)
+                    stmt = stmt.where(NewsData.publish_time >= filters.start_date)
                 if filters.end_date:
-                    query = query.filter(NewsData.published_at <= filters.end_date)
-
-            # 统计各种情感类型的数量
-            sentiment_counts = await session.execute(
-                query.with_entities(
-                    SentimentAnalysis.sentiment_type,
-                    func.count(SentimentAnalysis.id).label("count"),
-                ).group_by(SentimentAnalysis.sentiment_type)
-            )
-
-            # 统计平均情感分数
-            avg_score_result = await session.execute(
-                query.with_entities(
-                    func.avg(SentimentAnalysis.sentiment_score).label("avg_score")
-                )
-            )
+                    stmt = stmt.where(NewsData.publish_time <= filters.end_date)
 
-            # 统计总数
-            total_result = await session.execute(
-                query.with_entities(func.count(SentimentAnalysis.id))
-            )
+            stats_result = await session.execute(stmt)
+            total_count, avg_score, *type_counts = stats_result.one()
 
             # 组装结果
-            sentiment_distribution = {}
-            for sentiment_type, count in sentiment_counts:
-                sentiment_distribution[sentiment_type.value] = count
-
-            avg_score = avg_score_result.scalar() or 0.0
-            total_count = total_result.scalar() or 0
+            sentiment_distribution = {
+                sentiment_type.name.lower(): count
+                for sentiment_type, count in zip(
+                    SentimentType, type_counts, strict=True
+                )
+            }
+            avg_score = avg_score or 0.0
+            total_count = total_count or 0
 
             result = {
                 "total_count": total_count,
@@ -655,7 +1048,7 @@ class QueryService:
 
             # 缓存结果
             if use_cache and cache_key:
-                await self.cache_repo.set(
+                self.cache_repo.set(
                     CacheType.QUERY_RESULT, cache_key, result, ttl=self.cache_ttl
                 )
                 logger.debug(f"缓存情感统计结果: {cache_key}")
@@ -677,9 +1070,13 @@ class QueryService:
         """
         try:
             if pattern:
-                return await self.cache_repo.delete_pattern(f"query:*{pattern}*")
+                return self.cache_repo.clear_by_pattern(
+                    CacheType.QUERY_RESULT, f"query:*{pattern}*"
+                )
             else:
-                return await self.cache_repo.delete_pattern("query:*")
+                return self.cache_repo.clear_by_pattern(
+                    CacheType.QUERY_RESULT, "query:*"
+                )
         except Exception as e:
             logger.error(f"清理查询缓存失败: {e}")
             return 0
@@ -4,13 +4,18 @@
 """
 
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
 from typing import Any
 
 import backtrader as bt
 from loguru import logger
 
+# 数值参数允许的类型，模块级元组避免每次校验都构造 int | float 联合类型
+NUMERIC_TYPES = (int, float)
+
 
 class SignalType(Enum):
     """交易信号类型"""
@@ -20,15 +25,20 @@ class SignalType(Enum):
     HOLD = "hold"
 
 
-@dataclass
+@dataclass(slots=True)
 class TradingSignal:
-    """交易信号数据类"""
+    """交易信号数据类
+
+    使用 __slots__ 存储字段，回测中每个信号少一个实例字典。
+    """
 
     signal_type: SignalType
     price: float
     size: int | None = None
     reason: str | None = None
     confidence: float | None = None
+    timestamp: datetime | None = None
+    metadata: dict[str, Any] | None = None
 
 
 class BaseStrategy(bt.Strategy, ABC):
@@ -44,16 +54,37 @@ class BaseStrategy(bt.Strategy, ABC):
         ("take_profit_pct", 0.10),  # 止盈百分比
         ("position_size", 1000),  # 默认仓位大小
         ("max_positions", 5),  # 最大持仓数量
+        ("signal_history_size", 10000),  # 保留的最近信号数量，None表示不限
     )
 
     def __init__(self):
         """初始化策略"""
         super().__init__()
         self.order = None
-        self.signals: list[TradingSignal] = []
+        # 只保留最近的信号，累计数量由计数器维护，不受淘汰影响
+        self.signals: deque[TradingSignal] = deque(
+            maxlen=self.params.signal_history_size
+        )
+        self._append_signal = self.signals.append
+        self._signal_count = 0
+        self._buy_count = 0
+        self._sell_count = 0
         self.entry_price = None
         self.strategy_name = self.__class__.__name__
 
+        # 逐根K线使用的参数和收盘价线，初始化时绑定一次，避免每次描述符查找
+        self._sl_pct = self.params.stop_loss_pct
+        self._tp_pct = self.params.take_profit_pct
+        self._pos_size = self.params.position_size
+        self._close = self.data.close
+
+        # 是否已度过指标预热期，由 nextstart 在首次调用 next 前置位
+        self._warm = False
+
+        # 策略状态按K线缓存，同一根K线内重复查询不再重建
+        self._state_bar = None
+        self._state_cache: dict[str, Any] | None = None
+
         # 记录策略参数
         self.log_params()
 
@@ -114,6 +145,15 @@ class BaseStrategy(bt.Strategy, ABC):
         if signal:
             self.execute_signal(signal)
 
+    def nextstart(self):
+        """首根满足最小周期的K线
+
+        backtrader 在策略持有的指标全部形成后才开始调用 next，
+        预热期到此结束，之后的 next 无需再判断数据长度。
+        """
+        self._warm = True
+        self.next()
+
     def execute_signal(self, signal: TradingSignal):
         """执行交易信号"""
         if signal.signal_type == SignalType.BUY:
@@ -122,7 +162,16 @@ class BaseStrategy(bt.Strategy, ABC):
             self.execute_sell(signal)
 
         # 记录信号
-        self.signals.append(signal)
+        self.record_signal(signal)
+
+    def record_signal(self, signal: TradingSignal):
+        """记录交易信号并累计买卖信号数量"""
+        self._append_signal(signal)
+        self._signal_count += 1
+        if signal.signal_type is SignalType.BUY:
+            self._buy_count += 1
+        elif signal.signal_type is SignalType.SELL:
+            self._sell_count += 1
 
     def execute_buy(self, signal: TradingSignal):
         """执行买入信号"""
@@ -145,7 +194,7 @@ class BaseStrategy(bt.Strategy, ABC):
 
         子类可以覆盖此方法实现自定义仓位管理。
         """
-        return self.params.position_size
+        return self._pos_size
 
     def notify_order(self, order):
         """订单状态通知"""
@@ -174,48 +223,74 @@ class BaseStrategy(bt.Strategy, ABC):
         self.log(f"交易完成: 盈亏={trade.pnl:.2f}, 净盈亏={trade.pnlcomm:.2f}")
 
     def check_stop_loss(self) -> bool:
-        """检查止损条件"""
-        if not self.position or not self.entry_price:
+        """检查止损条件
+
+        逐根K线调用，未持有多头时尽早返回，仅在触发时格式化日志。
+        """
+        entry_price = self.entry_price
+        if not entry_price:
+            return False
+        position = self.position
+        if not position or position.size <= 0:  # 仅检查多头持仓
             return False
 
-        current_price = self.data.close[0]
-        if self.position.size > 0:  # 多头持仓
-            loss_pct = (self.entry_price - current_price) / self.entry_price
-            if loss_pct >= self.params.stop_loss_pct:
-                self.log(
-                    f"触发止损: 当前价格={current_price:.2f}, 入场价格={self.entry_price:.2f}, 亏损={loss_pct:.2%}"
-                )
-                return True
+        current_price = self._close[0]
+        loss_pct = (entry_price - current_price) / entry_price
+        if loss_pct < self._sl_pct:
+            return False
 
-        return False
+        self.log(
+            f"触发止损: 当前价格={current_price:.2f}, 入场价格={entry_price:.2f}, 亏损={loss_pct:.2%}"
+        )
+        return True
 
     def check_take_profit(self) -> bool:
-        """检查止盈条件"""
-        if not self.position or not self.entry_price:
+        """检查止盈条件
+
+        逐根K线调用，未持有多头时尽早返回，仅在触发时格式化日志。
+        """
+        entry_price = self.entry_price
+        if not entry_price:
+            return False
+        position = self.position
+        if not position or position.size <= 0:  # 仅检查多头持仓
             return False
 
-        current_price = self.data.close[0]
-        if self.position.size > 0:  # 多头持仓
-            profit_pct = (current_price - self.entry_price) / self.entry_price
-            if profit_pct >= self.params.take_profit_pct:
-                self.log(
-                    f"触发止盈: 当前价格={current_price:.2f}, 入场价格={self.entry_price:.2f}, 盈利={profit_pct:.2%}"
-                )
-                return True
+        current_price = self._close[0]
+        profit_pct = (current_price - entry_price) / entry_price
+        if profit_pct < self._tp_pct:
+            return False
 
-        return False
+        self.log(
+            f"触发止盈: 当前价格={current_price:.2f}, 入场价格={entry_price:.2f}, 盈利={profit_pct:.2%}"
+        )
+        return True
 
     def get_strategy_stats(self) -> dict[str, Any]:
         """获取策略统计信息"""
         return {
             "strategy_name": self.strategy_name,
-            "total_signals": len(self.signals),
-            "buy_signals": len(
-                [s for s in self.signals if s.signal_type == SignalType.BUY]
-            ),
-            "sell_signals": len(
-                [s for s in self.signals if s.signal_type == SignalType.SELL]
-            ),
+            "total_signals": self._signal_count,
+            "buy_signals": self._buy_count,
+            "sell_signals": self._sell_count,
             "current_position": self.position.size if self.position else 0,
             "entry_price": self.entry_price,
         }
+
+    def get_strategy_state(self) -> dict[str, Any]:
+        """获取策略当前状态
+
+        同一根K线内的重复调用直接返回已构建的状态，K线推进后才重新构建。
+
+        Returns:
+            dict[str, Any]: 策略状态
+        """
+        bar = len(self.data)
+        if self._state_bar != bar:
+            self._state_cache = self._build_strategy_state()
+            self._state_bar = bar
+        return self._state_cache
+
+    def _build_strategy_state(self) -> dict[str, Any]:
+        """构建策略当前状态，子类覆盖以补充策略特有字段"""
+        return self.get_strategy_stats()
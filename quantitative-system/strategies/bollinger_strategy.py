@@ -7,9 +7,48 @@
 from typing import Any
 
 import backtrader as bt
+import numpy as np
 from loguru import logger
 
-from strategies.base_strategy import BaseStrategy, SignalType, TradingSignal
+from strategies.base_strategy import (
+    NUMERIC_TYPES,
+    BaseStrategy,
+    SignalType,
+    TradingSignal,
+)
+from strategies.indicators import (
+    MinPeriod,
+    PrecomputedLine,
+    bollinger_bands,
+    preloaded_array,
+    sma,
+    state_changes,
+)
+
+# 价格位置编码对应的名称，按 get_price_position 的判断顺序排列
+_PRICE_POSITIONS = ("above_upper", "below_lower", "on_upper", "on_lower", "between")
+
+# 突破状态编码，逐根K线比较整数，对外输出时再转换为名称
+BREAKOUT_NONE = 0
+BREAKOUT_UPPER = 1
+BREAKOUT_LOWER = 2
+_BREAKOUT_NAMES = (None, "upper", "lower")
+
+# 突破位置对应的 (突破方向, 信号类型, 信号原因, 日志描述)
+_BREAKOUTS = {
+    "above_upper": (
+        BREAKOUT_UPPER,
+        SignalType.BUY,
+        "价格突破布林带上轨",
+        "买入信号 - 突破上轨",
+    ),
+    "below_lower": (
+        BREAKOUT_LOWER,
+        SignalType.SELL,
+        "价格跌破布林带下轨",
+        "卖出信号 - 跌破下轨",
+    ),
+}
 
 
 class BollingerBandsStrategy(BaseStrategy):
@@ -33,26 +72,79 @@ class BollingerBandsStrategy(BaseStrategy):
         """初始化策略"""
         super().__init__()
 
-        # 计算布林带指标
-        self.bollinger = bt.indicators.BollingerBands(
-            self.data.close, period=self.params.period, devfactor=self.params.devfactor
-        )
+        close = preloaded_array(self.data)
+        volume = preloaded_array(self.data, "volume")
+        if close is not None and volume is not None:
+            # 数据已预加载，一次性向量化计算全部指标
+            top, mid, bot = bollinger_bands(
+                close, self.params.period, self.params.devfactor
+            )
+            self.bb_top = PrecomputedLine(top, self.data)
+            self.bb_mid = PrecomputedLine(mid, self.data)
+            self.bb_bot = PrecomputedLine(bot, self.data)
+            volume_ma = sma(volume, self.params.period)
+            width = (top - bot) / mid
+            self.bb_width = PrecomputedLine(width, self.data)
+            self.volume_ma = PrecomputedLine(volume_ma, self.data)
+            MinPeriod(self.data, period=self.params.period)
+
+            # 向量化计算每根K线的价格位置编码，对应 _PRICE_POSITIONS 的下标
+            threshold = self.params.breakout_threshold
+            self._price_positions = np.select(
+                [
+                    close > top * (1 + threshold),
+                    close < bot * (1 - threshold),
+                    close > top * (1 - threshold),
+                    close < bot * (1 + threshold),
+                ],
+                [0, 1, 2, 3],
+                default=4,
+            ).astype(np.int8)
+
+            # 成交量和波动性过滤条件整体比较一次，逐根K线只需查表
+            self._high_volume = volume >= volume_ma * self.params.min_volume_ratio
+            self._high_volatility = width > 0.05
+
+            # 价格是否位于中轨±1%范围内，持仓期间的均值回归检查直接查表
+            self._near_mid = np.abs(close - mid) / mid < 0.01
+
+            # 突破状态机的事件：满足过滤条件的上下轨突破，以及回到带内的重置。
+            # 只有状态跳变的K线会产生信号或改变 last_breakout，其余K线直接跳过
+            active = self._high_volume & self._high_volatility
+            events = np.full(len(close), -1, dtype=np.int8)
+            events[(self._price_positions == 0) & active] = BREAKOUT_UPPER
+            events[(self._price_positions == 1) & active] = BREAKOUT_LOWER
+            events[self._price_positions == 4] = BREAKOUT_NONE
+            self._signal_bars = state_changes(events, BREAKOUT_NONE)
+        else:
+            self._price_positions = None
+            self._high_volume = None
+            self._high_volatility = None
+            self._near_mid = None
+            self._signal_bars = None
+
+            # 计算布林带指标
+            self.bollinger = bt.indicators.BollingerBands(
+                self.data.close,
+                period=self.params.period,
+                devfactor=self.params.devfactor,
+            )
 
-        # 布林带的上轨、中轨、下轨
-        self.bb_top = self.bollinger.top
-        self.bb_mid = self.bollinger.mid
-        self.bb_bot = self.bollinger.bot
+            # 布林带的上轨、中轨、下轨
+            self.bb_top = self.bollinger.top
+            self.bb_mid = self.bollinger.mid
+            self.bb_bot = self.bollinger.bot
 
-        # 计算布林带宽度（用于判断市场波动性）
-        self.bb_width = (self.bb_top - self.bb_bot) / self.bb_mid
+            # 计算布林带宽度（用于判断市场波动性）
+            self.bb_width = (self.bb_top - self.bb_bot) / self.bb_mid
 
-        # 计算成交量移动平均（用于成交量过滤）
-        self.volume_ma = bt.indicators.SimpleMovingAverage(
-            self.data.volume, period=self.params.period
-        )
+            # 计算成交量移动平均（用于成交量过滤）
+            self.volume_ma = bt.indicators.SimpleMovingAverage(
+                self.data.volume, period=self.params.period
+            )
 
         # 记录上一次的突破状态
-        self.last_breakout = None  # 'upper', 'lower', None
+        self.last_breakout = BREAKOUT_NONE
 
         logger.info(
             f"布林带策略初始化完成 - 周期: {self.params.period}, "
@@ -86,17 +178,17 @@ class BollingerBandsStrategy(BaseStrategy):
             return False
 
         # 验证标准差倍数
-        if not isinstance(devfactor, int | float) or devfactor <= 0:
+        if not isinstance(devfactor, NUMERIC_TYPES) or devfactor <= 0:
             logger.error(f"标准差倍数必须是正数: {devfactor}")
             return False
 
         # 验证成交量比率
-        if not isinstance(min_volume_ratio, int | float) or min_volume_ratio <= 0:
+        if not isinstance(min_volume_ratio, NUMERIC_TYPES) or min_volume_ratio <= 0:
             logger.error(f"最小成交量比率必须是正数: {min_volume_ratio}")
             return False
 
         # 验证突破阈值
-        if not isinstance(breakout_threshold, int | float) or breakout_threshold < 0:
+        if not isinstance(breakout_threshold, NUMERIC_TYPES) or breakout_threshold < 0:
             logger.error(f"突破阈值必须是非负数: {breakout_threshold}")
             return False
 
@@ -109,7 +201,11 @@ class BollingerBandsStrategy(BaseStrategy):
             str: 'above_upper' (上轨上方), 'below_lower' (下轨下方),
                  'between' (上下轨之间), 'on_upper' (接近上轨), 'on_lower' (接近下轨)
         """
-        if len(self.data) < self.params.period:
+        price_positions = self._price_positions
+        if price_positions is not None:
+            return _PRICE_POSITIONS[price_positions[len(self.data) - 1]]
+
+        if not self._warm:
             return "between"
 
         current_price = self.data.close[0]
@@ -135,9 +231,13 @@ class BollingerBandsStrategy(BaseStrategy):
 
         基于成交量移动平均来判断
         """
-        if len(self.data) < self.params.period:
+        if not self._warm:
             return False
 
+        high_volume = self._high_volume
+        if high_volume is not None:
+            return bool(high_volume[len(self.data) - 1])
+
         current_volume = self.data.volume[0]
         avg_volume = self.volume_ma[0]
 
@@ -148,89 +248,75 @@ class BollingerBandsStrategy(BaseStrategy):
 
         基于布林带宽度来判断
         """
-        if len(self.data) < self.params.period:
+        if not self._warm:
             return False
 
+        high_volatility = self._high_volatility
+        if high_volatility is not None:
+            return bool(high_volatility[len(self.data) - 1])
+
         # 布林带宽度大于5%认为是高波动性
         return self.bb_width[0] > 0.05
 
     def generate_signal(self) -> TradingSignal | None:
         """生成交易信号"""
+        # 预计算了信号K线时，其余K线不会产生信号或改变状态，直接跳过
+        signal_bars = self._signal_bars
+        if signal_bars is not None and not signal_bars[len(self.data) - 1]:
+            return None
+
         # 确保有足够的数据
-        if len(self.data) < self.params.period:
+        if not self._warm:
             return None
 
         price_position = self.get_price_position()
-        current_price = self.data.close[0]
 
-        signal = None
+        # 只有突破上下轨才可能产生信号，价格回到布林带内部时重置突破状态
+        breakout_signal = _BREAKOUTS.get(price_position)
+        if breakout_signal is None:
+            if price_position == "between":
+                self.last_breakout = BREAKOUT_NONE
+            return None
 
-        # 上轨突破买入信号
+        breakout, signal_type, reason, description = breakout_signal
         if (
-            price_position == "above_upper"
-            and self.last_breakout != "upper"
-            and self.is_high_volume()
-            and self.is_high_volatility()
-        ):
-            signal = TradingSignal(
-                signal_type=SignalType.BUY,
-                price=current_price,
-                timestamp=self.data.datetime.datetime(0),
-                confidence=0.75,
-                metadata={
-                    "bb_upper": self.bb_top[0],
-                    "bb_mid": self.bb_mid[0],
-                    "bb_lower": self.bb_bot[0],
-                    "bb_width": self.bb_width[0],
-                    "price_position": price_position,
-                    "volume_ratio": self.data.volume[0] / self.volume_ma[0],
-                    "signal_reason": "价格突破布林带上轨",
-                },
-            )
-
-            logger.info(
-                f"生成买入信号 - 突破上轨, 价格: {current_price:.2f}, "
-                f"上轨: {self.bb_top[0]:.2f}, 中轨: {self.bb_mid[0]:.2f}, "
-                f"下轨: {self.bb_bot[0]:.2f}"
-            )
-
-            self.last_breakout = "upper"
-
-        # 下轨突破卖出信号
-        elif (
-            price_position == "below_lower"
-            and self.last_breakout != "lower"
-            and self.is_high_volume()
-            and self.is_high_volatility()
+            self.last_breakout == breakout
+            or not self.is_high_volume()
+            or not self.is_high_volatility()
         ):
-            signal = TradingSignal(
-                signal_type=SignalType.SELL,
-                price=current_price,
-                timestamp=self.data.datetime.datetime(0),
-                confidence=0.75,
-                metadata={
-                    "bb_upper": self.bb_top[0],
-                    "bb_mid": self.bb_mid[0],
-                    "bb_lower": self.bb_bot[0],
-                    "bb_width": self.bb_width[0],
-                    "price_position": price_position,
-                    "volume_ratio": self.data.volume[0] / self.volume_ma[0],
-                    "signal_reason": "价格跌破布林带下轨",
-                },
-            )
-
-            logger.info(
-                f"生成卖出信号 - 跌破下轨, 价格: {current_price:.2f}, "
-                f"上轨: {self.bb_top[0]:.2f}, 中轨: {self.bb_mid[0]:.2f}, "
-                f"下轨: {self.bb_bot[0]:.2f}"
-            )
+            return None
 
-            self.last_breakout = "lower"
+        # 确认产生信号后才读取指标值并构建元数据
+        current_price = self.data.close[0]
+        bb_upper = self.bb_top[0]
+        bb_mid = self.bb_mid[0]
+        bb_lower = self.bb_bot[0]
+        signal = TradingSignal(
+            signal_type=signal_type,
+            price=current_price,
+            timestamp=self.data.datetime.datetime(0),
+            confidence=0.75,
+            metadata={
+                "bb_upper": bb_upper,
+                "bb_mid": bb_mid,
+                "bb_lower": bb_lower,
+                "bb_width": self.bb_width[0],
+                "price_position": price_position,
+                "volume_ratio": self.data.volume[0] / self.volume_ma[0],
+                "signal_reason": reason,
+            },
+        )
 
-        # 重置突破状态（当价格回到布林带内部时）
-        elif price_position == "between":
-            self.last_breakout = None
+        logger.info(
+            "生成{}, 价格: {:.2f}, 上轨: {:.2f}, 中轨: {:.2f}, 下轨: {:.2f}",
+            description,
+            current_price,
+            bb_upper,
+            bb_mid,
+            bb_lower,
+        )
 
+        self.last_breakout = breakout
         return signal
 
     def next(self):
@@ -239,7 +325,7 @@ class BollingerBandsStrategy(BaseStrategy):
         signal = self.generate_signal()
 
         if signal:
-            self.signals.append(signal)
+            self.record_signal(signal)
 
             # 执行交易逻辑
             if signal.signal_type == SignalType.BUY and not self.position:
@@ -248,14 +334,16 @@ class BollingerBandsStrategy(BaseStrategy):
                 self.order = self.buy(size=size)
                 self.entry_price = signal.price
 
-                logger.info(f"执行买入订单 - 数量: {size}, 价格: {signal.price:.2f}")
+                logger.info("执行买入订单 - 数量: {}, 价格: {:.2f}", size, signal.price)
 
             elif signal.signal_type == SignalType.SELL and self.position:
                 # 卖出信号且当前有持仓
                 self.order = self.sell(size=self.position.size)
 
                 logger.info(
-                    f"执行卖出订单 - 数量: {self.position.size}, 价格: {signal.price:.2f}"
+                    "执行卖出订单 - 数量: {}, 价格: {:.2f}",
+                    self.position.size,
+                    signal.price,
                 )
 
         # 检查止损和中轨回归
@@ -263,51 +351,51 @@ class BollingerBandsStrategy(BaseStrategy):
         self.check_mean_reversion()
 
     def check_mean_reversion(self):
-        """检查均值回归（价格回到中轨附近时平仓）"""
-        if not self.position or len(self.data) < self.params.period:
-            return
+        """检查均值回归（价格回到中轨附近时平仓）
 
-        current_price = self.data.close[0]
-        mid_band = self.bb_mid[0]
+        逐根K线调用，持仓和当根价格只读取一次。
+        """
+        position = self.position
+        if not position or not self._warm:
+            return
 
         # 如果价格接近中轨（±1%范围内），考虑平仓
-        if abs(current_price - mid_band) / mid_band < 0.01:
-            if self.position.size > 0:  # 多头持仓
-                profit_pct = (current_price - self.entry_price) / self.entry_price
-                if profit_pct > 0.02:  # 盈利超过2%时平仓
-                    self.order = self.sell(size=self.position.size)
-                    logger.info(
-                        f"均值回归平仓 - 价格回到中轨附近, 盈利: {profit_pct:.2%}"
-                    )
-
-            elif self.position.size < 0:  # 空头持仓
-                profit_pct = (self.entry_price - current_price) / self.entry_price
-                if profit_pct > 0.02:  # 盈利超过2%时平仓
-                    self.order = self.buy(size=abs(self.position.size))
-                    logger.info(
-                        f"均值回归平仓 - 价格回到中轨附近, 盈利: {profit_pct:.2%}"
-                    )
-
-    def get_strategy_state(self) -> dict[str, Any]:
-        """获取策略当前状态"""
-        base_state = super().get_strategy_state()
+        current_price = self._close[0]
+        near_mid = self._near_mid
+        if near_mid is not None:
+            if not near_mid[len(self.data) - 1]:
+                return
+        else:
+            mid_band = self.bb_mid[0]
+            if not abs(current_price - mid_band) / mid_band < 0.01:
+                return
+
+        entry_price = self.entry_price
+        size = position.size
+        if size > 0:  # 多头持仓
+            profit_pct = (current_price - entry_price) / entry_price
+            if profit_pct > 0.02:  # 盈利超过2%时平仓
+                self.order = self.sell(size=size)
+                logger.info("均值回归平仓 - 价格回到中轨附近, 盈利: {:.2%}", profit_pct)
+
+        elif size < 0:  # 空头持仓
+            profit_pct = (entry_price - current_price) / entry_price
+            if profit_pct > 0.02:  # 盈利超过2%时平仓
+                self.order = self.buy(size=abs(size))
+                logger.info("均值回归平仓 - 价格回到中轨附近, 盈利: {:.2%}", profit_pct)
+
+    def _build_strategy_state(self) -> dict[str, Any]:
+        """构建策略当前状态"""
+        base_state = super()._build_strategy_state()
 
         # 添加策略特有状态
         strategy_state = {
-            "bb_upper": float(self.bb_top[0])
-            if len(self.data) >= self.params.period
-            else None,
-            "bb_mid": float(self.bb_mid[0])
-            if len(self.data) >= self.params.period
-            else None,
-            "bb_lower": float(self.bb_bot[0])
-            if len(self.data) >= self.params.period
-            else None,
-            "bb_width": float(self.bb_width[0])
-            if len(self.data) >= self.params.period
-            else None,
+            "bb_upper": float(self.bb_top[0]) if self._warm else None,
+            "bb_mid": float(self.bb_mid[0]) if self._warm else None,
+            "bb_lower": float(self.bb_bot[0]) if self._warm else None,
+            "bb_width": float(self.bb_width[0]) if self._warm else None,
             "price_position": self.get_price_position(),
-            "last_breakout": self.last_breakout,
+            "last_breakout": _BREAKOUT_NAMES[self.last_breakout],
             "is_high_volume": self.is_high_volume(),
             "is_high_volatility": self.is_high_volatility(),
             "period": self.params.period,
@@ -0,0 +1,227 @@
+"""向量化技术指标模块
+
+在回测开始前基于预加载的完整价格序列一次性计算指标数组，
+替代 backtrader 逐根K线更新的 Python 指标。计算口径与 backtrader
+内置指标保持一致，指标尚未形成的位置填充为 NaN。
+"""
+
+from typing import Any
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class PrecomputedLine:
+    """预计算指标数组的行访问适配器
+
+    按 backtrader 的相对索引方式取值：[0] 为当前K线，[-1] 为上一根K线。
+    """
+
+    __slots__ = ("_data", "array")
+
+    def __init__(self, array: np.ndarray, data: Any):
+        """初始化适配器
+
+        Args:
+            array: 与数据源等长的指标数组
+            data: backtrader 数据源，用于定位当前K线
+        """
+        self.array = array
+        self._data = data
+
+    def __getitem__(self, ago: int) -> float:
+        return float(self.array[len(self._data) - 1 + ago])
+
+
+class MinPeriod(bt.Indicator):
+    """只声明最小周期、不做计算的占位指标
+
+    backtrader 按策略持有的指标推算何时开始调用 next，使用预计算数组后
+    策略不再持有真实指标，需要用它保持原有的起始K线。
+    """
+
+    lines = ("minperiod",)
+    params = (("period", 1),)
+
+    def __init__(self):
+        """初始化占位指标"""
+        self.addminperiod(self.p.period)
+
+    def next(self):
+        pass
+
+    def once(self, start, end):
+        pass
+
+
+def preloaded_array(data: Any, line: str = "close") -> np.ndarray | None:
+    """获取数据源已预加载的完整行数据
+
+    仅在数据已全部预加载时返回数组（cerebro 默认 preload=True），
+    实时数据或开启 exactbars 节省内存时返回None，调用方应回退到 backtrader 指标。
+
+    Args:
+        data: backtrader 数据源
+        line: 行名称，如 close、volume
+
+    Returns:
+        行数据数组，未预加载时返回None
+    """
+    values = getattr(data, line).array
+    buflen = data.buflen()
+    if not buflen or len(values) != buflen:
+        return None
+    return np.asarray(values, dtype=np.float64)
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """简单移动平均
+
+    Args:
+        values: 输入序列
+        period: 窗口期
+
+    Returns:
+        移动平均序列，前 period-1 个位置为 NaN
+    """
+    result = np.full(len(values), np.nan)
+    if len(values) >= period:
+        result[period - 1 :] = sliding_window_view(values, period).mean(axis=-1)
+    return result
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """指数移动平均
+
+    与 backtrader 一致：以首个有效窗口的简单平均作为种子，
+    之后按 alpha=2/(period+1) 递推。输入开头的 NaN 会被跳过。
+
+    Args:
+        values: 输入序列
+        period: 窗口期
+
+    Returns:
+        指数移动平均序列，未形成的位置为 NaN
+    """
+    result = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if not len(valid):
+        return result
+
+    start = valid[0]
+    seed_at = start + period - 1
+    if seed_at >= len(values):
+        return result
+
+    seeded = values[seed_at:].copy()
+    seeded[0] = values[start : seed_at + 1].mean()
+    result[seed_at:] = (
+        pd.Series(seeded).ewm(alpha=2.0 / (period + 1), adjust=False).mean().to_numpy()
+    )
+    return result
+
+
+def bollinger_bands(
+    close: np.ndarray, period: int, devfactor: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """布林带
+
+    标准差按总体口径 sqrt(E[x²] - E[x]²) 计算，与 backtrader 的 StdDev 一致。
+    计算前先减去首个窗口末尾的价格，方差不受平移影响，但高价位、低波动时
+    E[x²] 与 E[x]² 相减的抵消误差可降低数个数量级，计算量不变。
+
+    Args:
+        close: 收盘价序列
+        period: 移动平均周期
+        devfactor: 标准差倍数
+
+    Returns:
+        (上轨, 中轨, 下轨)
+    """
+    if len(close) < period:
+        empty = np.full(len(close), np.nan)
+        return empty, empty.copy(), empty.copy()
+
+    anchor = close[period - 1]
+    centered = close - anchor
+    mean = sma(centered, period)
+    variance = sma(centered * centered, period) - mean * mean
+    mid = mean + anchor
+    deviation = devfactor * np.sqrt(np.maximum(variance, 0.0))
+    return mid + deviation, mid, mid - deviation
+
+
+def macd(
+    close: np.ndarray, fast_period: int, slow_period: int, signal_period: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD指标
+
+    Args:
+        close: 收盘价序列
+        fast_period: 快速EMA周期
+        slow_period: 慢速EMA周期
+        signal_period: 信号线EMA周期
+
+    Returns:
+        (MACD线, 信号线, 柱状图)
+    """
+    macd_line = ema(close, fast_period) - ema(close, slow_period)
+    signal_line = ema(macd_line, signal_period)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def crossover(fast: np.ndarray, slow: np.ndarray) -> np.ndarray:
+    """交叉信号
+
+    与 backtrader 的 CrossOver 一致：上穿为1，下穿为-1，否则为0。
+    前一根K线两线相等时沿用更早的相对位置判断。
+
+    Args:
+        fast: 快线序列
+        slow: 慢线序列
+
+    Returns:
+        int8 交叉信号序列
+    """
+    # 指标未形成的位置视为相等，不构成交叉
+    sign = np.sign(np.nan_to_num(fast - slow, nan=0.0)).astype(np.int8)
+
+    # 相等时不改变相对位置，向前沿用最近一次非零符号
+    positions = np.arange(len(sign))
+    last_nonzero = np.maximum.accumulate(np.where(sign != 0, positions, 0))
+    held = sign[last_nonzero]
+    prev = np.empty_like(held)
+    prev[:1] = 0
+    prev[1:] = held[:-1]
+
+    result = np.zeros(len(sign), dtype=np.int8)
+    result[(prev < 0) & (sign > 0)] = 1
+    result[(prev > 0) & (sign < 0)] = -1
+    return result
+
+
+def state_changes(events: np.ndarray, initial: int = 0) -> np.ndarray:
+    """状态机发生跳变的K线
+
+    每根K线的事件给出状态机将要进入的状态，负数表示该K线不改变状态。
+    仅当事件状态与上一次事件的状态不同时状态才真正改变，其余事件K线
+    可以整体跳过，逐根K线的状态机因此只需在跳变处回放。
+
+    Args:
+        events: 每根K线的目标状态编码
+        initial: 状态机的初始状态
+
+    Returns:
+        布尔序列，状态发生跳变的K线为True
+    """
+    event_bars = np.flatnonzero(events >= 0)
+    states = events[event_bars]
+    previous = np.empty_like(states)
+    previous[:1] = initial
+    previous[1:] = states[:-1]
+
+    result = np.zeros(len(events), dtype=bool)
+    result[event_bars[states != previous]] = True
+    return result
@@ -9,7 +9,19 @@ from typing import Any
 import backtrader as bt
 from loguru import logger
 
-from strategies.base_strategy import BaseStrategy, SignalType, TradingSignal
+from strategies.base_strategy import (
+    NUMERIC_TYPES,
+    BaseStrategy,
+    SignalType,
+    TradingSignal,
+)
+from strategies.indicators import (
+    MinPeriod,
+    PrecomputedLine,
+    crossover,
+    preloaded_array,
+    sma,
+)
 
 
 class MovingAverageStrategy(BaseStrategy):
@@ -31,16 +43,33 @@ class MovingAverageStrategy(BaseStrategy):
         """初始化策略"""
         super().__init__()
 
-        # 计算移动平均线
-        self.short_ma = bt.indicators.SimpleMovingAverage(
-            self.data.close, period=self.params.short_window
-        )
-        self.long_ma = bt.indicators.SimpleMovingAverage(
-            self.data.close, period=self.params.long_window
-        )
+        close = preloaded_array(self.data)
+        if close is not None:
+            # 数据已预加载，一次性向量化计算均线和交叉信号
+            short_ma = sma(close, self.params.short_window)
+            long_ma = sma(close, self.params.long_window)
+            self.short_ma = PrecomputedLine(short_ma, self.data)
+            self.long_ma = PrecomputedLine(long_ma, self.data)
+            cross = crossover(short_ma, long_ma)
+            self.crossover = PrecomputedLine(cross, self.data)
+            self._signal_bars = cross != 0
+            MinPeriod(
+                self.data,
+                period=max(self.params.short_window, self.params.long_window) + 1,
+            )
+        else:
+            self._signal_bars = None
+
+            # 计算移动平均线
+            self.short_ma = bt.indicators.SimpleMovingAverage(
+                self.data.close, period=self.params.short_window
+            )
+            self.long_ma = bt.indicators.SimpleMovingAverage(
+                self.data.close, period=self.params.long_window
+            )
 
-        # 计算均线交叉信号
-        self.crossover = bt.indicators.CrossOver(self.short_ma, self.long_ma)
+            # 计算均线交叉信号
+            self.crossover = bt.indicators.CrossOver(self.short_ma, self.long_ma)
 
         logger.info(
             f"双均线策略初始化完成 - 短期窗口: {self.params.short_window}, "
@@ -80,7 +109,7 @@ class MovingAverageStrategy(BaseStrategy):
 
         # 验证止损参数
         if stop_loss_pct is not None and (
-            not isinstance(stop_loss_pct, int | float)
+            not isinstance(stop_loss_pct, NUMERIC_TYPES)
             or stop_loss_pct <= 0
             or stop_loss_pct >= 1
         ):
@@ -91,8 +120,13 @@ class MovingAverageStrategy(BaseStrategy):
 
     def generate_signal(self) -> TradingSignal | None:
         """生成交易信号"""
+        # 预计算了信号K线时，其余K线不会产生信号或改变状态，直接跳过
+        signal_bars = self._signal_bars
+        if signal_bars is not None and not signal_bars[len(self.data) - 1]:
+            return None
+
         # 确保有足够的数据
-        if len(self.data) < self.params.long_window:
+        if not self._warm:
             return None
 
         current_price = self.data.close[0]
@@ -115,8 +149,10 @@ class MovingAverageStrategy(BaseStrategy):
             )
 
             logger.info(
-                f"生成买入信号 - 价格: {current_price:.2f}, "
-                f"短期MA: {short_ma_value:.2f}, 长期MA: {long_ma_value:.2f}"
+                "生成买入信号 - 价格: {:.2f}, 短期MA: {:.2f}, 长期MA: {:.2f}",
+                current_price,
+                short_ma_value,
+                long_ma_value,
             )
 
             return signal
@@ -137,8 +173,10 @@ class MovingAverageStrategy(BaseStrategy):
             )
 
             logger.info(
-                f"生成卖出信号 - 价格: {current_price:.2f}, "
-                f"短期MA: {short_ma_value:.2f}, 长期MA: {long_ma_value:.2f}"
+                "生成卖出信号 - 价格: {:.2f}, 短期MA: {:.2f}, 长期MA: {:.2f}",
+                current_price,
+                short_ma_value,
+                long_ma_value,
             )
 
             return signal
@@ -151,7 +189,7 @@ class MovingAverageStrategy(BaseStrategy):
         signal = self.generate_signal()
 
         if signal:
-            self.signals.append(signal)
+            self.record_signal(signal)
 
             # 执行交易逻辑
             if signal.signal_type == SignalType.BUY and not self.position:
@@ -160,35 +198,33 @@ class MovingAverageStrategy(BaseStrategy):
                 self.order = self.buy(size=size)
                 self.entry_price = signal.price
 
-                logger.info(f"执行买入订单 - 数量: {size}, 价格: {signal.price:.2f}")
+                logger.info("执行买入订单 - 数量: {}, 价格: {:.2f}", size, signal.price)
 
             elif signal.signal_type == SignalType.SELL and self.position:
                 # 卖出信号且当前有持仓
                 self.order = self.sell(size=self.position.size)
 
                 logger.info(
-                    f"执行卖出订单 - 数量: {self.position.size}, 价格: {signal.price:.2f}"
+                    "执行卖出订单 - 数量: {}, 价格: {:.2f}",
+                    self.position.size,
+                    signal.price,
                 )
 
         # 检查止损
         if self.params.stop_loss_pct and self.position and self.entry_price:
             self.check_stop_loss(self.params.stop_loss_pct)
 
-    def get_strategy_state(self) -> dict[str, Any]:
-        """获取策略当前状态"""
-        base_state = super().get_strategy_state()
+    def _build_strategy_state(self) -> dict[str, Any]:
+        """构建策略当前状态"""
+        base_state = super()._build_strategy_state()
 
         # 添加策略特有状态
         strategy_state = {
             "short_ma_current": float(self.short_ma[0])
             if len(self.data) >= self.params.short_window
             else None,
-            "long_ma_current": float(self.long_ma[0])
-            if len(self.data) >= self.params.long_window
-            else None,
-            "crossover_current": float(self.crossover[0])
-            if len(self.data) >= self.params.long_window
-            else None,
+            "long_ma_current": float(self.long_ma[0]) if self._warm else None,
+            "crossover_current": float(self.crossover[0]) if self._warm else None,
             "short_window": self.params.short_window,
             "long_window": self.params.long_window,
             "stop_loss_pct": self.params.stop_loss_pct,
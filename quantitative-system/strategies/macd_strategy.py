@@ -7,9 +7,23 @@ MACD（Moving Average Convergence Divergence）策略基于MACD指标的金叉
 from typing import Any
 
 import backtrader as bt
+import numpy as np
 from loguru import logger
 
-from strategies.base_strategy import BaseStrategy, SignalType, TradingSignal
+from strategies.base_strategy import (
+    NUMERIC_TYPES,
+    BaseStrategy,
+    SignalType,
+    TradingSignal,
+)
+from strategies.indicators import MinPeriod, PrecomputedLine, macd, preloaded_array
+
+# 交叉状态编码，对外输出时再转换为名称
+CROSS_NONE = 0
+CROSS_GOLDEN = 1
+CROSS_DEATH = 2
+_CROSS_CODES = {"golden": CROSS_GOLDEN, "death": CROSS_DEATH}
+_CROSS_NAMES = (None, "golden", "death")
 
 
 class MACDStrategy(BaseStrategy):
@@ -33,21 +47,55 @@ class MACDStrategy(BaseStrategy):
         """初始化策略"""
         super().__init__()
 
-        # 计算MACD指标
-        self.macd = bt.indicators.MACD(
-            self.data.close,
-            period_me1=self.params.fast_period,
-            period_me2=self.params.slow_period,
-            period_signal=self.params.signal_period,
-        )
+        close = preloaded_array(self.data)
+        if close is not None:
+            # 数据已预加载，一次性向量化计算MACD线、信号线和柱状图
+            macd_line, signal_line, histogram = macd(
+                close,
+                self.params.fast_period,
+                self.params.slow_period,
+                self.params.signal_period,
+            )
+            self.macd_line = PrecomputedLine(macd_line, self.data)
+            self.signal_line = PrecomputedLine(signal_line, self.data)
+            self.histogram = PrecomputedLine(histogram, self.data)
+
+            # 向量化计算每根K线的交叉状态和信号强度，逐根K线只需查表
+            prev_macd = np.concatenate(([np.nan], macd_line[:-1]))
+            prev_signal = np.concatenate(([np.nan], signal_line[:-1]))
+            golden = (prev_macd <= prev_signal) & (macd_line > signal_line)
+            death = (prev_macd >= prev_signal) & (macd_line < signal_line)
+            self._cross_states = np.select(
+                [golden, death], [CROSS_GOLDEN, CROSS_DEATH], default=CROSS_NONE
+            ).astype(np.int8)
+            self._strong = np.abs(histogram) >= self.params.min_histogram
+            self._signal_bars = golden | death
+            MinPeriod(
+                self.data,
+                period=max(self.params.fast_period, self.params.slow_period)
+                + self.params.signal_period
+                - 1,
+            )
+        else:
+            self._cross_states = None
+            self._strong = None
+            self._signal_bars = None
+
+            # 计算MACD指标
+            self.macd = bt.indicators.MACDHisto(
+                self.data.close,
+                period_me1=self.params.fast_period,
+                period_me2=self.params.slow_period,
+                period_signal=self.params.signal_period,
+            )
 
-        # MACD线、信号线和柱状图
-        self.macd_line = self.macd.macd
-        self.signal_line = self.macd.signal
-        self.histogram = self.macd.histo
+            # MACD线、信号线和柱状图
+            self.macd_line = self.macd.macd
+            self.signal_line = self.macd.signal
+            self.histogram = self.macd.histo
 
         # 记录上一次的金叉/死叉状态
-        self.last_cross_state = None  # 'golden', 'death', None
+        self.last_cross_state = CROSS_NONE
 
         logger.info(
             f"MACD策略初始化完成 - 快速EMA: {self.params.fast_period}, "
@@ -97,7 +145,7 @@ class MACDStrategy(BaseStrategy):
             return False
 
         # 验证最小柱状图值
-        if not isinstance(min_histogram, int | float):
+        if not isinstance(min_histogram, NUMERIC_TYPES):
             logger.error(f"最小柱状图值必须是数字: {min_histogram}")
             return False
 
@@ -109,9 +157,13 @@ class MACDStrategy(BaseStrategy):
         Returns:
             str | None: 'golden' (金叉), 'death' (死叉), None (无明确状态)
         """
-        if len(self.data) < max(self.params.slow_period, self.params.signal_period) + 1:
+        if not self._warm:
             return None
 
+        cross_states = self._cross_states
+        if cross_states is not None:
+            return _CROSS_NAMES[cross_states[len(self.data) - 1]]
+
         # 当前和前一个时间点的MACD线和信号线值
         macd_current = self.macd_line[0]
         macd_previous = self.macd_line[-1]
@@ -136,12 +188,21 @@ class MACDStrategy(BaseStrategy):
         if len(self.data) < max(self.params.slow_period, self.params.signal_period):
             return False
 
+        strong = self._strong
+        if strong is not None:
+            return bool(strong[len(self.data) - 1])
+
         return abs(self.histogram[0]) >= self.params.min_histogram
 
     def generate_signal(self) -> TradingSignal | None:
         """生成交易信号"""
+        # 预计算了信号K线时，其余K线不会产生信号或改变状态，直接跳过
+        signal_bars = self._signal_bars
+        if signal_bars is not None and not signal_bars[len(self.data) - 1]:
+            return None
+
         # 确保有足够的数据
-        if len(self.data) < max(self.params.slow_period, self.params.signal_period) + 1:
+        if not self._warm:
             return None
 
         cross_state = self.get_cross_state()
@@ -166,9 +227,12 @@ class MACDStrategy(BaseStrategy):
             )
 
             logger.info(
-                f"生成买入信号 - MACD金叉, 价格: {current_price:.2f}, "
-                f"MACD: {self.macd_line[0]:.4f}, 信号线: {self.signal_line[0]:.4f}, "
-                f"柱状图: {self.histogram[0]:.4f}"
+                "生成买入信号 - MACD金叉, 价格: {:.2f}, "
+                "MACD: {:.4f}, 信号线: {:.4f}, 柱状图: {:.4f}",
+                current_price,
+                self.macd_line[0],
+                self.signal_line[0],
+                self.histogram[0],
             )
 
         # 死叉卖出信号
@@ -188,14 +252,17 @@ class MACDStrategy(BaseStrategy):
             )
 
             logger.info(
-                f"生成卖出信号 - MACD死叉, 价格: {current_price:.2f}, "
-                f"MACD: {self.macd_line[0]:.4f}, 信号线: {self.signal_line[0]:.4f}, "
-                f"柱状图: {self.histogram[0]:.4f}"
+                "生成卖出信号 - MACD死叉, 价格: {:.2f}, "
+                "MACD: {:.4f}, 信号线: {:.4f}, 柱状图: {:.4f}",
+                current_price,
+                self.macd_line[0],
+                self.signal_line[0],
+                self.histogram[0],
             )
 
         # 更新交叉状态
         if cross_state:
-            self.last_cross_state = cross_state
+            self.last_cross_state = _CROSS_CODES[cross_state]
 
         return signal
 
@@ -205,7 +272,7 @@ class MACDStrategy(BaseStrategy):
         signal = self.generate_signal()
 
         if signal:
-            self.signals.append(signal)
+            self.record_signal(signal)
 
             # 执行交易逻辑
             if signal.signal_type == SignalType.BUY and not self.position:
@@ -214,22 +281,24 @@ class MACDStrategy(BaseStrategy):
                 self.order = self.buy(size=size)
                 self.entry_price = signal.price
 
-                logger.info(f"执行买入订单 - 数量: {size}, 价格: {signal.price:.2f}")
+                logger.info("执行买入订单 - 数量: {}, 价格: {:.2f}", size, signal.price)
 
             elif signal.signal_type == SignalType.SELL and self.position:
                 # 卖出信号且当前有持仓
                 self.order = self.sell(size=self.position.size)
 
                 logger.info(
-                    f"执行卖出订单 - 数量: {self.position.size}, 价格: {signal.price:.2f}"
+                    "执行卖出订单 - 数量: {}, 价格: {:.2f}",
+                    self.position.size,
+                    signal.price,
                 )
 
         # 检查止损
         self.check_stop_loss()
 
-    def get_strategy_state(self) -> dict[str, Any]:
-        """获取策略当前状态"""
-        base_state = super().get_strategy_state()
+    def _build_strategy_state(self) -> dict[str, Any]:
+        """构建策略当前状态"""
+        base_state = super()._build_strategy_state()
 
         # 添加策略特有状态
         strategy_state = {
@@ -243,7 +312,7 @@ class MACDStrategy(BaseStrategy):
             if len(self.data) >= max(self.params.slow_period, self.params.signal_period)
             else None,
             "cross_state": self.get_cross_state(),
-            "last_cross_state": self.last_cross_state,
+            "last_cross_state": _CROSS_NAMES[self.last_cross_state],
             "fast_period": self.params.fast_period,
             "slow_period": self.params.slow_period,
             "signal_period": self.params.signal_period,
@@ -7,8 +7,16 @@ from typing import Any
 
 import numpy as np
 from loguru import logger
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.helpers import clamp_unit
+from utils.numeric import ewma, mean_std
 
 from .base_strategy import BaseStrategy, SignalType, TradingSignal
+from .indicators import preloaded_array
+
+# 因子评分历史的最小初始容量，数据未预加载时按此分配
+_HISTORY_MIN_CAPACITY = 256
 
 
 class MultiFactorStrategy(BaseStrategy):
@@ -50,12 +58,34 @@ class MultiFactorStrategy(BaseStrategy):
         # 策略状态
         self.day_count = 0
         self.last_rebalance_day = 0
-        self.factor_scores_history = []
-        self.portfolio_value_history = []
+        # 每根K线都要判断是否再平衡，频率参数绑定一次
+        self._rebalance_frequency = self.params.rebalance_frequency
+
+        # 因子评分历史按列存入预分配数组，容量按数据长度预估，不足时倍增
+        capacity = max(self.data.buflen(), _HISTORY_MIN_CAPACITY)
+        self._history_dates = np.empty(capacity, dtype="datetime64[D]")
+        self._history_scores = np.empty(capacity)
+        self._history_prices = np.empty(capacity)
+        self._history_size = 0
+        # 因子评分触发并被记录的信号数量，随信号记录累计
+        self._rebalance_signal_count = 0
+
+        # 组合净值的历史峰值，用于计算回撤
+        self._peak_value: float | None = None
+
+        # 持有多头仓位的数据源，随订单成交增量维护，无需逐个查询持仓
+        self._long_datas: set[Any] = set()
+
+        # 因子评分只依赖当前K线之前的行情，按K线缓存，同一根K线内不重复计算
+        self._score_bar = None
+        self._score_cache: float | None = None
 
         # 验证权重配置
         self._validate_weights()
 
+        # 数据已预加载时一次性向量化算出全部K线的因子评分，逐根K线只需查表
+        self._precomputed_scores = self._precompute_factor_scores()
+
         logger.info(
             f"多因子策略初始化完成, 权重配置: 技术面={self.params.technical_weight}, "
             f"基本面={self.params.fundamental_weight}, 消息面={self.params.news_weight}, "
@@ -161,17 +191,14 @@ class MultiFactorStrategy(BaseStrategy):
             if factor_score is None:
                 return None
 
-            # 记录评分历史
-            self.factor_scores_history.append(
-                {
-                    "date": self.datas[0].datetime.date(0),
-                    "score": factor_score,
-                    "price": self.data.close[0],
-                }
+            # 记录评分历史，当前收盘价只读取一次供后续环节共用
+            current_price = self._close[0]
+            self._record_factor_score(
+                self.datas[0].datetime.date(0), factor_score, current_price
             )
 
             # 基于评分和阈值生成交易信号
-            signal = self._generate_signal_from_score(factor_score)
+            signal = self._generate_signal_from_score(factor_score, current_price)
 
             # 应用风险管理
             if signal:
@@ -183,24 +210,91 @@ class MultiFactorStrategy(BaseStrategy):
             logger.error(f"生成交易信号失败: {e}")
             return None
 
+    def _record_factor_score(self, date: Any, score: float, price: float) -> None:
+        """记录一条因子评分历史
+
+        Args:
+            date: K线日期
+            score: 综合因子评分
+            price: 当前收盘价
+        """
+        index = self._history_size
+        if index == len(self._history_scores):
+            capacity = 2 * index
+            self._history_dates = np.resize(self._history_dates, capacity)
+            self._history_scores = np.resize(self._history_scores, capacity)
+            self._history_prices = np.resize(self._history_prices, capacity)
+
+        self._history_dates[index] = date
+        self._history_scores[index] = score
+        self._history_prices[index] = price
+        self._history_size = index + 1
+
+    @property
+    def factor_scores_history(self) -> list[dict[str, Any]]:
+        """因子评分历史，每条包含 date、score、price"""
+        size = self._history_size
+        return [
+            {"date": date, "score": score, "price": price}
+            for date, score, price in zip(
+                self._history_dates[:size].tolist(),
+                self._history_scores[:size].tolist(),
+                self._history_prices[:size].tolist(),
+                strict=True,
+            )
+        ]
+
     def _should_rebalance(self) -> bool:
-        """检查是否需要再平衡"""
-        return (
-            self.day_count - self.last_rebalance_day
-        ) >= self.params.rebalance_frequency
+        """检查是否需要再平衡
+
+        非再平衡K线在此返回后直接跳过，不计算因子评分，也不进入风险管理。
+        """
+        return self.day_count - self.last_rebalance_day >= self._rebalance_frequency
 
     def _calculate_current_factor_score(self) -> float | None:
-        """计算当前股票的因子评分"""
+        """计算当前股票的因子评分，同一根K线内复用已算出的结果"""
+        bar = len(self.data)
+        if self._score_bar != bar:
+            self._score_cache = self._build_factor_score()
+            self._score_bar = bar
+        return self._score_cache
+
+    def _build_factor_score(self) -> float | None:
+        """计算当前K线的因子评分
+
+        回看窗口不含当前K线，价格和成交量每次只从数据线整段读取一次，
+        各维度因子共用同一组数组。
+        """
+        precomputed = self._precomputed_scores
+        if precomputed is not None:
+            score = precomputed[len(self.data) - 1]
+            if not np.isnan(score):
+                return float(score)
+
         try:
             # 检查数据可用性
-            if len(self.data) < self.params.lookback_period:
+            bars = len(self.data)
+            lookback = self.params.lookback_period
+            if bars <= lookback:
                 return None
 
+            # 消息面只看最近10根K线，与回看窗口一起读取
+            news_window = min(10, bars - 1)
+            size = max(lookback, news_window)
+            closes = self._recent_values(self.data.close, size)
+            volumes = self._recent_values(self.data.volume, size)
+
             # 计算四维度因子评分
-            technical_score = self._calculate_technical_factor()
-            fundamental_score = self._calculate_fundamental_factor()
-            news_score = self._calculate_news_factor()
-            market_score = self._calculate_market_factor()
+            technical_score = self._calculate_technical_factor(
+                closes[-lookback:], volumes[-lookback:]
+            )
+            fundamental_score = self._calculate_fundamental_factor(closes[-lookback:])
+            news_score = self._calculate_news_factor(
+                closes[-news_window:], volumes[-news_window:]
+            )
+            market_score = self._calculate_market_factor(
+                closes[-lookback:], volumes[-lookback:]
+            )
 
             # 计算综合评分
             composite_score = (
@@ -221,7 +315,277 @@ class MultiFactorStrategy(BaseStrategy):
             logger.error(f"计算因子评分失败: {e}")
             return None
 
-    def _calculate_technical_factor(self) -> float:
+    @staticmethod
+    def _recent_values(line: Any, size: int) -> np.ndarray:
+        """读取当前K线之前最近 size 根K线的数据
+
+        Args:
+            line: backtrader 数据线
+            size: K线数量
+
+        Returns:
+            按时间正序排列的数组
+        """
+        return np.asarray(line.get(ago=-1, size=size), dtype=np.float64)
+
+    def _precompute_factor_scores(self) -> np.ndarray | None:
+        """向量化计算每根K线的综合因子评分
+
+        与逐根K线的计算口径一致：第 i 根K线使用其之前 lookback 根K线的窗口，
+        消息面使用之前10根K线。所有窗口由滑动窗口视图一次取出，各因子沿窗口
+        维度批量计算。无法给出评分的K线（回看期不足或结果为 NaN）留作 NaN，
+        由逐根K线的计算兜底。
+
+        Returns:
+            与数据等长的评分数组，数据未预加载时返回None
+        """
+        close = preloaded_array(self.data)
+        volume = preloaded_array(self.data, "volume")
+        if close is None or volume is None:
+            return None
+
+        scores = np.full(len(close), np.nan)
+        lookback = self.params.lookback_period
+        if len(close) <= lookback:
+            return scores
+
+        # 第 k 行窗口对应第 k + window 根K线（不含该K线本身）
+        closes = sliding_window_view(close, lookback)[:-1]
+        volumes = sliding_window_view(volume, lookback)[:-1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            news = np.full(len(close), np.nan)
+            if len(close) > 10:
+                news[10:] = self._batch_news_factor(
+                    sliding_window_view(close, 10)[:-1],
+                    sliding_window_view(volume, 10)[:-1],
+                )
+
+            scores[lookback:] = (
+                self._batch_technical_factor(closes, volumes)
+                * self.params.technical_weight
+                + self._batch_fundamental_factor(closes)
+                * self.params.fundamental_weight
+                + news[lookback:] * self.params.news_weight
+                + self._batch_market_factor(closes, volumes) * self.params.market_weight
+            )
+        return scores
+
+    @staticmethod
+    def _batch_technical_factor(closes: np.ndarray, volumes: np.ndarray) -> np.ndarray:
+        """批量计算技术面因子评分，每行一个回看窗口
+
+        Args:
+            closes: 收盘价窗口矩阵
+            volumes: 成交量窗口矩阵
+
+        Returns:
+            每个窗口的技术面评分
+        """
+        rows, window = closes.shape
+        last = closes[:, -1]
+
+        # 动量因子
+        momentum = np.zeros(rows)
+        if window >= 10:
+            short_momentum = (last - closes[:, -5]) / closes[:, -5]
+            long_momentum = (last - closes[:, -10]) / closes[:, -10]
+            price_momentum = (short_momentum + long_momentum) / 2
+            momentum = momentum + np.clip(price_momentum * 5 + 0.5, 0, 1) * 0.6
+        if window >= 5:
+            recent_volume = volumes[:, -3:].mean(axis=1)
+            avg_volume = volumes[:, :-3].mean(axis=1)
+            volume_ratio = np.where(avg_volume > 0, recent_volume / avg_volume, 1)
+            momentum = momentum + np.minimum(volume_ratio / 3, 1) * 0.4
+
+        # 反转因子
+        reversal = np.full(rows, 0.5)
+        if window >= 5:
+            recent_return = (last - closes[:, -2]) / closes[:, -2]
+            prev_return = (closes[:, -2] - closes[:, -3]) / closes[:, -3]
+            reversal = np.select(
+                [
+                    (prev_return < -0.02) & (recent_return > 0.01),
+                    (prev_return > 0.02) & (recent_return < -0.01),
+                ],
+                [0.8, 0.2],
+                default=0.5,
+            )
+
+        # 波动率因子
+        volatility = np.zeros(rows)
+        if window >= 10:
+            price_vol = (np.diff(closes, axis=1) / closes[:, :-1]).std(axis=1)
+            volume_vol = (np.diff(volumes, axis=1) / volumes[:, :-1]).std(axis=1)
+            volatility = volatility + np.maximum(1 - price_vol * 20, 0) * 0.7
+            volatility = (
+                volatility + np.maximum(1 - np.abs(volume_vol - 0.3) * 2, 0) * 0.3
+            )
+
+        # 技术指标因子：MA、布林带、MACD、RSI
+        ma_score = bb_score = macd_score = rsi_score = np.full(rows, 0.5)
+        if window >= 20:
+            window20 = closes[:, -20:]
+            ma20, std20 = mean_std(window20)
+            ma5 = closes[:, -5:].mean(axis=1)
+            ma10 = closes[:, -10:].mean(axis=1)
+            ma_score = np.select(
+                [
+                    (last > ma5) & (ma5 > ma10) & (ma10 > ma20),
+                    (last > ma5) & (ma5 > ma10),
+                    last > ma5,
+                    (last < ma5) & (ma5 < ma10) & (ma10 < ma20),
+                ],
+                [0.9, 0.7, 0.6, 0.1],
+                default=0.4,
+            )
+
+            upper_band = ma20 + 2 * std20
+            lower_band = ma20 - 2 * std20
+            position = (last - lower_band) / (upper_band - lower_band)
+            bb_score = np.select(
+                [last <= lower_band, last >= upper_band],
+                [0.9, 0.1],
+                default=0.3 + 0.4 * (1 - np.abs(position - 0.5) * 2),
+            )
+        if window >= 26:
+            macd_line = ewma(closes, 12) - ewma(closes, 26)
+            signal_line = ewma(macd_line, 9)
+            histogram = macd_line - signal_line
+            macd_score = np.select(
+                [
+                    (macd_line[:, -1] > signal_line[:, -1])
+                    & (histogram[:, -1] > histogram[:, -2]),
+                    (macd_line[:, -1] < signal_line[:, -1])
+                    & (histogram[:, -1] < histogram[:, -2]),
+                ],
+                [0.8, 0.2],
+                default=0.5,
+            )
+        if window >= 15:
+            deltas = np.diff(closes[:, -15:], axis=1)
+            avg_gain = np.maximum(deltas, 0).mean(axis=1)
+            avg_loss = np.maximum(-deltas, 0).mean(axis=1)
+            rsi = np.where(avg_loss == 0, 100, 100 - (100 / (1 + avg_gain / avg_loss)))
+            rsi_score = np.select(
+                [
+                    (rsi >= 30) & (rsi <= 70),
+                    (rsi >= 20) & (rsi < 30),
+                    (rsi > 70) & (rsi <= 80),
+                    rsi < 20,
+                ],
+                [0.7, 0.9, 0.3, 0.95],
+                default=0.1,
+            )
+        indicators = (
+            ma_score * 0.25 + macd_score * 0.25 + rsi_score * 0.25 + bb_score * 0.25
+        )
+
+        score = momentum * 0.25 + reversal * 0.20 + volatility * 0.20
+        return np.clip(score + indicators * 0.35, 0, 1)
+
+    @staticmethod
+    def _batch_fundamental_factor(closes: np.ndarray) -> np.ndarray:
+        """批量计算基本面因子评分，每行一个回看窗口
+
+        Args:
+            closes: 收盘价窗口矩阵
+
+        Returns:
+            每个窗口的基本面评分
+        """
+        window = closes.shape[1]
+        recent = closes[:, -10:]
+        recent_mean, recent_std = mean_std(recent)
+        recent_volatility = recent_std / recent_mean
+        score = np.maximum(1 - recent_volatility * 10, 0) * 0.3
+
+        lowest = closes.min(axis=1)
+        price_range = closes.max(axis=1) - lowest
+        position = (closes[:, -1] - lowest) / price_range
+        score = score + np.where(price_range > 0, 1 - position, 0.5) * 0.25
+
+        if window >= 30:
+            long_mean, long_std = mean_std(closes)
+            long_volatility = long_std / long_mean
+            score = score + np.maximum(1 - long_volatility * 8, 0) * 0.25
+        else:
+            score = score + 0.5 * 0.25
+
+        if window >= 20:
+            long_return = (closes[:, -1] - closes[:, 0]) / closes[:, 0]
+            score = score + np.clip(long_return * 2 + 0.5, 0, 1) * 0.2
+        else:
+            score = score + 0.5 * 0.2
+
+        return np.clip(score, 0, 1)
+
+    @staticmethod
+    def _batch_news_factor(closes: np.ndarray, volumes: np.ndarray) -> np.ndarray:
+        """批量计算消息面因子评分，每行一个10根K线的窗口
+
+        Args:
+            closes: 收盘价窗口矩阵
+            volumes: 成交量窗口矩阵
+
+        Returns:
+            每个窗口的消息面评分
+        """
+        avg_return = (np.diff(closes, axis=1) / closes[:, :-1]).mean(axis=1)
+        score = np.clip(avg_return * 10 + 0.5, 0, 1) * 0.4
+
+        recent_volume = volumes[:, -3:].mean(axis=1)
+        avg_volume = volumes[:, :-3].mean(axis=1)
+        volume_ratio = np.where(avg_volume > 0, recent_volume / avg_volume, 1)
+        score = score + np.minimum(volume_ratio / 2, 1) * 0.3
+
+        last, previous = closes[:, -1], closes[:, -2]
+        gap_ratio = np.abs(last - previous) / previous
+        event_score = np.where(
+            gap_ratio > 0.03, np.where(last > previous, 0.8, 0.2), 0.5
+        )
+        return np.clip(score + event_score * 0.3, 0, 1)
+
+    @staticmethod
+    def _batch_market_factor(closes: np.ndarray, volumes: np.ndarray) -> np.ndarray:
+        """批量计算市场面因子评分，每行一个回看窗口
+
+        Args:
+            closes: 收盘价窗口矩阵
+            volumes: 成交量窗口矩阵
+
+        Returns:
+            每个窗口的市场面评分
+        """
+        rows, window = closes.shape
+        if window < 10:
+            return np.full(rows, 0.5)
+
+        last = closes[:, -1]
+        stock_return = (last - closes[:, -10]) / closes[:, -10]
+        score = np.clip(stock_return * 3 + 0.5, 0, 1) * 0.4
+
+        recent_volume = volumes[:, -5:].mean(axis=1)
+        avg_volume = volumes[:, -10:-5].mean(axis=1)
+        volume_ratio = np.where(avg_volume > 0, recent_volume / avg_volume, 1)
+        score = score + np.minimum(volume_ratio / 2.5, 1) * 0.3
+
+        short_momentum = (last - closes[:, -3]) / closes[:, -3]
+        score = score + np.clip(short_momentum * 8 + 0.5, 0, 1) * 0.2
+
+        if window >= 20:
+            long_return = (last - closes[:, -20]) / closes[:, -20]
+            short_return = (last - closes[:, -5]) / closes[:, -5]
+            relative_strength = short_return - long_return * 0.25
+            score = score + np.clip(relative_strength * 4 + 0.5, 0, 1) * 0.1
+        else:
+            score = score + 0.5 * 0.1
+
+        return np.clip(score, 0, 1)
+
+    def _calculate_technical_factor(
+        self, closes: np.ndarray, volumes: np.ndarray
+    ) -> float:
         """计算技术面因子评分
 
         技术面因子包括：
@@ -231,23 +595,6 @@ class MultiFactorStrategy(BaseStrategy):
         - 技术指标因子 (35%): MA、MACD、RSI、布林带等
         """
         try:
-            # 获取价格数据
-            closes = np.array(
-                [self.data.close[-i] for i in range(self.params.lookback_period, 0, -1)]
-            )
-            volumes = np.array(
-                [
-                    self.data.volume[-i]
-                    for i in range(self.params.lookback_period, 0, -1)
-                ]
-            )
-            highs = np.array(
-                [self.data.high[-i] for i in range(self.params.lookback_period, 0, -1)]
-            )
-            lows = np.array(
-                [self.data.low[-i] for i in range(self.params.lookback_period, 0, -1)]
-            )
-
             score = 0.0
 
             # 1. 动量因子 (25%)
@@ -264,17 +611,17 @@ class MultiFactorStrategy(BaseStrategy):
 
             # 4. 技术指标因子 (35%)
             technical_indicator_score = self._calculate_technical_indicators(
-                closes, highs, lows, volumes
+                closes, volumes
             )
             score += technical_indicator_score * 0.35
 
-            return min(max(score, 0), 1)
+            return clamp_unit(score)
 
         except Exception as e:
             logger.error(f"计算技术面因子失败: {e}")
             return 0.5  # 默认中性评分
 
-    def _calculate_fundamental_factor(self) -> float:
+    def _calculate_fundamental_factor(self, closes: np.ndarray) -> float:
         """计算基本面因子评分
 
         基本面因子包括：
@@ -284,22 +631,20 @@ class MultiFactorStrategy(BaseStrategy):
         - 成长性 (20%): 使用长期收益率作为代理
         """
         try:
-            closes = np.array(
-                [self.data.close[-i] for i in range(self.params.lookback_period, 0, -1)]
-            )
-
             score = 0.0
 
             # 盈利能力 (30%) - 使用价格稳定性作为代理
-            recent_volatility = np.std(closes[-10:]) / np.mean(closes[-10:])
+            recent_mean, recent_std = mean_std(closes[-10:])
+            recent_volatility = recent_std / recent_mean
             profitability_score = max(1 - recent_volatility * 10, 0)
             score += profitability_score * 0.3
 
             # 估值水平 (25%) - 使用价格相对位置作为代理
             current_price = closes[-1]
-            price_range = np.max(closes) - np.min(closes)
+            lowest = closes.min()
+            price_range = closes.max() - lowest
             if price_range > 0:
-                position = (current_price - np.min(closes)) / price_range
+                position = (current_price - lowest) / price_range
                 # 低位估值得分高
                 valuation_score = 1 - position
             else:
@@ -308,7 +653,8 @@ class MultiFactorStrategy(BaseStrategy):
 
             # 财务质量 (25%) - 使用长期波动率作为代理
             if len(closes) >= 30:
-                long_volatility = np.std(closes) / np.mean(closes)
+                long_mean, long_std = mean_std(closes)
+                long_volatility = long_std / long_mean
                 quality_score = max(1 - long_volatility * 8, 0)
             else:
                 quality_score = 0.5
@@ -317,18 +663,18 @@ class MultiFactorStrategy(BaseStrategy):
             # 成长性 (20%) - 使用长期收益率作为代理
             if len(closes) >= 20:
                 long_return = (closes[-1] - closes[0]) / closes[0]
-                growth_score = min(max(long_return * 2 + 0.5, 0), 1)
+                growth_score = clamp_unit(long_return * 2 + 0.5)
             else:
                 growth_score = 0.5
             score += growth_score * 0.2
 
-            return min(max(score, 0), 1)
+            return clamp_unit(score)
 
         except Exception as e:
             logger.error(f"计算基本面因子失败: {e}")
             return 0.5  # 默认中性评分
 
-    def _calculate_news_factor(self) -> float:
+    def _calculate_news_factor(self, closes: np.ndarray, volumes: np.ndarray) -> float:
         """计算消息面因子评分
 
         消息面因子包括：
@@ -337,13 +683,6 @@ class MultiFactorStrategy(BaseStrategy):
         - 事件影响 (30%): 使用价格跳空作为代理
         """
         try:
-            closes = np.array(
-                [self.data.close[-i] for i in range(min(10, len(self.data)), 0, -1)]
-            )
-            volumes = np.array(
-                [self.data.volume[-i] for i in range(min(10, len(self.data)), 0, -1)]
-            )
-
             if len(closes) < 2:
                 return 0.5
 
@@ -352,7 +691,7 @@ class MultiFactorStrategy(BaseStrategy):
             # 市场情绪 (40%) - 使用近期价格变化作为代理
             recent_returns = np.diff(closes) / closes[:-1]
             avg_return = np.mean(recent_returns)
-            sentiment_score = min(max(avg_return * 10 + 0.5, 0), 1)
+            sentiment_score = clamp_unit(avg_return * 10 + 0.5)
             score += sentiment_score * 0.4
 
             # 新闻热度 (30%) - 使用成交量变化作为代理
@@ -379,13 +718,15 @@ class MultiFactorStrategy(BaseStrategy):
             else:
                 score += 0.5 * 0.3
 
-            return min(max(score, 0), 1)
+            return clamp_unit(score)
 
         except Exception as e:
             logger.error(f"计算消息面因子失败: {e}")
             return 0.5  # 默认中性评分
 
-    def _calculate_market_factor(self) -> float:
+    def _calculate_market_factor(
+        self, closes: np.ndarray, volumes: np.ndarray
+    ) -> float:
         """计算市场面因子评分
 
         市场面因子包括：
@@ -395,16 +736,6 @@ class MultiFactorStrategy(BaseStrategy):
         - 板块轮动 (10%): 相对强度指标
         """
         try:
-            closes = np.array(
-                [self.data.close[-i] for i in range(self.params.lookback_period, 0, -1)]
-            )
-            volumes = np.array(
-                [
-                    self.data.volume[-i]
-                    for i in range(self.params.lookback_period, 0, -1)
-                ]
-            )
-
             if len(closes) < 10:
                 return 0.5
 
@@ -415,7 +746,7 @@ class MultiFactorStrategy(BaseStrategy):
             # 假设市场平均收益率为0（实际应该从市场指数获取）
             market_return = 0.0
             relative_performance = stock_return - market_return
-            performance_score = min(max(relative_performance * 3 + 0.5, 0), 1)
+            performance_score = clamp_unit(relative_performance * 3 + 0.5)
             score += performance_score * 0.4
 
             # 资金流向 (30%) - 基于成交量比率
@@ -431,7 +762,7 @@ class MultiFactorStrategy(BaseStrategy):
             # 市场情绪 (20%) - 短期价格动量
             if len(closes) >= 5:
                 short_momentum = (closes[-1] - closes[-3]) / closes[-3]
-                sentiment_score = min(max(short_momentum * 8 + 0.5, 0), 1)
+                sentiment_score = clamp_unit(short_momentum * 8 + 0.5)
                 score += sentiment_score * 0.2
             else:
                 score += 0.5 * 0.2
@@ -443,12 +774,12 @@ class MultiFactorStrategy(BaseStrategy):
                 relative_strength = (
                     short_return - long_return * 0.25
                 )  # 短期相对长期的强度
-                rotation_score = min(max(relative_strength * 4 + 0.5, 0), 1)
+                rotation_score = clamp_unit(relative_strength * 4 + 0.5)
                 score += rotation_score * 0.1
             else:
                 score += 0.5 * 0.1
 
-            return min(max(score, 0), 1)
+            return clamp_unit(score)
 
         except Exception as e:
             logger.error(f"计算市场面因子失败: {e}")
@@ -460,12 +791,10 @@ class MultiFactorStrategy(BaseStrategy):
             if len(prices) < period + 1:
                 return 50.0  # 默认中性值
 
-            deltas = np.diff(prices)
-            gains = np.where(deltas > 0, deltas, 0)
-            losses = np.where(deltas < 0, -deltas, 0)
-
-            avg_gain = np.mean(gains[-period:])
-            avg_loss = np.mean(losses[-period:])
+            # 只需最近 period 个价格变动，不对整段序列做差分
+            deltas = np.diff(prices[-(period + 1) :])
+            avg_gain = np.mean(np.maximum(deltas, 0))
+            avg_loss = np.mean(np.maximum(-deltas, 0))
 
             if avg_loss == 0:
                 return 100.0
@@ -478,17 +807,27 @@ class MultiFactorStrategy(BaseStrategy):
         except Exception:
             return 50.0
 
-    def _generate_signal_from_score(self, factor_score: float) -> TradingSignal | None:
-        """基于因子评分生成交易信号"""
-        try:
-            current_price = self.data.close[0]
+    def _generate_signal_from_score(
+        self, factor_score: float, current_price: float
+    ) -> TradingSignal | None:
+        """基于因子评分生成交易信号
+
+        Args:
+            factor_score: 综合因子评分
+            current_price: 当前收盘价
 
+        Returns:
+            交易信号，无需交易时返回None
+        """
+        try:
             # 买入信号
             if factor_score >= self.params.buy_threshold:
                 if not self.position:  # 没有持仓时才买入
                     confidence = min(factor_score, 1.0)
                     if confidence >= self.params.min_confidence_score:
-                        size = self._calculate_position_size_by_score(factor_score)
+                        size = self._calculate_position_size_by_score(
+                            factor_score, current_price
+                        )
                         return TradingSignal(
                             signal_type=SignalType.BUY,
                             price=current_price,
@@ -513,8 +852,18 @@ class MultiFactorStrategy(BaseStrategy):
             logger.error(f"生成交易信号失败: {e}")
             return None
 
-    def _calculate_position_size_by_score(self, factor_score: float) -> int:
-        """基于因子评分计算仓位大小"""
+    def _calculate_position_size_by_score(
+        self, factor_score: float, current_price: float
+    ) -> int:
+        """基于因子评分计算仓位大小
+
+        Args:
+            factor_score: 综合因子评分
+            current_price: 当前收盘价
+
+        Returns:
+            股数
+        """
         try:
             # 基础仓位
             base_size = self.params.position_size
@@ -525,9 +874,7 @@ class MultiFactorStrategy(BaseStrategy):
 
             # 应用最大仓位限制
             max_size = int(
-                self.broker.get_value()
-                * self.params.max_position_size
-                / self.data.close[0]
+                self.broker.get_value() * self.params.max_position_size / current_price
             )
             final_size = min(adjusted_size, max_size)
 
@@ -544,7 +891,7 @@ class MultiFactorStrategy(BaseStrategy):
             if self.check_stop_loss() and self.position:
                 return TradingSignal(
                     signal_type=SignalType.SELL,
-                    price=self.data.close[0],
+                    price=self._close[0],
                     reason="触发止损",
                     confidence=1.0,
                 )
@@ -556,9 +903,7 @@ class MultiFactorStrategy(BaseStrategy):
 
             # 检查持仓数量限制
             if signal.signal_type == SignalType.BUY:
-                current_positions = len(
-                    [d for d in self.datas if self.getposition(d).size > 0]
-                )
+                current_positions = len(self._long_datas)
                 if current_positions >= self.params.max_positions:
                     logger.warning(f"达到最大持仓数量限制: {current_positions}")
                     return None
@@ -573,12 +918,15 @@ class MultiFactorStrategy(BaseStrategy):
         """检查最大回撤"""
         try:
             current_value = self.broker.get_value()
-            self.portfolio_value_history.append(current_value)
 
-            if len(self.portfolio_value_history) < 2:
+            # 只维护历史峰值，首次记录时尚无回撤可言
+            peak_value = self._peak_value
+            if peak_value is None:
+                self._peak_value = current_value
                 return False
 
-            peak_value = max(self.portfolio_value_history)
+            if current_value > peak_value:
+                peak_value = self._peak_value = current_value
             current_drawdown = (peak_value - current_value) / peak_value
 
             if current_drawdown >= self.params.max_drawdown_pct:
@@ -590,6 +938,23 @@ class MultiFactorStrategy(BaseStrategy):
         except Exception:
             return False
 
+    def record_signal(self, signal: TradingSignal):
+        """记录交易信号并累计因子评分触发的信号数量"""
+        super().record_signal(signal)
+        if signal.reason and "因子评分" in signal.reason:
+            self._rebalance_signal_count += 1
+
+    def notify_order(self, order):
+        """订单状态通知"""
+        super().notify_order(order)
+
+        # 成交后按该数据源的最新持仓更新多头集合
+        if order.status in [order.Partial, order.Completed]:
+            if self.getposition(order.data).size > 0:
+                self._long_datas.add(order.data)
+            else:
+                self._long_datas.discard(order.data)
+
     def next(self):
         """策略主逻辑"""
         try:
@@ -611,15 +976,11 @@ class MultiFactorStrategy(BaseStrategy):
 
         # 添加多因子策略特有的统计信息
         factor_stats = {
-            "factor_scores_count": len(self.factor_scores_history),
-            "avg_factor_score": np.mean(
-                [s["score"] for s in self.factor_scores_history]
-            )
-            if self.factor_scores_history
+            "factor_scores_count": self._history_size,
+            "avg_factor_score": self._history_scores[: self._history_size].mean()
+            if self._history_size
             else 0,
-            "rebalance_count": len(
-                [s for s in self.signals if s.reason and "因子评分" in s.reason]
-            ),
+            "rebalance_count": self._rebalance_signal_count,
             "day_count": self.day_count,
             "last_rebalance_day": self.last_rebalance_day,
             "weights": {
@@ -647,7 +1008,7 @@ class MultiFactorStrategy(BaseStrategy):
                 short_momentum = (closes[-1] - closes[-5]) / closes[-5]  # 5日动量
                 long_momentum = (closes[-1] - closes[-10]) / closes[-10]  # 10日动量
                 price_momentum = (short_momentum + long_momentum) / 2
-                price_score = min(max(price_momentum * 5 + 0.5, 0), 1)
+                price_score = clamp_unit(price_momentum * 5 + 0.5)
                 score += price_score * 0.6
 
             # 成交量动量 (40%)
@@ -692,19 +1053,28 @@ class MultiFactorStrategy(BaseStrategy):
         """计算波动率因子"""
         try:
             score = 0.0
+            price_ready = len(closes) >= 10
+            volume_ready = len(volumes) >= 10
+
+            if price_ready and volume_ready and len(closes) == len(volumes):
+                # 等长时合并为二维数组，一次算出价格和成交量变化率的标准差
+                series = np.vstack((closes, volumes))
+                changes = np.diff(series, axis=1) / series[:, :-1]
+                volatility, volume_vol = changes.std(axis=1)
+            else:
+                if price_ready:
+                    volatility = np.std(np.diff(closes) / closes[:-1])
+                if volume_ready:
+                    volume_vol = np.std(np.diff(volumes) / volumes[:-1])
 
             # 价格波动率 (70%)
-            if len(closes) >= 10:
-                returns = np.diff(closes) / closes[:-1]
-                volatility = np.std(returns)
+            if price_ready:
                 # 低波动率得分高
                 vol_score = max(1 - volatility * 20, 0)
                 score += vol_score * 0.7
 
             # 成交量波动率 (30%)
-            if len(volumes) >= 10:
-                volume_changes = np.diff(volumes) / volumes[:-1]
-                volume_vol = np.std(volume_changes)
+            if volume_ready:
                 # 适中的成交量波动率得分高
                 vol_vol_score = max(1 - abs(volume_vol - 0.3) * 2, 0)
                 score += vol_vol_score * 0.3
@@ -715,18 +1085,27 @@ class MultiFactorStrategy(BaseStrategy):
             return 0.5
 
     def _calculate_technical_indicators(
-        self,
-        closes: np.ndarray,
-        highs: np.ndarray,
-        lows: np.ndarray,
-        volumes: np.ndarray,
+        self, closes: np.ndarray, volumes: np.ndarray
     ) -> float:
-        """计算技术指标因子"""
+        """计算技术指标因子
+
+        MA与布林带共用20日窗口，窗口均值和标准差只计算一次后分别评分。
+        """
         try:
+            current_price = closes[-1]
+            if len(closes) >= 20:
+                window20 = closes[-20:]
+                ma20, std20 = mean_std(window20)
+                ma_score = self._calculate_ma_score(
+                    current_price, np.mean(closes[-5:]), np.mean(closes[-10:]), ma20
+                )
+                bb_score = self._calculate_bollinger_score(current_price, ma20, std20)
+            else:
+                ma_score = bb_score = 0.5
+
             score = 0.0
 
             # MA指标 (25%)
-            ma_score = self._calculate_ma_score(closes)
             score += ma_score * 0.25
 
             # MACD指标 (25%)
@@ -738,7 +1117,6 @@ class MultiFactorStrategy(BaseStrategy):
             score += rsi_score * 0.25
 
             # 布林带指标 (25%)
-            bb_score = self._calculate_bollinger_score(closes)
             score += bb_score * 0.25
 
             return score
@@ -746,31 +1124,18 @@ class MultiFactorStrategy(BaseStrategy):
         except Exception:
             return 0.5
 
-    def _calculate_ma_score(self, closes: np.ndarray) -> float:
+    def _calculate_ma_score(
+        self, current_price: float, ma5: float, ma10: float, ma20: float
+    ) -> float:
         """计算移动平均线评分"""
-        try:
-            if len(closes) < 20:
-                return 0.5
-
-            ma5 = np.mean(closes[-5:])
-            ma10 = np.mean(closes[-10:])
-            ma20 = np.mean(closes[-20:])
-            current_price = closes[-1]
-
-            # 多头排列得分高
-            if current_price > ma5 > ma10 > ma20:
-                return 0.9
-            elif current_price > ma5 > ma10:
-                return 0.7
-            elif current_price > ma5:
-                return 0.6
-            elif current_price < ma5 < ma10 < ma20:
-                return 0.1
-            else:
-                return 0.4
-
-        except Exception:
-            return 0.5
+        # 多头排列得分高，按排列深度逐级判断，每个比较只做一次
+        if current_price > ma5:
+            if ma5 > ma10:
+                return 0.9 if ma10 > ma20 else 0.7
+            return 0.6
+        if current_price < ma5 < ma10 < ma20:
+            return 0.1
+        return 0.4
 
     def _calculate_macd_score(self, closes: np.ndarray) -> float:
         """计算MACD评分"""
@@ -779,10 +1144,10 @@ class MultiFactorStrategy(BaseStrategy):
                 return 0.5
 
             # 计算MACD
-            ema12 = self._calculate_ema(closes, 12)
-            ema26 = self._calculate_ema(closes, 26)
+            ema12 = ewma(closes, 12)
+            ema26 = ewma(closes, 26)
             macd_line = ema12 - ema26
-            signal_line = self._calculate_ema(macd_line, 9)
+            signal_line = ewma(macd_line, 9)
             histogram = macd_line - signal_line
 
             # MACD金叉和柱状图分析
@@ -805,13 +1170,10 @@ class MultiFactorStrategy(BaseStrategy):
             if len(closes) < 15:
                 return 0.5
 
-            # 计算RSI
-            deltas = np.diff(closes)
-            gains = np.where(deltas > 0, deltas, 0)
-            losses = np.where(deltas < 0, -deltas, 0)
-
-            avg_gain = np.mean(gains[-14:])
-            avg_loss = np.mean(losses[-14:])
+            # 计算RSI，只需最近14个价格变动
+            deltas = np.diff(closes[-15:])
+            avg_gain = np.mean(np.maximum(deltas, 0))
+            avg_loss = np.mean(np.maximum(-deltas, 0))
 
             if avg_loss == 0:
                 rsi = 100
@@ -834,18 +1196,13 @@ class MultiFactorStrategy(BaseStrategy):
         except Exception:
             return 0.5
 
-    def _calculate_bollinger_score(self, closes: np.ndarray) -> float:
+    def _calculate_bollinger_score(
+        self, current_price: float, ma20: float, std20: float
+    ) -> float:
         """计算布林带评分"""
         try:
-            if len(closes) < 20:
-                return 0.5
-
-            # 计算布林带
-            ma20 = np.mean(closes[-20:])
-            std20 = np.std(closes[-20:])
             upper_band = ma20 + 2 * std20
             lower_band = ma20 - 2 * std20
-            current_price = closes[-1]
 
             # 布林带位置评分
             if current_price <= lower_band:
@@ -859,14 +1216,3 @@ class MultiFactorStrategy(BaseStrategy):
 
         except Exception:
             return 0.5
-
-    def _calculate_ema(self, data: np.ndarray, period: int) -> np.ndarray:
-        """计算指数移动平均线"""
-        alpha = 2 / (period + 1)
-        ema = np.zeros_like(data)
-        ema[0] = data[0]
-
-        for i in range(1, len(data)):
-            ema[i] = alpha * data[i] + (1 - alpha) * ema[i - 1]
-
-        return ema
@@ -152,14 +152,18 @@ class RSIStrategy(BaseStrategy):
             return False, None
 
         # 简单的背离检测：比较最近5个周期的价格和RSI趋势
-        price_trend = self.data.close[0] - self.data.close[-5]
-        rsi_trend = self.rsi[0] - self.rsi[-5]
+        # 数据线和当前RSI各读取一次，后续判断复用
+        close = self.data.close
+        rsi = self.rsi
+        current_rsi = rsi[0]
+        price_trend = close[0] - close[-5]
+        rsi_trend = current_rsi - rsi[-5]
 
         # 顶背离：价格创新高但RSI未创新高
         if (
             price_trend > 0
             and rsi_trend < 0
-            and self.rsi[0] > self.params.overbought_level
+            and current_rsi > self.params.overbought_level
         ):
             return True, "bearish"
 
@@ -167,7 +171,7 @@ class RSIStrategy(BaseStrategy):
         if (
             price_trend < 0
             and rsi_trend > 0
-            and self.rsi[0] < self.params.oversold_level
+            and current_rsi < self.params.oversold_level
         ):
             return True, "bullish"
 
@@ -215,8 +219,10 @@ class RSIStrategy(BaseStrategy):
             )
 
             logger.info(
-                f"生成买入信号 - RSI超卖, 价格: {current_price:.2f}, "
-                f"RSI: {rsi_value:.2f}, 状态: {rsi_state}"
+                "生成买入信号 - RSI超卖, 价格: {:.2f}, RSI: {:.2f}, 状态: {}",
+                current_price,
+                rsi_value,
+                rsi_state,
             )
 
         # 超买卖出信号
@@ -246,8 +252,10 @@ class RSIStrategy(BaseStrategy):
             )
 
             logger.info(
-                f"生成卖出信号 - RSI超买, 价格: {current_price:.2f}, "
-                f"RSI: {rsi_value:.2f}, 状态: {rsi_state}"
+                "生成卖出信号 - RSI超买, 价格: {:.2f}, RSI: {:.2f}, 状态: {}",
+                current_price,
+                rsi_value,
+                rsi_state,
             )
 
         # 更新RSI状态
@@ -267,7 +275,7 @@ class RSIStrategy(BaseStrategy):
         signal = self.generate_signal()
 
         if signal:
-            self.signals.append(signal)
+            self.record_signal(signal)
 
             # 执行交易逻辑
             if signal.signal_type == SignalType.BUY and not self.position:
@@ -277,14 +285,16 @@ class RSIStrategy(BaseStrategy):
                 self.entry_price = signal.price
                 self.holding_days = 0
 
-                logger.info(f"执行买入订单 - 数量: {size}, 价格: {signal.price:.2f}")
+                logger.info("执行买入订单 - 数量: {}, 价格: {:.2f}", size, signal.price)
 
             elif signal.signal_type == SignalType.SELL and self.position:
                 # 卖出信号且当前有持仓
                 self.order = self.sell(size=self.position.size)
 
                 logger.info(
-                    f"执行卖出订单 - 数量: {self.position.size}, 价格: {signal.price:.2f}"
+                    "执行卖出订单 - 数量: {}, 价格: {:.2f}",
+                    self.position.size,
+                    signal.price,
                 )
 
         # 检查止损和RSI回归
@@ -311,8 +321,9 @@ class RSIStrategy(BaseStrategy):
             if rsi_value > self.params.oversold_level + 10 and profit_pct > 0.03:
                 self.order = self.sell(size=self.position.size)
                 logger.info(
-                    f"RSI回归平仓 - RSI回到正常区间, 盈利: {profit_pct:.2%}, "
-                    f"RSI: {rsi_value:.2f}"
+                    "RSI回归平仓 - RSI回到正常区间, 盈利: {:.2%}, RSI: {:.2f}",
+                    profit_pct,
+                    rsi_value,
                 )
 
         # 空头持仓：RSI回到正常区间且有盈利时平仓
@@ -323,13 +334,14 @@ class RSIStrategy(BaseStrategy):
             if rsi_value < self.params.overbought_level - 10 and profit_pct > 0.03:
                 self.order = self.buy(size=abs(self.position.size))
                 logger.info(
-                    f"RSI回归平仓 - RSI回到正常区间, 盈利: {profit_pct:.2%}, "
-                    f"RSI: {rsi_value:.2f}"
+                    "RSI回归平仓 - RSI回到正常区间, 盈利: {:.2%}, RSI: {:.2f}",
+                    profit_pct,
+                    rsi_value,
                 )
 
-    def get_strategy_state(self) -> dict[str, Any]:
-        """获取策略当前状态"""
-        base_state = super().get_strategy_state()
+    def _build_strategy_state(self) -> dict[str, Any]:
+        """构建策略当前状态"""
+        base_state = super()._build_strategy_state()
 
         # 检测背离
         has_divergence, divergence_type = self.is_rsi_divergence()
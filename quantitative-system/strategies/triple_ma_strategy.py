@@ -144,10 +144,15 @@ class TripleMovingAverageStrategy(BaseStrategy):
             )
 
             logger.info(
-                f"生成买入信号 - 多头排列形成, 价格: {current_price:.2f}, "
-                f"MA({self.params.short_window}): {self.short_ma[0]:.2f}, "
-                f"MA({self.params.mid_window}): {self.mid_ma[0]:.2f}, "
-                f"MA({self.params.long_window}): {self.long_ma[0]:.2f}"
+                "生成买入信号 - 多头排列形成, 价格: {:.2f}, "
+                "MA({}): {:.2f}, MA({}): {:.2f}, MA({}): {:.2f}",
+                current_price,
+                self.params.short_window,
+                self.short_ma[0],
+                self.params.mid_window,
+                self.mid_ma[0],
+                self.params.long_window,
+                self.long_ma[0],
             )
 
         # 从非空头排列转为空头排列 -> 卖出信号
@@ -168,10 +173,15 @@ class TripleMovingAverageStrategy(BaseStrategy):
             )
 
             logger.info(
-                f"生成卖出信号 - 空头排列形成, 价格: {current_price:.2f}, "
-                f"MA({self.params.short_window}): {self.short_ma[0]:.2f}, "
-                f"MA({self.params.mid_window}): {self.mid_ma[0]:.2f}, "
-                f"MA({self.params.long_window}): {self.long_ma[0]:.2f}"
+                "生成卖出信号 - 空头排列形成, 价格: {:.2f}, "
+                "MA({}): {:.2f}, MA({}): {:.2f}, MA({}): {:.2f}",
+                current_price,
+                self.params.short_window,
+                self.short_ma[0],
+                self.params.mid_window,
+                self.mid_ma[0],
+                self.params.long_window,
+                self.long_ma[0],
             )
 
         # 更新排列状态
@@ -185,7 +195,7 @@ class TripleMovingAverageStrategy(BaseStrategy):
         signal = self.generate_signal()
 
         if signal:
-            self.signals.append(signal)
+            self.record_signal(signal)
 
             # 执行交易逻辑
             if signal.signal_type == SignalType.BUY and not self.position:
@@ -194,19 +204,21 @@ class TripleMovingAverageStrategy(BaseStrategy):
                 self.order = self.buy(size=size)
                 self.entry_price = signal.price
 
-                logger.info(f"执行买入订单 - 数量: {size}, 价格: {signal.price:.2f}")
+                logger.info("执行买入订单 - 数量: {}, 价格: {:.2f}", size, signal.price)
 
             elif signal.signal_type == SignalType.SELL and self.position:
                 # 卖出信号且当前有持仓
                 self.order = self.sell(size=self.position.size)
 
                 logger.info(
-                    f"执行卖出订单 - 数量: {self.position.size}, 价格: {signal.price:.2f}"
+                    "执行卖出订单 - 数量: {}, 价格: {:.2f}",
+                    self.position.size,
+                    signal.price,
                 )
 
-    def get_strategy_state(self) -> dict[str, Any]:
-        """获取策略当前状态"""
-        base_state = super().get_strategy_state()
+    def _build_strategy_state(self) -> dict[str, Any]:
+        """构建策略当前状态"""
+        base_state = super()._build_strategy_state()
 
         # 添加策略特有状态
         strategy_state = {
@@ -0,0 +1,24 @@
+"""方案服务测试"""
+
+import asyncio
+import json
+
+from services.plan_service import PlanRequest, PlanService
+
+
+def test_generate_plan_archives_request_with_int_keys():
+    """请求中嵌套字典的键为整数时方案仍能保存，归档为可解析的JSON"""
+    service = PlanService(max_plans=10)
+    request = PlanRequest(
+        strategy_name="双均线策略",
+        analysis_result={"confidence_score": 0.8},
+        backtest_result={"total_return": 0.12, "monthly_returns": {1: 0.02, 2: -0.01}},
+        market_data={"index": {2024: {"close": 3000.5}}},
+    )
+
+    response = asyncio.run(service.generate_plan(request))
+
+    archived = json.loads(service.plans_storage[response.plan_id]["request"])
+    assert archived["strategy_name"] == "双均线策略"
+    assert archived["backtest_result"]["monthly_returns"] == {"1": 0.02, "2": -0.01}
+    assert archived["market_data"]["index"] == {"2024": {"close": 3000.5}}
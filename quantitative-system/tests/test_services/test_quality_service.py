@@ -0,0 +1,41 @@
+"""数据质量服务测试"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from services.quality_service import QualityService
+
+
+def _stock_basic(ts_code) -> SimpleNamespace:
+    return SimpleNamespace(
+        ts_code=ts_code,
+        symbol="000001",
+        name="平安银行",
+        area="深圳",
+        industry="银行",
+        market="主板",
+        list_status="L",
+    )
+
+
+@pytest.mark.parametrize(
+    ("ts_codes", "expected_errors"),
+    [
+        ([5], ["股票代码格式无效: 5"]),
+        (
+            [None, 5],
+            ["股票基础信息缺少必填字段: ts_code", "股票代码格式无效: 5"],
+        ),
+        (["000001.SZ", 5], ["股票代码格式无效: 5"]),
+    ],
+)
+def test_quality_report_handles_non_string_ts_codes(ts_codes, expected_errors):
+    """整批代码均非字符串时仍按逐条验证报告格式错误"""
+    report = QualityService().get_data_quality_report(
+        [_stock_basic(ts_code) for ts_code in ts_codes], "stock_basic"
+    )
+
+    assert report["total_count"] == len(ts_codes)
+    assert report["invalid_count"] == len(expected_errors)
+    assert report["error_details"] == expected_errors
@@ -0,0 +1,81 @@
+"""统一查询服务测试"""
+
+import asyncio
+import importlib
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import redis
+
+
+class _MemoryCacheRepo:
+    """以字典保存原始字节的缓存仓库，接口与 CacheRepo 的批量读写一致"""
+
+    def __init__(self) -> None:
+        self.store: dict[tuple, bytes] = {}
+
+    def mget_bytes(self, cache_type, keys: list[str]) -> list[bytes | None]:
+        return [self.store.get((cache_type, key)) for key in keys]
+
+    def mset_bytes(self, cache_type, mapping: dict[str, bytes], ttl=None) -> bool:
+        for key, payload in mapping.items():
+            self.store[(cache_type, key)] = payload
+        return True
+
+
+@pytest.fixture
+def query_service_module(monkeypatch):
+    """导入查询服务模块，模块级缓存仓库初始化时不连接 Redis"""
+    monkeypatch.setattr(redis.Redis, "ping", lambda self, **kwargs: True)
+    return importlib.import_module("services.query_service")
+
+
+def _stock(code: str, name: str) -> SimpleNamespace:
+    timestamp = datetime(2024, 1, 2, 9, 30)
+    return SimpleNamespace(
+        code=code,
+        name=name,
+        industry="银行",
+        market="主板",
+        list_date=date(1991, 4, 3),
+        created_at=timestamp,
+        updated_at=timestamp,
+    )
+
+
+def _session(total: int, stocks: list[SimpleNamespace]) -> MagicMock:
+    """依次返回计数结果和分页结果的异步会话"""
+    count_result = MagicMock()
+    count_result.scalar.return_value = total
+    page_result = MagicMock()
+    page_result.scalars.return_value.all.return_value = stocks
+
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[count_result, page_result])
+    return session
+
+
+def test_query_stocks_caches_page_end_to_end(query_service_module):
+    """首次查询走数据库并写入缓存，相同参数再次查询直接命中缓存"""
+    module = query_service_module
+    cache_repo = _MemoryCacheRepo()
+    service = module.QueryService(cache_repo=cache_repo)
+    pagination = module.PaginationParams(page=1, page_size=2)
+    session = _session(3, [_stock("000001", "平安银行"), _stock("600000", "浦发银行")])
+
+    first = asyncio.run(service.query_stocks(session, pagination))
+
+    assert session.execute.await_count == 2
+    assert first.total == 3
+    assert first.total_pages == 2
+    assert first.has_next is True
+    assert [row["code"] for row in first.data] == ["000001", "600000"]
+    assert first.data[0]["list_date"] == "1991-04-03"
+    assert len(cache_repo.store) == 1
+
+    second = asyncio.run(service.query_stocks(session, pagination))
+
+    assert session.execute.await_count == 2
+    assert second == first
@@ -0,0 +1,181 @@
+"""向量化技术指标测试
+
+对照 backtrader 内置指标校验 strategies/indicators.py 的计算口径，
+并对照逐步递推校验 utils/numeric.py 中的 ewma。
+"""
+
+import importlib.util
+from pathlib import Path
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.numeric import _EWMA_MAX_EXPONENT, ewma
+
+# 指标模块只依赖 backtrader/numpy/pandas，按文件加载，不经过 strategies 包的初始化
+_INDICATORS_PATH = Path(__file__).resolve().parents[2] / "strategies" / "indicators.py"
+_spec = importlib.util.spec_from_file_location("_indicators", _INDICATORS_PATH)
+indicators = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(indicators)
+
+
+def _random_walk(n: int, seed: int = 0, start: float = 100.0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.round(start * np.exp(np.cumsum(rng.normal(0, 0.02, n))), 2)
+
+
+def _feed(close: np.ndarray, open_: np.ndarray | None = None) -> bt.feeds.PandasData:
+    open_ = close if open_ is None else open_
+    frame = pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close),
+            "low": np.minimum(open_, close),
+            "close": close,
+            "volume": np.full(len(close), 1000.0),
+        },
+        index=pd.date_range("2020-01-01", periods=len(close)),
+    )
+    return bt.feeds.PandasData(dataname=frame)
+
+
+def _run_bt(feed: bt.feeds.PandasData, build) -> dict[str, np.ndarray]:
+    """运行只持有指标的策略，返回各指标行的完整数组"""
+
+    class _Recorder(bt.Strategy):
+        def __init__(self):
+            self.recorded = build(self.data)
+
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(feed)
+    cerebro.addstrategy(_Recorder)
+    strategy = cerebro.run()[0]
+    return {
+        name: np.asarray(line.array, dtype=np.float64)
+        for name, line in strategy.recorded.items()
+    }
+
+
+def _assert_matches(actual: np.ndarray, expected: np.ndarray) -> None:
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9)
+
+
+@pytest.fixture(scope="module")
+def close() -> np.ndarray:
+    return _random_walk(300)
+
+
+def test_sma_and_ema_match_backtrader(close):
+    expected = _run_bt(
+        _feed(close),
+        lambda data: {
+            "sma": bt.ind.SMA(data.close, period=20).lines.sma,
+            "ema": bt.ind.EMA(data.close, period=12).lines.ema,
+        },
+    )
+
+    _assert_matches(indicators.sma(close, 20), expected["sma"])
+    _assert_matches(indicators.ema(close, 12), expected["ema"])
+
+
+def test_bollinger_bands_match_backtrader(close):
+    def build(data):
+        bands = bt.ind.BollingerBands(data.close, period=20, devfactor=2.0)
+        return {"top": bands.lines.top, "mid": bands.lines.mid, "bot": bands.lines.bot}
+
+    expected = _run_bt(_feed(close), build)
+    top, mid, bot = indicators.bollinger_bands(close, 20, 2.0)
+
+    _assert_matches(top, expected["top"])
+    _assert_matches(mid, expected["mid"])
+    _assert_matches(bot, expected["bot"])
+
+
+def test_macd_matches_backtrader(close):
+    def build(data):
+        histo = bt.ind.MACDHisto(
+            data.close, period_me1=12, period_me2=26, period_signal=9
+        )
+        return {
+            "macd": histo.lines.macd,
+            "signal": histo.lines.signal,
+            "histo": histo.lines.histo,
+        }
+
+    expected = _run_bt(_feed(close), build)
+    macd_line, signal_line, histogram = indicators.macd(close, 12, 26, 9)
+
+    _assert_matches(macd_line, expected["macd"])
+    _assert_matches(signal_line, expected["signal"])
+    _assert_matches(histogram, expected["histo"])
+
+
+def test_crossover_matches_backtrader(close):
+    def build(data):
+        fast = bt.ind.SMA(data.close, period=5)
+        slow = bt.ind.SMA(data.close, period=20)
+        return {"cross": bt.ind.CrossOver(fast, slow).lines.crossover}
+
+    expected = _run_bt(_feed(close), build)
+    signal = indicators.crossover(indicators.sma(close, 5), indicators.sma(close, 20))
+
+    # backtrader 的交叉指标比慢线多等一根K线，从慢线形成后的下一根开始比较
+    np.testing.assert_array_equal(signal[20:], expected["cross"][20:])
+
+
+@pytest.mark.parametrize(
+    ("fast", "slow"),
+    [
+        # 相等后继续同向，不构成交叉
+        ([1, 2, 2, 3, 4], [2, 2, 2, 2, 2]),
+        # 相等后反向穿越，沿用相等前的相对位置判断
+        ([1, 2, 2, 2, 3, 1], [2, 2, 2, 2, 2, 2]),
+        # 自开头即相等，之后分开不构成交叉
+        ([2, 2, 3, 1, 1, 3], [2, 2, 2, 2, 1, 1]),
+    ],
+)
+def test_crossover_ties_match_backtrader(fast, slow):
+    fast = np.asarray(fast, dtype=np.float64)
+    slow = np.asarray(slow, dtype=np.float64)
+    expected = _run_bt(
+        _feed(fast, open_=slow),
+        lambda data: {"cross": bt.ind.CrossOver(data.close, data.open).crossover},
+    )
+
+    signal = indicators.crossover(fast, slow)
+
+    # backtrader 的第一根K线没有前值，从第二根开始比较
+    np.testing.assert_array_equal(signal[1:], expected["cross"][1:])
+
+
+def _ewma_reference(values: np.ndarray, period: int) -> np.ndarray:
+    alpha = 2.0 / (period + 1)
+    result = np.empty(len(values))
+    result[0] = values[0]
+    for i in range(1, len(values)):
+        result[i] = alpha * values[i] + (1 - alpha) * result[i - 1]
+    return result
+
+
+@pytest.mark.parametrize("period", [9, 12, 26])
+@pytest.mark.parametrize("closed_form", [True, False])
+def test_ewma_matches_reference_loop(period, closed_form):
+    # 以闭式解指数上限推算两侧的序列长度，分别覆盖闭式解与逐步递推
+    threshold = int(_EWMA_MAX_EXPONENT / -np.log(1 - 2.0 / (period + 1)))
+    length = threshold - 10 if closed_form else threshold + 10
+    values = _random_walk(length, seed=period)
+
+    _assert_matches(ewma(values, period), _ewma_reference(values, period))
+
+
+@pytest.mark.parametrize("length", [60, 4000])
+def test_ewma_rows_match_one_dimensional(length):
+    rows = np.vstack([_random_walk(length, seed=seed) for seed in range(3)])
+
+    result = ewma(rows, 12)
+
+    for row, values in zip(result, rows, strict=True):
+        _assert_matches(row, _ewma_reference(values, 12))
@@ -37,6 +37,12 @@ class DataValidationError(QuantitativeSystemError):
     pass
 
 
+class DataProcessingError(QuantitativeSystemError):
+    """数据处理错误"""
+
+    pass
+
+
 class ValidationError(QuantitativeSystemError):
     """验证错误"""
 
@@ -79,6 +85,12 @@ class PlanError(QuantitativeSystemError):
     pass
 
 
+class PlanServiceError(PlanError):
+    """方案服务错误"""
+
+    pass
+
+
 class AIServiceError(QuantitativeSystemError):
     """AI服务错误"""
 
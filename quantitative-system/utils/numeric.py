@@ -0,0 +1,83 @@
+"""数值计算辅助函数模块
+
+策略与因子服务共用的向量化数值函数，不依赖回测框架。
+"""
+
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# ewma 闭式解中 d^-i 的指数上限，约为 e^500，超过后改用逐步递推
+_EWMA_MAX_EXPONENT = 500.0
+
+
+@lru_cache(maxsize=64)
+def _ewma_powers(decay: float, length: int) -> np.ndarray:
+    """ewma 闭式解使用的衰减幂次 d^0 .. d^(length-1)
+
+    逐根K线评分时窗口长度和周期固定，幂次序列按参数缓存，
+    每次调用不再重新生成。返回只读数组，调用方不可原地修改。
+
+    Args:
+        decay: 衰减系数 1 - alpha
+        length: 序列长度
+
+    Returns:
+        衰减幂次序列
+    """
+    powers = decay ** np.arange(length)
+    powers.flags.writeable = False
+    return powers
+
+
+def ewma(values: np.ndarray, period: int) -> np.ndarray:
+    """以首个值为种子的指数移动平均
+
+    ema[0] = x[0]，之后 ema[i] = alpha * x[i] + (1 - alpha) * ema[i-1]。
+    记 d = 1 - alpha，递推展开为 ema[i] = d^i * (x[0] + alpha * Σ x[j] * d^-j)，
+    可由一次累加向量化求出，短窗口下省去逐元素的 Python 循环。
+    序列过长时 d^-i 会溢出，改用 pandas 的递推实现。
+    输入为二维数组时沿最后一维对每行分别计算。
+
+    Args:
+        values: 输入序列，或每行一条序列的二维数组
+        period: 窗口期
+
+    Returns:
+        与输入同形的指数移动平均
+    """
+    values = np.asarray(values, dtype=np.float64)
+    alpha = 2.0 / (period + 1)
+    decay = 1.0 - alpha
+    length = values.shape[-1]
+    if length * -np.log(decay) > _EWMA_MAX_EXPONENT:
+        if values.ndim == 1:
+            return pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+        columns = pd.DataFrame(values.T).ewm(alpha=alpha, adjust=False).mean()
+        return columns.to_numpy().T
+
+    powers = _ewma_powers(decay, length)
+    terms = alpha * values / powers
+    terms[..., :1] = values[..., :1]
+    return powers * np.cumsum(terms, axis=-1)
+
+
+def mean_std(values: np.ndarray, axis: int = -1) -> tuple[Any, Any]:
+    """均值与总体标准差
+
+    np.std 内部会先求一次均值，分别调用 np.mean 和 np.std 等于把均值算两遍。
+    这里求出均值后复用于离差平方，结果与两者分别调用逐位一致。
+
+    Args:
+        values: 输入序列或矩阵
+        axis: 计算的维度，默认最后一维
+
+    Returns:
+        (均值, 标准差)
+    """
+    mean = values.mean(axis=axis, keepdims=True)
+    deviation = values - mean
+    std = np.sqrt((deviation * deviation).mean(axis=axis))
+    return mean.squeeze(axis=axis)[()], std